@@ -1,9 +1,13 @@
 from django.contrib import admin
-from .models import DepositProduct, UserJoinedProduct, User, JeonseLoanProduct, Article
+from .models import DepositProduct, UserJoinedProduct, User, JeonseLoanProduct, Article, SyncJob, Popularity, RateHistory, Notification
 
 # 유저 모델도 등록
 admin.site.register(User)
 admin.site.register(DepositProduct)
 admin.site.register(UserJoinedProduct)
 admin.site.register(JeonseLoanProduct)
-admin.site.register(Article)
\ No newline at end of file
+admin.site.register(Article)
+admin.site.register(SyncJob)
+admin.site.register(Popularity)
+admin.site.register(RateHistory)
+admin.site.register(Notification)
\ No newline at end of file
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class FinAgentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fin_agent'
+
+    def ready(self):
+        # 게시글 저장/삭제 시 검색 색인 갱신
+        from . import signals  # noqa: F401
@@ -0,0 +1,116 @@
+# 상품 카탈로그 응답 캐시 / AI 추천 결과 캐시
+# - 직렬화가 끝난 JSON 바이트를 카탈로그 버전별로 저장합니다.
+# - TTL 로 만료시키지 않고, 수집(ingestion)에서 데이터가 바뀌면 버전을 올려 한 번에 무효화합니다.
+#   버전은 DB(CatalogueVersion)에 있으므로 별도 프로세스(sync_finlife 등)에서 수집해도 웹 서버 캐시가 바뀝니다.
+# - AI 추천 결과는 프로필 구간 + 카탈로그 버전을 키로 하는 LRU(크기 제한, TTL)에 보관합니다.
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+from .models import CatalogueVersion
+
+
+def get_catalogue_version():
+    # 기본 키 조회 1번 (모든 프로세스가 같은 값을 봄)
+    return CatalogueVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def bump_catalogue_version():
+    """상품 데이터가 바뀌었을 때 호출합니다. (수집 트랜잭션 안에서 호출하면 데이터와 함께 커밋)
+
+    이전 버전의 캐시는 더 이상 조회되지 않습니다.
+    """
+    if not CatalogueVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        CatalogueVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+    # 이 프로세스의 추천 캐시는 바로 비움 (다른 프로세스는 키의 버전이 달라져 조회되지 않음)
+    transaction.on_commit(recommendation_cache.clear)
+
+
+def get_or_build(name, build):
+    """(etag, body) 를 반환합니다. 캐시에 없으면 build() 결과를 JSON 바이트로 렌더링해 저장합니다."""
+    key = f'fin_agent:response:{name}:{get_catalogue_version()}'
+    entry = cache.get(key)
+    if entry is None:
+        body = JSONRenderer().render(build())
+        entry = ('"%s"' % hashlib.sha1(body).hexdigest(), body)
+        cache.set(key, entry, None)
+    return entry
+
+
+def cached_json_response(request, name, build):
+    """If-None-Match 가 일치하면 304, 아니면 캐시된 바이트를 그대로 응답합니다."""
+    etag, body = get_or_build(name, build)
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+# AI 추천 결과 캐시 (프로세스 메모리, 크기 제한 LRU + TTL)
+class LRUCache:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._data.pop(key, None)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses}
+
+
+recommendation_cache = LRUCache(settings.RECOMMEND_CACHE_SIZE, settings.RECOMMEND_CACHE_TTL)
+
+
+def _bracket(value, step):
+    try:
+        return int(float(value) // step)
+    except (TypeError, ValueError):
+        return None
+
+
+def recommendation_key(user_info):
+    """나이(10세)/연봉(1천만원)/자산(1천만원) 구간과 정규화한 목적 문구, 카탈로그 버전으로 키를 만듭니다."""
+    purpose = re.sub(r'[^\w]', '', str(user_info.get('purpose') or '')).lower()
+    return (
+        _bracket(user_info.get('age'), 10),
+        _bracket(user_info.get('salary'), 10_000_000),
+        _bracket(user_info.get('money'), 10_000_000),
+        purpose,
+        get_catalogue_version(),
+    )
@@ -0,0 +1,121 @@
+# 조회수/가입수 버퍼
+# - 요청마다 UPDATE 하면 SQLite 쓰기 잠금이 직렬화되므로, 프로세스 메모리에 증분(delta)만 모아둡니다.
+# - 반영 스레드가 COUNTER_FLUSH_INTERVAL 초마다 F() 증분 UPDATE 로 한 트랜잭션에 반영합니다.
+#   (같은 증분을 가진 행은 UPDATE 한 번으로 묶음, 요청이 없는 동안에도 주기마다 반영)
+# - 같은 사용자가 반영 주기 안에 같은 글을 여러 번 조회하면 1회로 셉니다.
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from .models import Popularity
+
+logger = logging.getLogger(__name__)
+
+JOIN_WEIGHT = 10.0      # 가입 1건 = 조회 10회
+
+
+class CounterBuffer:
+    def __init__(self, interval):
+        self.interval = interval
+        self._deltas = defaultdict(lambda: [0, 0])     # (kind, object_id) -> [조회 증분, 가입 증분]
+        self._viewers = set()                          # 이번 주기에 이미 센 (user_id, kind, object_id)
+        self._lock = threading.Lock()
+        self._timer_pid = None                         # 반영 스레드를 띄운 프로세스 (fork 후 다시 띄우기 위해)
+
+    def record_view(self, kind, object_id, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                if (user_id, kind, object_id) in self._viewers:
+                    return
+                self._viewers.add((user_id, kind, object_id))
+            self._deltas[(kind, object_id)][0] += 1
+        self._ensure_timer()
+
+    def record_join(self, kind, object_id, count=1):
+        with self._lock:
+            self._deltas[(kind, object_id)][1] += count
+        self._ensure_timer()
+
+    def pending(self):
+        with self._lock:
+            return len(self._deltas)
+
+    def _ensure_timer(self):
+        # 첫 기록 때 이 프로세스의 반영 스레드를 띄움
+        pid = os.getpid()
+        if self._timer_pid == pid:
+            return
+        with self._lock:
+            if self._timer_pid == pid:
+                return
+            self._timer_pid = pid
+        threading.Thread(target=self._run, name='counter-flush', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            if self.pending():
+                self.safe_flush()
+
+    def safe_flush(self):
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('조회수/가입수 반영 실패')
+        finally:
+            close_old_connections()
+
+    def _take(self):
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(lambda: [0, 0])
+            self._viewers = set()
+            return deltas
+
+    def _restore(self, deltas):
+        # 반영에 실패한 증분은 다음 주기에 다시 시도
+        with self._lock:
+            for key, (views, joins) in deltas.items():
+                self._deltas[key][0] += views
+                self._deltas[key][1] += joins
+
+    def flush(self):
+        """모인 증분을 DB 에 반영하고 반영한 대상 수를 반환합니다."""
+        deltas = self._take()
+        try:
+            if deltas:
+                apply_deltas(deltas)
+        except Exception:
+            self._restore(deltas)
+            raise
+        return len(deltas)
+
+
+def apply_deltas(deltas):
+    groups = defaultdict(lambda: defaultdict(list))    # (조회, 가입) -> kind -> [object_id]
+    for (kind, object_id), (views, joins) in deltas.items():
+        groups[(views, joins)][kind].append(object_id)
+
+    with transaction.atomic():
+        # 처음 집계되는 대상은 0 으로 행을 만든 뒤 아래의 증분 UPDATE 로 함께 반영
+        Popularity.objects.bulk_create(
+            [Popularity(kind=kind, object_id=object_id) for kind, object_id in deltas],
+            ignore_conflicts=True,
+        )
+        for (views, joins), by_kind in groups.items():
+            for kind, ids in by_kind.items():
+                Popularity.objects.filter(kind=kind, object_id__in=ids).update(
+                    view_count=F('view_count') + views,
+                    join_count=F('join_count') + joins,
+                    score=F('score') + views + joins * JOIN_WEIGHT,
+                )
+
+
+counters = CounterBuffer(settings.COUNTER_FLUSH_INTERVAL)
+# 프로세스 종료 시 남은 증분 반영
+atexit.register(lambda: counters.pending() and counters.safe_flush())
@@ -0,0 +1,133 @@
+# 예적금 가입 자격 규칙 추출 (수집 시 실행)
+# - join_member(가입대상), join_deny(1:제한없음 2:서민전용 3:일부제한), join_way, spcl_cnd(우대조건) 텍스트를
+#   나이 범위/소득 상한 컬럼과 비트마스크로 바꿔 저장합니다.
+# - /products/eligible/ 은 이 컬럼들만으로 한 번의 인덱스 조회로 가입 가능한 상품을 찾습니다.
+import re
+from .loan_parsing import parse_amounts
+
+# 가입 대상 비트
+YOUTH_ONLY = 1
+SENIOR_ONLY = 2
+LOW_INCOME = 4
+ONLINE_ONLY = 8
+PARTIAL_LIMIT = 16
+MILITARY = 32
+BUSINESS = 64
+ELIGIBILITY_NAMES = {
+    YOUTH_ONLY: 'youth_only', SENIOR_ONLY: 'senior_only', LOW_INCOME: 'low_income', ONLINE_ONLY: 'online_only',
+    PARTIAL_LIMIT: 'partial_limit', MILITARY: 'military', BUSINESS: 'business',
+}
+# 나이/소득만으로는 확인할 수 없어 기본 조회에서 빼는 대상
+UNVERIFIABLE = MILITARY | BUSINESS
+
+# 우대조건 분류 비트
+BENEFIT_RULES = (
+    (1, 'salary_transfer', ('급여', '연금 수령', '연금이체')),
+    (2, 'card', ('카드',)),
+    (4, 'auto_transfer', ('자동이체',)),
+    (8, 'new_customer', ('신규고객', '첫 거래', '첫거래', '최초')),
+    (16, 'non_face', ('비대면', '모바일', '인터넷뱅킹', '스마트폰')),
+    (32, 'marketing', ('마케팅',)),
+    (64, 'housing', ('청약', '주택')),
+    (128, 'savings_goal', ('만기', '목표')),
+)
+
+YOUTH_DEFAULT_AGES = (19, 34)
+SENIOR_DEFAULT_MIN_AGE = 60
+LOW_INCOME_DEFAULT_SALARY = 50_000_000     # 서민전용인데 소득 기준이 없을 때 사용할 연소득 상한
+
+# 'N세 미만' 은 N-1 세까지, 'N세 이하' 는 N 세까지
+AGE_RANGE_RE = re.compile(r'(\d{1,2})\s*세?\s*(?:이상)?\s*[~\-～]\s*(?:만\s*)?(\d{1,2})\s*세\s*(미만)?')
+AGE_MIN_RE = re.compile(r'(\d{1,2})\s*세\s*이상')
+AGE_MAX_RE = re.compile(r'(\d{1,2})\s*세\s*(이하|미만)')
+# 'N세 미만은 법정대리인 동의 필요' 처럼 보호자 동의를 설명하는 문구는 나이 조건이 아님
+AGE_GUARDIAN_RE = re.compile(
+    r'(?:만\s*)?\d{1,2}\s*세\s*미만[^,.;()\n]*?(?:법정\s*대리인|보호자|부모|동의)[^,.;()\n]*'
+)
+# 'N세 미만 가입 불가', 'N세 미만 제외' 는 최소 나이 N
+AGE_EXCLUDE_RE = re.compile(r'(?:만\s*)?(\d{1,2})\s*세\s*미만[^,.;()\n]*?(?:제외|불가)')
+INCOME_RE = re.compile(r'(?:소득|급여)[^.,\n]{0,15}?(\d[\d,.]*\s*(?:억|천만|백만|만)\s*원?)\s*(?:이하|미만)')
+
+
+def _has(text, *keywords):
+    return any(keyword in text for keyword in keywords)
+
+
+def parse_ages(text):
+    text = AGE_GUARDIAN_RE.sub(' ', text)
+    excluded_below = [int(age) for age in AGE_EXCLUDE_RE.findall(text)]
+    text = AGE_EXCLUDE_RE.sub(' ', text)
+    match = AGE_RANGE_RE.search(text)
+    if match:
+        min_age, max_age = int(match.group(1)), int(match.group(2)) - (1 if match.group(3) else 0)
+    else:
+        min_match = AGE_MIN_RE.search(text)
+        max_match = AGE_MAX_RE.search(text)
+        min_age = int(min_match.group(1)) if min_match else None
+        max_age = int(max_match.group(1)) - (1 if max_match.group(2) == '미만' else 0) if max_match else None
+    if excluded_below:
+        min_age = max(min_age or 0, *excluded_below)
+    return min_age, max_age
+
+
+def business_only(member):
+    """개인사업자/법인만 가입할 수 있는 상품인지 ('개인 또는 개인사업자', '개인 및 법인' 은 아님)."""
+    if not _has(member, '개인사업자', '법인', '소상공인'):
+        return False
+    return not _has(member.replace('개인사업자', ''), '개인', '누구나', '제한없음', '제한 없음')
+
+
+def parse_eligibility(row):
+    """deposit_product_row 결과(dict)에서 자격 컬럼을 계산합니다."""
+    member = row.get('join_member') or ''
+    join_way = row.get('join_way') or ''
+    min_age, max_age = parse_ages(member)
+
+    flags = 0
+    if _has(member, '청년') or (max_age is not None and max_age <= 39 and (min_age or 0) >= 17):
+        flags |= YOUTH_ONLY
+        if min_age is None and max_age is None:
+            min_age, max_age = YOUTH_DEFAULT_AGES
+    if _has(member, '시니어', '어르신', '실버') or (min_age is not None and min_age >= 50):
+        flags |= SENIOR_ONLY
+        if min_age is None:
+            min_age = SENIOR_DEFAULT_MIN_AGE
+    if row.get('join_deny') == 2 or _has(member, '서민', '저소득', '기초생활', '차상위'):
+        flags |= LOW_INCOME
+    if row.get('join_deny') == 3:
+        flags |= PARTIAL_LIMIT
+    if _has(member, '군인', '장병', '병사', '군 복무'):
+        flags |= MILITARY
+    if business_only(member):
+        flags |= BUSINESS
+    # 영업점 없이 인터넷/스마트폰으로만 가입 가능
+    channels = [way.strip() for way in join_way.split(',') if way.strip()]
+    if channels and all(_has(way, '인터넷', '스마트폰', '모바일', '비대면') for way in channels):
+        flags |= ONLINE_ONLY
+
+    income = INCOME_RE.search(member)
+    max_income = max(parse_amounts(income.group(1))) if income else None
+    if max_income is None and flags & LOW_INCOME:
+        max_income = LOW_INCOME_DEFAULT_SALARY
+
+    spcl_cnd = row.get('spcl_cnd') or ''
+    benefit_flags = 0
+    for bit, _, keywords in BENEFIT_RULES:
+        if _has(spcl_cnd, *keywords):
+            benefit_flags |= bit
+
+    return {
+        'min_age': min_age,
+        'max_age': max_age,
+        'max_income': max_income,
+        'eligibility_flags': flags,
+        'benefit_flags': benefit_flags,
+    }
+
+
+def flag_names(flags):
+    return [name for bit, name in ELIGIBILITY_NAMES.items() if flags & bit]
+
+
+def benefit_names(flags):
+    return [name for bit, name, _ in BENEFIT_RULES if flags & bit]
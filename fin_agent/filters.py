@@ -0,0 +1,121 @@
+# 상품 목록 조회용 필터/정렬
+# - 옵션 조건(기간, 금리, 금리유형)은 Exists / Subquery 로 DB 안에서 처리해 인덱스를 타도록 합니다.
+# - 반환값은 (상품 queryset, 키셋 페이지네이션 정렬 키) 입니다.
+import math
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+from .loan_parsing import parse_amount
+from .models import DepositProduct, DepositOptions, JeonseLoanProduct, JeonseLoanOption
+
+MAX_NUMBER = 2 ** 63 - 1
+
+DEPOSIT_FILTER_PARAMS = ('kor_co_nm', 'save_trm', 'min_rate', 'intr_rate_type_nm', 'sort', 'cursor', 'limit')
+LOAN_FILTER_PARAMS = (
+    'kor_co_nm', 'rpay_type_nm', 'lend_rate_type_nm', 'max_rate', 'min_limit', 'max_early_fee', 'sort', 'cursor', 'limit',
+)
+
+
+def _number(params, name, cast):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = cast(value)
+        # 'inf', 'nan', DB 정수 범위를 넘는 값은 변환되더라도 필터 값으로 쓸 수 없음
+        if not math.isfinite(number) or abs(number) > MAX_NUMBER:
+            raise ValueError(value)
+    except (ValueError, OverflowError):
+        raise ValidationError({name: '숫자여야 합니다.'})
+    return number
+
+
+def _banks(params):
+    # 콤마로 여러 은행 지정 가능 (예: ?kor_co_nm=우리은행,국민은행)
+    value = params.get('kor_co_nm')
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+def _sort(params, allowed):
+    sort = params.get('sort') or 'id'
+    if sort not in allowed:
+        raise ValidationError({'sort': f"{', '.join(allowed)} 중 하나여야 합니다."})
+    return sort
+
+
+def filter_deposit_products(params):
+    sort = _sort(params, ('id', 'intr_rate2'))
+    save_trm = _number(params, 'save_trm', int)
+    min_rate = _number(params, 'min_rate', float)
+
+    options = DepositOptions.objects.filter(is_active=True)
+    if save_trm is not None:
+        options = options.filter(save_trm=save_trm)
+    if min_rate is not None:
+        options = options.filter(intr_rate2__gte=min_rate)
+    if params.get('intr_rate_type_nm'):
+        options = options.filter(intr_rate_type_nm=params['intr_rate_type_nm'])
+    option_filtered = save_trm is not None or min_rate is not None or bool(params.get('intr_rate_type_nm'))
+
+    products = DepositProduct.objects.filter(is_active=True)
+    if params.get('type'):
+        products = products.filter(product_type=params['type'])
+    if _banks(params):
+        products = products.filter(kor_co_nm__in=_banks(params))
+    products = products.prefetch_related(Prefetch('options', queryset=options))
+
+    if not option_filtered:
+        # 옵션 조건이 없으면 비정규화 컬럼(max_intr_rate2)만으로 필터/정렬
+        products = products.filter(option_count__gt=0)
+        ordering = ('-max_intr_rate2', 'id') if sort == 'intr_rate2' else ('id',)
+        return products, ordering
+
+    # 조건에 맞는 옵션 중 최고 우대금리로 정렬
+    matching = options.filter(product=OuterRef('pk'))
+    products = products.filter(Exists(matching)).annotate(
+        best_rate=Coalesce(Subquery(matching.order_by('-intr_rate2').values('intr_rate2')[:1]), 0.0),
+    )
+    ordering = ('-best_rate', 'id') if sort == 'intr_rate2' else ('id',)
+    return products, ordering
+
+
+def filter_loan_products(params):
+    sort = _sort(params, ('id', 'lend_rate_min'))
+    max_rate = _number(params, 'max_rate', float)
+
+    options = JeonseLoanOption.objects.filter(is_active=True)
+    if max_rate is not None:
+        options = options.filter(lend_rate_min__lte=max_rate)
+    if params.get('rpay_type_nm'):
+        options = options.filter(rpay_type_nm=params['rpay_type_nm'])
+    if params.get('lend_rate_type_nm'):
+        options = options.filter(lend_rate_type_nm=params['lend_rate_type_nm'])
+    option_filtered = max_rate is not None or bool(params.get('rpay_type_nm') or params.get('lend_rate_type_nm'))
+
+    products = JeonseLoanProduct.objects.filter(is_active=True)
+    if _banks(params):
+        products = products.filter(kor_co_nm__in=_banks(params))
+    # [추가] 텍스트에서 추출한 숫자 컬럼 필터 (예: ?min_limit=2억&max_early_fee=1.2)
+    if params.get('min_limit'):
+        min_limit = parse_amount(params['min_limit'])
+        if min_limit is None:
+            raise ValidationError({'min_limit': '금액(원 또는 "2억", "5000만원")이어야 합니다.'})
+        products = products.filter(loan_lmt_amount__gte=min_limit)
+    max_early_fee = _number(params, 'max_early_fee', float)
+    if max_early_fee is not None:
+        products = products.filter(erly_rpay_fee_rate__lte=max_early_fee)
+    products = products.prefetch_related(Prefetch('options', queryset=options))
+
+    if not option_filtered:
+        # 옵션 조건이 없으면 비정규화 컬럼(min_lend_rate_min)만으로 필터/정렬
+        products = products.filter(option_count__gt=0)
+        ordering = ('min_lend_rate_min', 'id') if sort == 'lend_rate_min' else ('id',)
+        return products, ordering
+
+    # 조건에 맞는 옵션 중 최저 금리로 정렬
+    matching = options.filter(product=OuterRef('pk'))
+    products = products.filter(Exists(matching)).annotate(
+        best_rate=Coalesce(Subquery(matching.order_by('lend_rate_min').values('lend_rate_min')[:1]), 0.0),
+    )
+    ordering = ('best_rate', 'id') if sort == 'lend_rate_min' else ('id',)
+    return products, ordering
@@ -0,0 +1,63 @@
+# 금융감독원 FinLife Open API 수집기
+# - 첫 페이지의 max_page_no 를 읽은 뒤 나머지 페이지를 스레드 풀에서 동시에 가져옵니다.
+# - 은행(020000)뿐 아니라 모든 권역(topFinGrpNo)을 조회하고 결과를 하나로 합칩니다.
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+import httpx
+
+DEPOSIT_ENDPOINT = 'depositProductsSearch.json'
+SAVING_ENDPOINT = 'savingProductsSearch.json'
+RENT_LOAN_ENDPOINT = 'rentHouseLoanProductsSearch.json'
+
+# 권역코드: 은행 / 여신전문 / 저축은행 / 보험 / 금융투자
+TOP_FIN_GROUPS = ('020000', '030200', '030300', '050000', '060000')
+
+MAX_WORKERS = 8
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+class FinlifeAPIError(Exception):
+    pass
+
+
+def _fetch_page(client, endpoint, group, page_no):
+    params = {'auth': settings.FINLIFE_API_KEY, 'topFinGrpNo': group, 'pageNo': page_no}
+    response = client.get(endpoint, params=params)
+    response.raise_for_status()
+    result = response.json().get('result') or {}
+    err_cd = result.get('err_cd', '000')
+    if err_cd != '000':
+        raise FinlifeAPIError(f"[{group} p{page_no}] {err_cd} {result.get('err_msg', '')}")
+    return result
+
+
+def iter_pages(endpoint, groups=TOP_FIN_GROUPS, max_workers=MAX_WORKERS):
+    """모든 권역/페이지의 result 를 (권역, 페이지) 순서대로 내보냅니다."""
+    limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+    with httpx.Client(base_url=settings.FINLIFE_BASE_URL, timeout=TIMEOUT, limits=limits) as client, \
+            ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # 1단계: 권역별 첫 페이지
+        first_pages = list(pool.map(lambda g: _fetch_page(client, endpoint, g, 1), groups))
+
+        # 2단계: 2페이지 이후를 한꺼번에 요청
+        futures = {}
+        for group, first in zip(groups, first_pages):
+            max_page_no = int(first.get('max_page_no') or 1)
+            futures[group] = [
+                pool.submit(_fetch_page, client, endpoint, group, page_no)
+                for page_no in range(2, max_page_no + 1)
+            ]
+
+        for group, first in zip(groups, first_pages):
+            yield first
+            for future in futures[group]:
+                yield future.result()
+
+
+def fetch_product_lists(endpoint, groups=TOP_FIN_GROUPS, max_workers=MAX_WORKERS):
+    """전체 페이지를 합친 (baseList, optionList) 를 반환합니다."""
+    base_list, option_list = [], []
+    for result in iter_pages(endpoint, groups, max_workers):
+        base_list.extend(result.get('baseList') or [])
+        option_list.extend(result.get('optionList') or [])
+    return base_list, option_list
@@ -0,0 +1,76 @@
+# 금리 변경 이력 (run-length 압축)
+# - 수집 때 옵션 금리가 실제로 바뀐 경우에만 이전 구간을 닫고(valid_to) 새 구간을 추가합니다.
+#   매일 수집해도 금리가 그대로면 행이 늘지 않습니다.
+# - 판매가 중단된(원본에서 사라진) 옵션은 구간만 닫습니다.
+from django.db.models import Q
+from django.utils import timezone
+from .models import DepositOptions, JeonseLoanOption, RateHistory
+
+BATCH_SIZE = 500
+
+# 옵션 모델별 (kind, (rate, rate2, rate_avg) 에 대응하는 필드)
+RATE_FIELDS = {
+    DepositOptions: ('deposit', ('intr_rate', 'intr_rate2', None)),
+    JeonseLoanOption: ('loan', ('lend_rate_min', 'lend_rate_max', 'lend_rate_avg')),
+}
+HISTORY_FIELDS = ('kind', 'fin_prdt_cd', 'option_key', 'rate', 'rate2', 'rate_avg', 'valid_from', 'valid_to')
+
+
+def option_key(key):
+    # key = (product_id, 옵션 구분 필드...) → '12|단리'
+    return '|'.join(str(value) for value in key[1:])
+
+
+def _rates(fields, get):
+    return tuple(get(field) if field else None for field in fields)
+
+
+def record_rate_changes(option_model, rows, existing, retire_missing, now=None):
+    """_apply 전에 호출합니다. rows/existing 은 _ingest 의 옵션 dict (같은 키).
+
+    금리가 바뀐 기존 옵션의 (fin_prdt_cd, option_key, 이전 금리, 새 금리) 목록을 반환합니다. (알림 발송용)
+    """
+    kind, fields = RATE_FIELDS[option_model]
+    now = now or timezone.now()
+    changed = {}        # (fin_prdt_cd, option_key) -> 새 금리 (None 이면 구간 종료만)
+    rate_changes = []
+    for key, row in rows.items():
+        rates = _rates(fields, row.get)
+        instance = existing.get(key)
+        previous = _rates(fields, lambda f: getattr(instance, f)) if instance is not None and instance.is_active else None
+        if previous != rates:
+            changed[(row['fin_prdt_cd'], option_key(key))] = rates
+            if previous is not None:
+                rate_changes.append((row['fin_prdt_cd'], option_key(key), previous, rates))
+    if retire_missing:
+        for key, instance in existing.items():
+            if key not in rows and instance.is_active:
+                changed[(instance.fin_prdt_cd, option_key(key))] = None
+    if not changed:
+        return rate_changes
+
+    open_runs = RateHistory.objects.filter(
+        kind=kind, valid_to__isnull=True, fin_prdt_cd__in={code for code, _ in changed},
+    ).values_list('id', 'fin_prdt_cd', 'option_key')
+    closing = [pk for pk, code, key in open_runs if (code, key) in changed]
+    if closing:
+        RateHistory.objects.filter(pk__in=closing).update(valid_to=now)
+    RateHistory.objects.bulk_create(
+        [
+            RateHistory(kind=kind, fin_prdt_cd=code, option_key=key, rate=rates[0], rate2=rates[1],
+                        rate_avg=rates[2], valid_from=now)
+            for (code, key), rates in changed.items() if rates is not None
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return rate_changes
+
+
+def load_history(since=None, fin_prdt_cd=None):
+    """since 이후에 적용된 적이 있는 구간을 한 번의 쿼리로 읽어 튜플 목록(HISTORY_FIELDS 순서)으로 반환합니다."""
+    runs = RateHistory.objects.all()
+    if since is not None:
+        runs = runs.filter(Q(valid_to__isnull=True) | Q(valid_to__gte=since))
+    if fin_prdt_cd is not None:
+        runs = runs.filter(fin_prdt_cd=fin_prdt_cd)
+    return list(runs.order_by('fin_prdt_cd', 'option_key', 'valid_from').values_list(*HISTORY_FIELDS))
@@ -0,0 +1,269 @@
+# FinLife 수집 데이터 일괄 저장(bulk upsert) 엔진
+# - 기존 행을 fin_prdt_cd 기준으로 한 번에 읽어와 메모리에서 비교한 뒤
+#   변경된 행만 bulk_create / bulk_update 로 반영합니다.
+# - 상품의 옵션 요약 컬럼(최고 우대금리, 대표 기간, 옵션 수 등)도 이 단계에서 함께 갱신합니다.
+# - 각 행의 content_hash 가 같으면 쓰기를 건너뛰고, 원본에서 사라진 행은 is_active=False 로 남깁니다.
+# - 전체 갱신이 (상품 수 + 옵션 수)번의 쿼리가 아니라 몇 개의 SQL 문으로 끝납니다.
+import hashlib
+import json
+from collections import defaultdict
+from django.db import connection, transaction
+from django.db.models import Q
+from .cache import bump_catalogue_version
+from .models import DepositProduct, DepositOptions, JeonseLoanProduct, JeonseLoanOption
+from .eligibility import parse_eligibility
+from .history import record_rate_changes
+from .loan_parsing import parse_loan_text
+from .notifications import notify_rate_changes
+from .search import index_products
+
+BATCH_SIZE = 500
+
+DEPOSIT_PRODUCT_FIELDS = (
+    'kor_co_nm', 'fin_prdt_nm', 'etc_note', 'join_deny',
+    'join_member', 'join_way', 'spcl_cnd', 'product_type',
+    # 가입대상/우대조건에서 추출한 자격 컬럼
+    'min_age', 'max_age', 'max_income', 'eligibility_flags', 'benefit_flags',
+)
+DEPOSIT_OPTION_FIELDS = ('fin_prdt_cd', 'intr_rate', 'intr_rate2')
+
+LOAN_PRODUCT_FIELDS = (
+    'kor_co_nm', 'fin_prdt_nm', 'join_way', 'loan_inci_expn',
+    'erly_rpay_fee', 'dly_rate', 'loan_lmt',
+    # 텍스트에서 추출한 숫자 컬럼 / 태그
+    'loan_lmt_amount', 'loan_lmt_ratio', 'erly_rpay_fee_rate', 'erly_rpay_fee_months',
+    'dly_rate_spread', 'dly_rate_max', 'parse_flags', 'search_tag',
+)
+LOAN_OPTION_FIELDS = ('fin_prdt_cd', 'lend_rate_min', 'lend_rate_max', 'lend_rate_avg')
+
+
+def _to_float(value):
+    return float(value) if value not in (None, '') else None
+
+
+# 1. API 응답 한 줄 -> 모델 필드 dict 변환
+def deposit_product_row(item, product_type):
+    join_deny = item.get('join_deny')
+    row = {
+        'fin_prdt_cd': item.get('fin_prdt_cd'),
+        'kor_co_nm': item.get('kor_co_nm'),
+        'fin_prdt_nm': item.get('fin_prdt_nm'),
+        'etc_note': item.get('etc_note'),
+        'join_deny': int(join_deny) if join_deny not in (None, '') else None,
+        'join_member': item.get('join_member'),
+        'join_way': item.get('join_way'),
+        'spcl_cnd': item.get('spcl_cnd'),
+        'product_type': product_type,
+    }
+    row.update(parse_eligibility(row))
+    return row
+
+
+def deposit_option_row(item):
+    return {
+        'fin_prdt_cd': item.get('fin_prdt_cd'),
+        'intr_rate_type_nm': item.get('intr_rate_type_nm'),
+        'save_trm': int(item.get('save_trm')),
+        'intr_rate': _to_float(item.get('intr_rate')) or 0,
+        'intr_rate2': _to_float(item.get('intr_rate2')) or 0,
+    }
+
+
+def loan_product_row(item):
+    row = {
+        'fin_prdt_cd': item.get('fin_prdt_cd'),
+        'kor_co_nm': item.get('kor_co_nm'),
+        'fin_prdt_nm': item.get('fin_prdt_nm'),
+        'join_way': item.get('join_way'),
+        'loan_inci_expn': item.get('loan_inci_expn') or '정보 없음',
+        'erly_rpay_fee': item.get('erly_rpay_fee') or '정보 없음',
+        'dly_rate': item.get('dly_rate') or '정보 없음',
+        'loan_lmt': item.get('loan_lmt') or '한도 확인 필요',
+    }
+    row.update(parse_loan_text(row))
+    return row
+
+
+def loan_option_row(item):
+    return {
+        'fin_prdt_cd': item.get('fin_prdt_cd'),
+        'rpay_type_nm': item.get('rpay_type_nm'),
+        'lend_rate_type_nm': item.get('lend_rate_type_nm'),
+        'lend_rate_min': _to_float(item.get('lend_rate_min')) or 0,
+        'lend_rate_max': _to_float(item.get('lend_rate_max')) or 0,
+        'lend_rate_avg': _to_float(item.get('lend_rate_avg')),
+    }
+
+
+# 2. 내용 지문(fingerprint) 계산
+def fingerprint(values):
+    """필드 값으로부터 행 내용 해시를 만듭니다. 값이 같으면 항상 같은 해시가 나옵니다."""
+    payload = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+# 3. 상품별 옵션 요약 (비정규화 컬럼 값)
+def deposit_summary(options):
+    # 금리가 같으면 더 짧은 기간을 대표 기간으로 사용
+    best = max(options, key=lambda o: (o['intr_rate2'] or 0, -o['save_trm']), default=None)
+    return {
+        'max_intr_rate2': best['intr_rate2'] if best else None,
+        'best_save_trm': best['save_trm'] if best else None,
+        'option_count': len(options),
+    }
+
+
+def loan_summary(options):
+    rates = [o['lend_rate_min'] for o in options if o['lend_rate_min'] is not None]
+    return {'min_lend_rate_min': min(rates, default=None), 'option_count': len(options)}
+
+
+def _refresh_summaries(product_model, option_model, product_ids, summarize, value_fields):
+    """활성 옵션을 한 번에 읽어 요약 컬럼을 다시 계산하고, 값이 바뀐 상품만 bulk_update 합니다."""
+    grouped = defaultdict(list)
+    active_options = option_model.objects.filter(product_id__in=product_ids, is_active=True)
+    for row in active_options.values('product_id', *value_fields):
+        grouped[row['product_id']].append(row)
+
+    summary_fields = list(summarize([]))
+    changed = []
+    for product in product_model.objects.filter(pk__in=product_ids).only(*summary_fields):
+        summary = summarize(grouped[product.pk])
+        if any(getattr(product, field) != value for field, value in summary.items()):
+            for field, value in summary.items():
+                setattr(product, field, value)
+            changed.append(product)
+    if changed:
+        product_model.objects.bulk_update(changed, summary_fields, batch_size=BATCH_SIZE)
+    return len(changed)
+
+
+# 4. 메모리 diff 후 bulk 반영
+def _apply(model, rows, existing, unique_fields, update_fields, retire_missing):
+    """rows/existing 은 같은 키로 묶인 dict. 지문이 같은 행은 건너뛰고 (처리 건수, 추가/수정/비활성화한 키 목록)을 반환합니다."""
+    write_fields = list(update_fields) + ['content_hash', 'is_active']
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+    to_create, to_update, changed = [], [], []
+    for key, values in rows.items():
+        values = dict(values, content_hash=fingerprint({f: values[f] for f in update_fields}), is_active=True)
+        instance = existing.get(key)
+        if instance is not None and instance.is_active and instance.content_hash == values['content_hash']:
+            stats['unchanged'] += 1
+            continue
+        if instance is None:
+            to_create.append(model(**values))
+        else:
+            for field in write_fields:
+                setattr(instance, field, values[field])
+            to_update.append(instance)
+        changed.append(key)
+
+    if to_create:
+        if connection.features.supports_update_conflicts_with_target:
+            # 동시에 다른 수집이 같은 키를 먼저 넣었더라도 충돌 시 UPDATE 로 처리
+            model.objects.bulk_create(
+                to_create, batch_size=BATCH_SIZE, update_conflicts=True,
+                unique_fields=unique_fields, update_fields=write_fields,
+            )
+        else:
+            model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    if to_update:
+        model.objects.bulk_update(to_update, write_fields, batch_size=BATCH_SIZE)
+
+    # 원본에서 사라진 행은 삭제하지 않고 비활성(soft-retire) 처리
+    if retire_missing:
+        retired = {key: i.pk for key, i in existing.items() if key not in rows and i.is_active}
+        if retired:
+            model.objects.filter(pk__in=retired.values()).update(is_active=False)
+        stats['deleted'] = len(retired)
+        changed.extend(retired)
+
+    stats['inserted'] = len(to_create)
+    stats['updated'] = len(to_update)
+    return stats, changed
+
+
+def _ingest(product_model, option_model, product_rows, option_rows,
+            product_fields, option_key_fields, option_fields, summary, scope=None):
+    # 같은 키가 여러 번 내려오면 마지막 값을 사용
+    products = {row['fin_prdt_cd']: row for row in product_rows}
+    codes = list(products)
+    # 빈 응답으로 전체 카탈로그가 비활성화되는 것을 방지
+    retire_missing = bool(products)
+
+    with transaction.atomic():
+        # 이번 수집 범위(scope)의 기존 상품 + 응답에 포함된 상품을 한 번에 조회 (scope 없으면 전체)
+        condition = Q(fin_prdt_cd__in=codes) | Q(**scope) if scope else Q()
+        existing_products = {p.fin_prdt_cd: p for p in product_model.objects.filter(condition)}
+        product_stats, changed_codes = _apply(
+            product_model, products, existing_products, ['fin_prdt_cd'], list(product_fields),
+            retire_missing,
+        )
+
+        product_ids = {code: p.id for code, p in existing_products.items()}
+        if product_stats['inserted']:
+            product_ids.update(
+                product_model.objects.filter(fin_prdt_cd__in=codes).values_list('fin_prdt_cd', 'id')
+            )
+
+        options = {}
+        for row in option_rows:
+            product_id = product_ids.get(row['fin_prdt_cd'])
+            if product_id is None:
+                continue
+            row['product_id'] = product_id
+            options[(product_id,) + tuple(row[f] for f in option_key_fields)] = row
+
+        existing_options = {
+            (o.product_id,) + tuple(getattr(o, f) for f in option_key_fields): o
+            for o in option_model.objects.filter(product_id__in=product_ids.values())
+        }
+        # 금리가 바뀐 옵션만 이력 구간 추가 (_apply 가 기존 행을 덮어쓰기 전에 비교)
+        rate_changes = record_rate_changes(option_model, options, existing_options, retire_missing)
+        option_stats, _ = _apply(
+            option_model, options, existing_options,
+            ['product'] + list(option_key_fields), list(option_fields),
+            retire_missing,
+        )
+
+        # 예적금 금리가 바뀌었으면 해당 (상품, 기간) 가입자에게 알림
+        if option_model is DepositOptions and rate_changes:
+            notify_rate_changes(rate_changes)
+
+        # 옵션 요약 컬럼(최고/최저 금리, 옵션 수) 재계산
+        summarize, value_fields = summary
+        _refresh_summaries(product_model, option_model, list(product_ids.values()), summarize, value_fields)
+
+        # 실제로 바뀐 행이 있을 때만 카탈로그 응답 캐시 무효화 (버전 행을 같은 트랜잭션에서 올림)
+        if any(stats[k] for stats in (product_stats, option_stats) for k in ('inserted', 'updated', 'deleted')):
+            bump_catalogue_version()
+        # 상품 본문(우대조건, 가입대상 등)이 바뀌었으면 검색 색인 갱신
+        if any(product_stats[k] for k in ('inserted', 'updated', 'deleted')):
+            changed_ids = [product_ids[code] for code in changed_codes]
+            transaction.on_commit(lambda: index_products(product_model, changed_ids))
+
+    return {'products': product_stats, 'options': option_stats}
+
+
+# 5. 외부에서 사용하는 진입점
+def ingest_deposit_products(base_list, option_list, product_type):
+    """정기예금/적금 상품과 옵션을 한 트랜잭션으로 저장합니다."""
+    return _ingest(
+        DepositProduct, DepositOptions,
+        [deposit_product_row(p, product_type) for p in base_list],
+        [deposit_option_row(o) for o in option_list],
+        DEPOSIT_PRODUCT_FIELDS, ('save_trm', 'intr_rate_type_nm'), DEPOSIT_OPTION_FIELDS,
+        (deposit_summary, ('save_trm', 'intr_rate2')),
+        scope={'product_type': product_type},
+    )
+
+
+def ingest_loan_products(base_list, option_list):
+    """전세자금대출 상품과 옵션을 한 트랜잭션으로 저장합니다."""
+    return _ingest(
+        JeonseLoanProduct, JeonseLoanOption,
+        [loan_product_row(p) for p in base_list],
+        [loan_option_row(o) for o in option_list],
+        LOAN_PRODUCT_FIELDS, ('rpay_type_nm', 'lend_rate_type_nm'), LOAN_OPTION_FIELDS,
+        (loan_summary, ('lend_rate_min',)),
+    )
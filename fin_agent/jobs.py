@@ -0,0 +1,77 @@
+# FinLife 수집 작업 실행기 (외부 브로커 없는 프로세스 내부 작업 큐)
+# - HTTP 요청은 작업을 등록하고 job id 만 돌려받습니다.
+# - 실제 수집/저장은 단일 워커 스레드에서 순서대로 실행되어 SQLite 쓰기 경합을 피합니다.
+# - 프로세스가 재시작되어 끝나지 못한 작업은 SYNC_JOB_TIMEOUT 이 지나면 실패로 정리합니다.
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .finlife import fetch_product_lists, DEPOSIT_ENDPOINT, SAVING_ENDPOINT, RENT_LOAN_ENDPOINT
+from .ingestion import ingest_deposit_products, ingest_loan_products
+from .models import SyncJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='finlife-sync')
+    return _executor
+
+
+# 1. 작업 종류별 수집 로직
+def run_sync(kind):
+    """FinLife 에서 전체 페이지를 받아 DB 에 반영하고 처리 건수를 반환합니다."""
+    if kind == 'deposit':
+        return ingest_deposit_products(*fetch_product_lists(DEPOSIT_ENDPOINT), 'deposit')
+    if kind == 'saving':
+        return ingest_deposit_products(*fetch_product_lists(SAVING_ENDPOINT), 'saving')
+    if kind == 'loan':
+        return ingest_loan_products(*fetch_product_lists(RENT_LOAN_ENDPOINT))
+    raise ValueError(f"알 수 없는 수집 종류: {kind}")
+
+
+# 2. 작업 실행 (상태/소요시간/결과 기록)
+def execute(job_id):
+    close_old_connections()
+    try:
+        job = SyncJob.objects.get(pk=job_id)
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+        try:
+            job.result = run_sync(job.kind)
+            job.status = 'success'
+        except Exception as e:
+            logger.exception("FinLife 수집 실패 (job #%s)", job_id)
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+        return job
+    finally:
+        close_old_connections()
+
+
+# 3. 작업 등록
+def enqueue(kind):
+    """같은 종류의 작업이 대기/실행 중이면 새로 만들지 않고 그 작업을 돌려줍니다."""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.SYNC_JOB_TIMEOUT)
+    active = SyncJob.objects.filter(kind=kind, status__in=('queued', 'running'))
+    # 워커 프로세스가 중간에 종료되어 상태가 바뀌지 않는 작업은 재사용하지 않고 실패 처리
+    active.filter(
+        Q(started_at__lt=stale_before) | Q(started_at__isnull=True, created_at__lt=stale_before)
+    ).update(status='failed', error='작업이 제한 시간 안에 끝나지 않았습니다. (프로세스 중단)', finished_at=now)
+    job = active.order_by('-pk').first()
+    if job:
+        return job
+    job = SyncJob.objects.create(kind=kind)
+    transaction.on_commit(lambda: _get_executor().submit(execute, job.pk))
+    return job
@@ -0,0 +1,119 @@
+# 가입 상품 일괄 가입/수정
+# - 상품, 기본 옵션, 기존 가입 내역을 각각 한 번의 쿼리로 읽고 bulk_create / bulk_update 로 한 트랜잭션에 씁니다.
+# - 중복 가입은 미리 조회하지 않고 (user, product) unique_together 제약으로 막습니다.
+#   충돌이 있으면 항목별 savepoint 로 다시 저장해, 실제로 충돌한 항목만 오류로 돌려줍니다. (동시 요청 포함)
+# - 항목별 결과를 요청 순서대로 반환합니다.
+from django.db import IntegrityError, transaction
+from .models import DepositProduct, DepositOptions, UserJoinedProduct
+from .serializers import UserJoinedProductSerializer
+
+BULK_LIMIT = 100
+DEFAULT_SAVE_TRM = 12
+
+
+def pick_default_option(options, save_trm=DEFAULT_SAVE_TRM):
+    """요청 기간(기본 12개월) 옵션을 우선, 없으면 첫 번째 옵션."""
+    for option in options:
+        if option.save_trm == save_trm:
+            return option
+    return options[0] if options else None
+
+
+def rate_defaults(option):
+    # 옵션의 기본 금리와 유형(S:단리, M:복리)
+    if option is None:
+        return {'intr_rate': 0.0, 'intr_rate_type': 'S'}
+    return {'intr_rate': option.intr_rate, 'intr_rate_type': 'M' if '복리' in option.intr_rate_type_nm else 'S'}
+
+
+def _validate(item, instance=None):
+    serializer = UserJoinedProductSerializer(instance, data=item, partial=True)
+    if serializer.is_valid():
+        return serializer.validated_data, None
+    return None, serializer.errors
+
+
+def _join_all(user, items, results):
+    codes = {item.get('fin_prdt_cd') for _, item in items}
+    products = {p.fin_prdt_cd: p for p in DepositProduct.objects.filter(fin_prdt_cd__in=codes, is_active=True)}
+    options = {}
+    for option in DepositOptions.objects.filter(product__in=products.values(), is_active=True).order_by('id'):
+        options.setdefault(option.product_id, []).append(option)
+
+    pending = {}
+    for index, item in items:
+        code = item.get('fin_prdt_cd')
+        product = products.get(code)
+        if product is None:
+            results[index] = {'fin_prdt_cd': code, 'status': 'error', 'message': '상품을 찾을 수 없습니다.'}
+            continue
+        if product.pk in pending:
+            results[index] = {'fin_prdt_cd': code, 'status': 'error', 'message': '이미 가입한 상품입니다.'}
+            continue
+        data, errors = _validate({k: v for k, v in item.items() if k != 'fin_prdt_cd'})
+        if errors:
+            results[index] = {'fin_prdt_cd': code, 'status': 'error', 'message': errors}
+            continue
+        save_trm = data.setdefault('save_trm', DEFAULT_SAVE_TRM)
+        for field, value in rate_defaults(pick_default_option(options.get(product.pk, []), save_trm)).items():
+            data.setdefault(field, value)
+        pending[product.pk] = (index, UserJoinedProduct(user=user, product=product, **data))
+
+    if not pending:
+        return []
+    rows = [obj for _, obj in pending.values()]
+    conflicts = set()
+    try:
+        with transaction.atomic():
+            UserJoinedProduct.objects.bulk_create(rows)
+    except IntegrityError:
+        # 이미 가입한 상품이 섞여 있으면 항목별로 다시 저장 (롤백된 배치에서 받은 pk 는 버림)
+        for obj in rows:
+            obj.pk = None
+            try:
+                with transaction.atomic():
+                    obj.save(force_insert=True)
+            except IntegrityError:
+                conflicts.add(obj.product_id)
+    for product_id, (index, obj) in pending.items():
+        code = obj.product.fin_prdt_cd
+        if product_id in conflicts:
+            results[index] = {'fin_prdt_cd': code, 'status': 'error', 'message': '이미 가입한 상품입니다.'}
+        else:
+            results[index] = {'fin_prdt_cd': code, 'status': 'created', 'id': obj.pk}
+    return [product_id for product_id in pending if product_id not in conflicts]
+
+
+def _update_all(user, items, results):
+    rows = UserJoinedProduct.objects.filter(user=user, pk__in={item.get('id') for _, item in items}).in_bulk()
+    changed, fields = {}, set()
+    for index, item in items:
+        instance = rows.get(item.get('id'))
+        if instance is None:
+            results[index] = {'id': item.get('id'), 'status': 'error', 'message': '가입 내역을 찾을 수 없습니다.'}
+            continue
+        data, errors = _validate({k: v for k, v in item.items() if k != 'id'}, instance)
+        if errors:
+            results[index] = {'id': instance.pk, 'status': 'error', 'message': errors}
+            continue
+        for field, value in data.items():
+            setattr(instance, field, value)
+        fields.update(data)
+        changed[instance.pk] = instance
+        results[index] = {'id': instance.pk, 'status': 'updated'}
+    if changed and fields:
+        UserJoinedProduct.objects.bulk_update(list(changed.values()), sorted(fields))
+
+
+def bulk_apply(user, joins, updates):
+    """joins: [{fin_prdt_cd, amount, ...}], updates: [{id, amount, ...}]
+    → (가입 결과 목록, 수정 결과 목록, 새로 가입한 상품 pk 목록)"""
+    join_results = [None] * len(joins)
+    update_results = [None] * len(updates)
+    joined_product_ids = []
+    with transaction.atomic():
+        if joins:
+            joined_product_ids = _join_all(user, list(enumerate(joins)), join_results)
+        if updates:
+            _update_all(user, list(enumerate(updates)), update_results)
+    return join_results, update_results, joined_product_ids
@@ -0,0 +1,118 @@
+# 전세자금대출 자유 텍스트 필드 파싱 (수집 시 실행)
+# - loan_lmt(대출한도), erly_rpay_fee(중도상환수수료), dly_rate(연체이자율) 문구에서 금액/비율/기간을 숫자로 뽑아
+#   별도 컬럼에 저장합니다. 숫자 컬럼이라 DB 에서 바로 필터/정렬할 수 있습니다.
+# - 필드별 신뢰도(parse_flags): exact(값 1개), partial(여러 값 중 대표값 선택), missing(찾지 못함)
+# - 검색/추천용 태그(search_tag)도 함께 만듭니다.
+import math
+import re
+
+AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(억|천만|백만|만|원)')
+UNITS = {'억': 100_000_000, '천만': 10_000_000, '백만': 1_000_000, '만': 10_000, '원': 1}
+PERCENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+PERIOD_RE = re.compile(r'(\d+)\s*(년|개월)')
+SPREAD_RE = re.compile(r'\+\s*(\d+(?:\.\d+)?)\s*%')
+CAP_RE = re.compile(r'(?:최고|최대)[^\d%]{0,6}(\d+(?:\.\d+)?)\s*%')
+NO_FEE_RE = re.compile(r'없음|면제|미부과|미징수')
+MAX_AMOUNT = 2 ** 63 - 1    # BigIntegerField 범위를 넘는 금액(예: 'inf', '1e400')은 금액으로 보지 않음
+
+GUARANTEE_TAGS = (
+    (('주택금융공사', 'HF'), 'HF보증'),
+    (('주택도시보증공사', 'HUG'), 'HUG보증'),
+    (('서울보증', 'SGI'), 'SGI보증'),
+)
+
+
+def _number(text):
+    return float(text.replace(',', ''))
+
+
+def parse_amounts(text):
+    """'2억 2천만원', '5,000만원', '1.5억' 같은 금액을 원 단위 정수 목록으로 반환합니다."""
+    amounts = []
+    previous = None
+    for match in AMOUNT_RE.finditer(text or ''):
+        value = _number(match.group(1)) * UNITS[match.group(2)]
+        # '2억 2천만원' 처럼 큰 단위 바로 뒤에 작은 단위가 이어지면 한 금액으로 합침
+        if (
+            previous is not None and not text[previous.end():match.start()].strip()
+            and UNITS[previous.group(2)] > UNITS[match.group(2)]
+        ):
+            amounts[-1] += value
+        else:
+            amounts.append(value)
+        previous = match
+    return [int(round(a)) for a in amounts if math.isfinite(a) and abs(a) <= MAX_AMOUNT]
+
+
+def parse_amount(text):
+    """가장 큰 금액 (예: '최대 2억원' → 200000000). 숫자만 있으면 원 단위로 봅니다."""
+    amounts = parse_amounts(text)
+    if amounts:
+        return max(amounts)
+    try:
+        amount = int(_number(text))
+    except (AttributeError, ValueError, OverflowError):
+        return None
+    return amount if abs(amount) <= MAX_AMOUNT else None
+
+
+def parse_percents(text):
+    return [float(p) for p in PERCENT_RE.findall(text or '')]
+
+
+def parse_months(text):
+    return [int(n) * (12 if unit == '년' else 1) for n, unit in PERIOD_RE.findall(text or '')]
+
+
+def _pick(values, pick=max):
+    if not values:
+        return None, 'missing'
+    return pick(values), 'exact' if len(set(values)) == 1 else 'partial'
+
+
+def parse_loan_text(row):
+    """loan_product_row 결과(dict)에서 숫자 컬럼, 신뢰도, 검색 태그를 계산합니다."""
+    flags = {}
+    loan_lmt = row.get('loan_lmt') or ''
+    fee_text = row.get('erly_rpay_fee') or ''
+    dly_text = row.get('dly_rate') or ''
+
+    # 1. 대출한도: 최대 금액, 보증금 대비 비율(%)
+    loan_lmt_amount, flags['loan_lmt_amount'] = _pick(parse_amounts(loan_lmt))
+    loan_lmt_ratio, flags['loan_lmt_ratio'] = _pick(parse_percents(loan_lmt))
+
+    # 2. 중도상환수수료: 최고 요율(%), 부과 기간(개월). '없음/면제' 는 0%
+    fee_rate, flags['erly_rpay_fee_rate'] = _pick(parse_percents(fee_text))
+    if fee_rate is None and NO_FEE_RE.search(fee_text):
+        fee_rate, flags['erly_rpay_fee_rate'] = 0.0, 'exact'
+    fee_months, flags['erly_rpay_fee_months'] = _pick(parse_months(fee_text))
+
+    # 3. 연체이자율: 가산금리(+%p), 최고 이자율
+    dly_spread, flags['dly_rate_spread'] = _pick([float(p) for p in SPREAD_RE.findall(dly_text)])
+    dly_cap, flags['dly_rate_max'] = _pick([float(p) for p in CAP_RE.findall(dly_text)])
+    if dly_cap is None:
+        dly_cap, flags['dly_rate_max'] = _pick(parse_percents(dly_text))
+        if dly_cap is not None:
+            flags['dly_rate_max'] = 'partial'
+
+    return {
+        'loan_lmt_amount': loan_lmt_amount,
+        'loan_lmt_ratio': loan_lmt_ratio,
+        'erly_rpay_fee_rate': fee_rate,
+        'erly_rpay_fee_months': fee_months,
+        'dly_rate_spread': dly_spread,
+        'dly_rate_max': dly_cap,
+        'parse_flags': flags,
+        'search_tag': build_search_tag(row, loan_lmt_amount, fee_rate),
+    }
+
+
+def build_search_tag(row, loan_lmt_amount, fee_rate):
+    tags = [way.strip() for way in (row.get('join_way') or '').split(',') if way.strip()]
+    text = ' '.join(str(row.get(f) or '') for f in ('loan_inci_expn', 'loan_lmt', 'fin_prdt_nm'))
+    tags += [tag for keywords, tag in GUARANTEE_TAGS if any(k in text for k in keywords)]
+    if loan_lmt_amount and loan_lmt_amount >= 100_000_000:
+        tags.append(f'한도{loan_lmt_amount / 100_000_000:g}억')
+    if fee_rate == 0:
+        tags.append('중도상환수수료없음')
+    return ','.join(dict.fromkeys(tags))
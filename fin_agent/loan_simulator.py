@@ -0,0 +1,136 @@
+# 전세자금대출 상환 비용 시뮬레이터
+# - 활성 대출 옵션 전체 x 대출기간(시나리오) x 상환방식을 (행 x 개월) 배열로 만들어 NumPy 로 한 번에 계산합니다.
+# - 상환방식: 원리금균등(installment), 원금균등(principal), 만기일시(bullet)
+#   FinLife 상환유형이 '만기일시상환'이면 만기일시만, '분할상환'이면 원리금균등/원금균등 두 가지로 계산합니다.
+import numpy as np
+from .cache import get_catalogue_version
+from .models import JeonseLoanOption
+
+METHODS = ('installment', 'principal', 'bullet')
+METHOD_NAMES = {'installment': '원리금균등', 'principal': '원금균등', 'bullet': '만기일시'}
+RATE_CHOICES = ('min', 'avg', 'max')
+MAX_TERM = 600      # 50년
+
+
+def methods_for(rpay_type_nm):
+    if '만기' in rpay_type_nm:
+        return ('bullet',)
+    if '분할' in rpay_type_nm:
+        return ('installment', 'principal')
+    return METHODS
+
+
+class LoanOptionTable:
+    def __init__(self, options):
+        # options: [(option_id, fin_prdt_cd, fin_prdt_nm, kor_co_nm, rpay_type_nm, lend_rate_type_nm, min, max, avg)]
+        self.options = options
+        self.rates = {
+            'min': np.array([o[6] for o in options], dtype=float),
+            'max': np.array([o[7] for o in options], dtype=float),
+            # 평균 금리가 없으면 최저/최고의 중간값 사용
+            'avg': np.array([o[8] if o[8] and o[8] > 0 else (o[6] + o[7]) / 2 for o in options], dtype=float),
+        }
+
+
+_table_cache = {}
+
+
+def get_option_table():
+    """카탈로그 버전이 바뀔 때만 옵션 표를 다시 읽습니다."""
+    version = get_catalogue_version()
+    table = _table_cache.get(version)
+    if table is None:
+        # FinLife 가 금리를 비워 보낸 옵션은 0 으로 저장되므로 (가장 싼 대출로 보이지 않게) 제외
+        options = list(
+            JeonseLoanOption.objects.filter(
+                is_active=True, product__is_active=True, lend_rate_min__gt=0, lend_rate_max__gt=0,
+            ).order_by('id').values_list(
+                'id', 'product__fin_prdt_cd', 'product__fin_prdt_nm', 'product__kor_co_nm',
+                'rpay_type_nm', 'lend_rate_type_nm', 'lend_rate_min', 'lend_rate_max', 'lend_rate_avg',
+            )
+        )
+        table = LoanOptionTable(options)
+        _table_cache.clear()
+        _table_cache[version] = table
+    return table
+
+
+def schedules(principal, annual_rates, terms, methods):
+    """행별(금리, 기간, 방식) 월별 (원금 상환액, 이자) 배열 (S, M). 기간이 지난 칸은 0."""
+    r = (annual_rates / 100 / 12)[:, None]                      # (S, 1)
+    n = terms[:, None]                                           # (S, 1)
+    months = np.arange(1, terms.max() + 1)[None, :]              # (1, M)
+    active = months <= n
+
+    # 원리금균등: 매월 같은 금액 납부, k 개월 뒤 잔액 = P(1+r)^k - A((1+r)^k - 1)/r
+    growth = (1 + r) ** (months - 1)
+    safe_r = np.where(r > 0, r, 1)
+    payment = np.where(r > 0, principal * safe_r * (1 + safe_r) ** n / ((1 + safe_r) ** n - 1), principal / n)
+    balance_before = np.where(r > 0, principal * growth - payment * (growth - 1) / safe_r, principal - payment * (months - 1))
+    installment_interest = balance_before * r
+    installment_principal = payment - installment_interest
+
+    # 원금균등: 매월 원금 P/n + 남은 원금의 이자
+    principal_part = np.broadcast_to(principal / n, active.shape)
+    principal_interest = (principal - principal / n * (months - 1)) * r
+
+    # 만기일시: 매월 이자만, 마지막 달에 원금 전액
+    bullet_principal = np.where(months == n, principal, 0.0)
+    bullet_interest = np.broadcast_to(principal * r, active.shape)
+
+    is_installment = (methods == 'installment')[:, None]
+    is_principal = (methods == 'principal')[:, None]
+    repaid = np.where(is_installment, installment_principal, np.where(is_principal, principal_part, bullet_principal))
+    interest = np.where(is_installment, installment_interest, np.where(is_principal, principal_interest, bullet_interest))
+    return np.where(active, repaid, 0.0), np.where(active, interest, 0.0)
+
+
+def simulate(principal, terms, rate='avg', method=None, limit=20, with_schedule=False, table=None):
+    """모든 옵션 x 기간 x 상환방식의 총 이자를 계산해 총 비용이 낮은 순으로 limit 개를 반환합니다."""
+    table = table or get_option_table()
+    rows = []               # (옵션 index, 기간, 방식)
+    for idx, option in enumerate(table.options):
+        for m in methods_for(option[4]):
+            if method is None or m == method:
+                rows.extend((idx, term, m) for term in terms)
+    if not rows:
+        return []
+
+    option_idx = np.array([row[0] for row in rows])
+    row_terms = np.array([row[1] for row in rows])
+    row_methods = np.array([row[2] for row in rows])
+    annual_rates = table.rates[rate][option_idx]
+    repaid, interest = schedules(float(principal), annual_rates, row_terms, row_methods)
+
+    total_interest = interest.sum(axis=1)
+    order = np.lexsort((option_idx, total_interest))[:limit]
+    results = []
+    for k in order:
+        option = table.options[option_idx[k]]
+        item = {
+            'option_id': option[0],
+            'fin_prdt_cd': option[1],
+            'fin_prdt_nm': option[2],
+            'kor_co_nm': option[3],
+            'rpay_type_nm': option[4],
+            'lend_rate_type_nm': option[5],
+            'method': str(row_methods[k]),
+            'method_name': METHOD_NAMES[row_methods[k]],
+            'term': int(row_terms[k]),
+            'rate': float(annual_rates[k]),
+            'first_payment': int(round(repaid[k, 0] + interest[k, 0])),
+            'total_interest': int(round(total_interest[k])),
+            'total_payment': int(round(principal + total_interest[k])),
+        }
+        if with_schedule:
+            n = row_terms[k]
+            item['schedule'] = [
+                {'month': month, 'principal': p, 'interest': i}
+                for month, p, i in zip(
+                    range(1, n + 1),
+                    np.rint(repaid[k, :n]).astype(int).tolist(),
+                    np.rint(interest[k, :n]).astype(int).tolist(),
+                )
+            ]
+        results.append(item)
+    return results
@@ -0,0 +1,91 @@
+import statistics
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from fin_agent.filters import filter_deposit_products
+
+# 쓰기 부하용 임시 테이블 (실제 테이블에 가짜 행을 남기지 않도록 따로 만들고 끝나면 삭제)
+BENCH_TABLE = 'fin_agent_benchmark_scratch'
+
+
+class Command(BaseCommand):
+    help = (
+        '현재 DB 설정(DATABASE_URL, SQLITE_TUNING 등)으로 동시 읽기/쓰기 부하를 걸어 처리량과 지연시간을 측정합니다. '
+        '설정을 바꿔 여러 번 실행해 비교합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='읽기 스레드 수')
+        parser.add_argument('--writers', type=int, default=4, help='쓰기 스레드 수')
+        parser.add_argument('--seconds', type=float, default=10.0, help='측정 시간(초)')
+        parser.add_argument('--rows', type=int, default=50, help='쓰기 대상 행 수')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        table = connection.ops.quote_name(BENCH_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+            cursor.execute(f'CREATE TABLE {table} (id INTEGER PRIMARY KEY, view_count INTEGER NOT NULL)')
+            cursor.executemany(f'INSERT INTO {table} (id, view_count) VALUES (%s, 0)', [(i,) for i in range(rows)])
+        try:
+            results, errors, elapsed = self.run_load(options, table, rows)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"DB: {settings_dict['ENGINE']} {settings_dict.get('OPTIONS') or ''}")
+        for kind in ('read', 'write'):
+            timings = sorted(results[kind])
+            if not timings:
+                self.stdout.write(f'{kind:5}: 성공 0건, 오류 {errors[kind]}건')
+                continue
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f'{kind:5}: {len(timings) / elapsed:8.1f} ops/s  '
+                f'p50 {statistics.median(timings) * 1000:6.2f}ms  p95 {p95 * 1000:6.2f}ms  '
+                f'오류(locked 등) {errors[kind]}건'
+            )
+
+    def run_load(self, options, table, rows):
+        deadline = time.monotonic() + options['seconds']
+        results = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def read(n):
+            # 상품 목록 필터 조회 (옵션 조건 + 금리 정렬)
+            products, ordering = filter_deposit_products({'save_trm': '12', 'sort': 'intr_rate2'})
+            list(products.order_by(*ordering)[:20])
+
+        def write(n):
+            # 조회수 반영과 같은 형태의 짧은 쓰기 트랜잭션
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'UPDATE {table} SET view_count = view_count + 1 WHERE id = %s', [n % rows])
+
+        def worker(kind, operation):
+            n, timings, failed = 0, [], 0
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        operation(n)
+                        timings.append(time.perf_counter() - started)
+                    except OperationalError:
+                        failed += 1
+                    n += 1
+            finally:
+                connection.close()
+            with lock:
+                results[kind].extend(timings)
+                errors[kind] += failed
+
+        threads = [threading.Thread(target=worker, args=('read', read)) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=('write', write)) for _ in range(options['writers'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors, time.monotonic() - started
@@ -0,0 +1,37 @@
+import datetime
+import polars as pl
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from fin_agent.history import load_history
+
+SCHEMA = {
+    'kind': pl.Utf8,
+    'fin_prdt_cd': pl.Utf8,
+    'option_key': pl.Utf8,
+    'rate': pl.Float64,
+    'rate2': pl.Float64,
+    'rate_avg': pl.Float64,
+    'valid_from': pl.Datetime('us'),
+    'valid_to': pl.Datetime('us'),
+}
+
+
+class Command(BaseCommand):
+    help = '금리 변경 이력을 Parquet 파일로 내보냅니다. (기본: 최근 1년)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='저장할 파일 경로 (예: rate_history.parquet)')
+        parser.add_argument('--since', help='이 날짜 이후 적용된 구간만 (YYYY-MM-DD, 기본: 1년 전)')
+        parser.add_argument('--all', action='store_true', help='전체 기간')
+
+    def handle(self, *args, **options):
+        since = None
+        if not options['all']:
+            since = parse_date(options['since']) if options['since'] else datetime.date.today() - datetime.timedelta(days=365)
+            if since is None:
+                raise CommandError('--since 는 YYYY-MM-DD 형식이어야 합니다.')
+
+        # 한 번의 쿼리로 읽어 열 단위로 변환
+        frame = pl.DataFrame(load_history(since=since), schema=SCHEMA, orient='row')
+        frame.write_parquet(options['output'], compression='zstd')
+        self.stdout.write(self.style.SUCCESS(f"{frame.height}개 구간을 {options['output']} 에 저장했습니다."))
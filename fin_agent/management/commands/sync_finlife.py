@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand
+from fin_agent.jobs import execute
+from fin_agent.models import SyncJob
+
+KINDS = [kind for kind, _ in SyncJob.KIND_CHOICES]
+
+
+class Command(BaseCommand):
+    help = 'FinLife 예금/적금/전세자금대출 상품을 수집합니다. (--interval 지정 시 주기적으로 반복)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', choices=KINDS, help='수집할 종류 (기본: 전체)')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='반복 주기(초). 0 이면 한 번만 실행합니다.',
+        )
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or KINDS
+        interval = options['interval']
+
+        while True:
+            for kind in kinds:
+                job = execute(SyncJob.objects.create(kind=kind).pk)
+                if job.status == 'success':
+                    self.stdout.write(self.style.SUCCESS(
+                        f"[{kind}] 완료 ({job.duration:.2f}s) {job.result}"
+                    ))
+                else:
+                    self.stderr.write(f"[{kind}] 실패: {job.error}")
+            if interval <= 0:
+                break
+            time.sleep(interval)
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0004_userjoinedproduct_intr_rate_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='depositoptions',
+            unique_together={('product', 'save_trm', 'intr_rate_type_nm')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='jeonseloanoption',
+            unique_together={('product', 'rpay_type_nm', 'lend_rate_type_nm')},
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0005_alter_depositoptions_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositoptions',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='depositoptions',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanoption',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanoption',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0006_depositoptions_content_hash_depositoptions_is_active_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('deposit', '정기예금'), ('saving', '적금'), ('loan', '전세자금대출')], max_length=10)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('success', '완료'), ('failed', '실패')], db_index=True, default='queued', max_length=10)),
+                ('result', models.JSONField(blank=True, help_text='처리 건수 (inserted/updated/unchanged/deleted)', null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
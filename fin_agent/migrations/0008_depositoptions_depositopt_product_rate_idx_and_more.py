@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0007_syncjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['product', 'intr_rate2'], name='depositopt_product_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', 'intr_rate2'], name='depositopt_trm_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jeonseloanoption',
+            index=models.Index(fields=['product', 'lend_rate_min'], name='loanopt_product_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jeonseloanoption',
+            index=models.Index(fields=['lend_rate_min'], name='loanopt_rate_idx'),
+        ),
+    ]
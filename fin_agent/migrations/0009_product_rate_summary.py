@@ -0,0 +1,61 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:41
+
+from django.db import migrations, models
+
+
+# 기존 상품의 옵션 요약 컬럼 채우기 (이후에는 수집 시 재계산)
+def fill_rate_summary(apps, schema_editor):
+    DepositProduct = apps.get_model('fin_agent', 'DepositProduct')
+    JeonseLoanProduct = apps.get_model('fin_agent', 'JeonseLoanProduct')
+
+    deposits = list(DepositProduct.objects.prefetch_related('options'))
+    for product in deposits:
+        options = [o for o in product.options.all() if o.is_active]
+        best = max(options, key=lambda o: (o.intr_rate2 or 0, -o.save_trm), default=None)
+        product.max_intr_rate2 = best.intr_rate2 if best else None
+        product.best_save_trm = best.save_trm if best else None
+        product.option_count = len(options)
+    DepositProduct.objects.bulk_update(deposits, ['max_intr_rate2', 'best_save_trm', 'option_count'], batch_size=500)
+
+    loans = list(JeonseLoanProduct.objects.prefetch_related('options'))
+    for product in loans:
+        options = [o for o in product.options.all() if o.is_active]
+        product.min_lend_rate_min = min((o.lend_rate_min for o in options), default=None)
+        product.option_count = len(options)
+    JeonseLoanProduct.objects.bulk_update(loans, ['min_lend_rate_min', 'option_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0008_depositoptions_depositopt_product_rate_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_save_trm',
+            field=models.IntegerField(blank=True, help_text='최고 우대 금리를 주는 저축 기간', null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='max_intr_rate2',
+            field=models.FloatField(blank=True, db_index=True, help_text='옵션 중 최고 우대 금리', null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='option_count',
+            field=models.IntegerField(default=0, help_text='활성 옵션 수'),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='min_lend_rate_min',
+            field=models.FloatField(blank=True, db_index=True, help_text='옵션 중 최저 금리', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='option_count',
+            field=models.IntegerField(default=0, help_text='활성 옵션 수'),
+        ),
+        migrations.RunPython(fill_rate_summary, migrations.RunPython.noop),
+    ]
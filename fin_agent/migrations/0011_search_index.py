@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from fin_agent import search
+
+
+# 검색 색인 테이블 생성 후 기존 게시글/상품으로 채우기 (이후에는 signals / 수집 시 갱신)
+def create_search_index(apps, schema_editor):
+    search.rebuild(
+        apps.get_model('fin_agent', 'Article'),
+        apps.get_model('fin_agent', 'DepositProduct'),
+        apps.get_model('fin_agent', 'JeonseLoanProduct'),
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        search.get_backend(schema_editor.connection).drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0010_article_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
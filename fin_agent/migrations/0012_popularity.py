@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0011_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Popularity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('article', '게시글'), ('deposit', '예적금 상품')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('view_count', models.BigIntegerField(default=0)),
+                ('join_count', models.BigIntegerField(default=0)),
+                ('score', models.FloatField(default=0, help_text='조회수 + 가입수 x 가중치 (반영 시 증분 갱신)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', '-score', 'object_id'], name='popularity_score_idx'), models.Index(fields=['kind', '-join_count', 'object_id'], name='popularity_join_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:57
+
+from django.db import migrations, models
+
+from fin_agent.loan_parsing import parse_loan_text
+
+PARSED_FIELDS = (
+    'loan_lmt_amount', 'loan_lmt_ratio', 'erly_rpay_fee_rate', 'erly_rpay_fee_months',
+    'dly_rate_spread', 'dly_rate_max', 'parse_flags', 'search_tag',
+)
+
+
+# 기존 대출 상품의 텍스트 필드를 파싱해 숫자 컬럼 채우기 (이후에는 수집 시 계산)
+def fill_parsed_fields(apps, schema_editor):
+    JeonseLoanProduct = apps.get_model('fin_agent', 'JeonseLoanProduct')
+    products = list(JeonseLoanProduct.objects.all())
+    for product in products:
+        parsed = parse_loan_text(product.__dict__)
+        for field in PARSED_FIELDS:
+            setattr(product, field, parsed[field])
+    JeonseLoanProduct.objects.bulk_update(products, PARSED_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0012_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='dly_rate_max',
+            field=models.FloatField(blank=True, help_text='최고 연체이자율(%)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='dly_rate_spread',
+            field=models.FloatField(blank=True, help_text='연체 가산금리(%p)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='erly_rpay_fee_months',
+            field=models.IntegerField(blank=True, help_text='중도상환수수료 부과 기간(개월)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='erly_rpay_fee_rate',
+            field=models.FloatField(blank=True, db_index=True, help_text='중도상환수수료 최고 요율(%)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='loan_lmt_amount',
+            field=models.BigIntegerField(blank=True, db_index=True, help_text='최대 대출한도(원)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='loan_lmt_ratio',
+            field=models.FloatField(blank=True, help_text='보증금 대비 한도 비율(%)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jeonseloanproduct',
+            name='parse_flags',
+            field=models.JSONField(blank=True, default=dict, help_text='필드별 추출 신뢰도 (exact/partial/missing)'),
+        ),
+        migrations.RunPython(fill_parsed_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+from fin_agent.eligibility import parse_eligibility
+
+ELIGIBILITY_FIELDS = ('min_age', 'max_age', 'max_income', 'eligibility_flags', 'benefit_flags')
+
+
+# 기존 예적금 상품의 가입 자격 컬럼 채우기 (이후에는 수집 시 계산)
+def fill_eligibility(apps, schema_editor):
+    DepositProduct = apps.get_model('fin_agent', 'DepositProduct')
+    products = list(DepositProduct.objects.all())
+    for product in products:
+        for field, value in parse_eligibility(product.__dict__).items():
+            setattr(product, field, value)
+    DepositProduct.objects.bulk_update(products, ELIGIBILITY_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0013_loan_parsed_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositproduct',
+            name='benefit_flags',
+            field=models.IntegerField(default=0, help_text='우대조건 분류 비트마스크 (급여이체/카드/자동이체 등)'),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='eligibility_flags',
+            field=models.IntegerField(default=0, help_text='가입 대상 비트마스크 (청년/시니어/서민/비대면 전용 등)'),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='max_age',
+            field=models.IntegerField(blank=True, help_text='가입 가능 최대 나이', null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='max_income',
+            field=models.BigIntegerField(blank=True, help_text='가입 가능 연소득 상한(원)', null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='min_age',
+            field=models.IntegerField(blank=True, help_text='가입 가능 최소 나이', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['is_active', 'min_age', 'max_age'], name='deposit_eligible_age_idx'),
+        ),
+        migrations.RunPython(fill_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:00
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# 현재 활성 옵션의 금리를 첫 이력 구간으로 기록 (이후에는 수집 시 변경분만 추가)
+def fill_rate_history(apps, schema_editor):
+    RateHistory = apps.get_model('fin_agent', 'RateHistory')
+    DepositOptions = apps.get_model('fin_agent', 'DepositOptions')
+    JeonseLoanOption = apps.get_model('fin_agent', 'JeonseLoanOption')
+    now = timezone.now()
+    runs = [
+        RateHistory(kind='deposit', fin_prdt_cd=o.fin_prdt_cd, option_key=f'{o.save_trm}|{o.intr_rate_type_nm}',
+                    rate=o.intr_rate, rate2=o.intr_rate2, valid_from=now)
+        for o in DepositOptions.objects.filter(is_active=True)
+    ]
+    runs += [
+        RateHistory(kind='loan', fin_prdt_cd=o.fin_prdt_cd, option_key=f'{o.rpay_type_nm}|{o.lend_rate_type_nm}',
+                    rate=o.lend_rate_min, rate2=o.lend_rate_max, rate_avg=o.lend_rate_avg, valid_from=now)
+        for o in JeonseLoanOption.objects.filter(is_active=True)
+    ]
+    RateHistory.objects.bulk_create(runs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0014_deposit_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('deposit', '예적금'), ('loan', '전세자금대출')], max_length=10)),
+                ('fin_prdt_cd', models.TextField()),
+                ('option_key', models.CharField(help_text='옵션 구분 (예금: 기간|금리유형, 대출: 상환유형|금리유형)', max_length=100)),
+                ('rate', models.FloatField(help_text='기본금리 / 대출 최저금리', null=True)),
+                ('rate2', models.FloatField(help_text='최고 우대금리 / 대출 최고금리', null=True)),
+                ('rate_avg', models.FloatField(blank=True, help_text='대출 평균금리', null=True)),
+                ('valid_from', models.DateTimeField()),
+                ('valid_to', models.DateTimeField(blank=True, help_text='다음 변경(또는 판매 중단) 시각, 현재 적용 중이면 비어 있음', null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fin_prdt_cd', 'option_key', 'valid_from'], name='ratehistory_product_idx'), models.Index(fields=['kind', 'valid_to'], name='ratehistory_open_idx')],
+            },
+        ),
+        migrations.RunPython(fill_rate_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0015_rate_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('rate_change', '금리 변경')], max_length=20)),
+                ('fin_prdt_cd', models.TextField(blank=True)),
+                ('title', models.CharField(max_length=100)),
+                ('message', models.TextField()),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'is_read'], name='notification_unread_idx'), models.Index(fields=['user', '-created_at', '-id'], name='notification_inbox_idx')],
+            },
+        ),
+    ]
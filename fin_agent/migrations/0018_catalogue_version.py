@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+# 버전 행 생성 (이후에는 update 로 증가만)
+def create_version_row(apps, schema_editor):
+    CatalogueVersion = apps.get_model('fin_agent', 'CatalogueVersion')
+    CatalogueVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0017_refill_deposit_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogueVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from fin_agent.eligibility import parse_eligibility
+
+ELIGIBILITY_FIELDS = ('min_age', 'max_age', 'max_income', 'eligibility_flags', 'benefit_flags')
+
+
+# 'N세 미만' 상한(N-1)과 'N세 미만 가입 불가'(최소 나이 N) 파싱 수정 후 기존 상품의 자격 컬럼 다시 계산
+def refill_eligibility(apps, schema_editor):
+    DepositProduct = apps.get_model('fin_agent', 'DepositProduct')
+    products = list(DepositProduct.objects.all())
+    for product in products:
+        for field, value in parse_eligibility(product.__dict__).items():
+            setattr(product, field, value)
+    DepositProduct.objects.bulk_update(products, ELIGIBILITY_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0018_catalogue_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(refill_eligibility, migrations.RunPython.noop),
+    ]
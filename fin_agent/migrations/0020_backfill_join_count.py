@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count
+
+from fin_agent.counters import JOIN_WEIGHT
+
+
+# 가입수 집계 도입 전의 가입 내역을 예적금 상품 가입수/점수에 반영
+def backfill_join_count(apps, schema_editor):
+    Popularity = apps.get_model('fin_agent', 'Popularity')
+    UserJoinedProduct = apps.get_model('fin_agent', 'UserJoinedProduct')
+    join_counts = dict(
+        UserJoinedProduct.objects.values('product_id').annotate(joins=Count('id')).values_list('product_id', 'joins')
+    )
+    existing = {row.object_id: row for row in Popularity.objects.filter(kind='deposit')}
+    rows = []
+    for product_id, joins in join_counts.items():
+        row = existing.get(product_id) or Popularity(kind='deposit', object_id=product_id)
+        row.join_count = joins
+        row.score = row.view_count + joins * JOIN_WEIGHT
+        rows.append(row)
+    Popularity.objects.bulk_create([row for row in rows if row.pk is None], batch_size=500)
+    Popularity.objects.bulk_update([row for row in rows if row.pk is not None], ['join_count', 'score'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_agent', '0019_refill_deposit_age_limits'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_join_count, migrations.RunPython.noop),
+    ]
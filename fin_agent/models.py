@@ -26,6 +26,28 @@ class DepositProduct(models.Model):
     join_way = models.TextField()                # 가입방법
     spcl_cnd = models.TextField()                # 우대조건
 
+    # [추가] 옵션 요약 (수집 시 재계산되는 비정규화 컬럼)
+    max_intr_rate2 = models.FloatField(null=True, blank=True, db_index=True, help_text="옵션 중 최고 우대 금리")
+    best_save_trm = models.IntegerField(null=True, blank=True, help_text="최고 우대 금리를 주는 저축 기간")
+    option_count = models.IntegerField(default=0, help_text="활성 옵션 수")
+
+    # [추가] 가입 자격 (수집 시 eligibility 규칙으로 계산, 가입 가능 상품 조회용)
+    min_age = models.IntegerField(null=True, blank=True, help_text="가입 가능 최소 나이")
+    max_age = models.IntegerField(null=True, blank=True, help_text="가입 가능 최대 나이")
+    max_income = models.BigIntegerField(null=True, blank=True, help_text="가입 가능 연소득 상한(원)")
+    eligibility_flags = models.IntegerField(default=0, help_text="가입 대상 비트마스크 (청년/시니어/서민/비대면 전용 등)")
+    benefit_flags = models.IntegerField(default=0, help_text="우대조건 분류 비트마스크 (급여이체/카드/자동이체 등)")
+
+    # [추가] 증분 수집용 내용 지문 및 비활성(soft-retire) 여부
+    content_hash = models.CharField(max_length=40, default='', editable=False)
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # [추가] 가입 가능 상품 조회 (활성 + 나이 범위)
+            models.Index(fields=['is_active', 'min_age', 'max_age'], name='deposit_eligible_age_idx'),
+        ]
+
     def __str__(self):
         return f"[{self.get_product_type_display()}] {self.fin_prdt_nm}"
 
@@ -38,6 +60,19 @@ class DepositOptions(models.Model):
     intr_rate2 = models.FloatField(null=True)    # 최고 우대 금리
     save_trm = models.IntegerField()             # 저축 기간 (단위: 개월)
 
+    # [추가] 증분 수집용 내용 지문 및 비활성(soft-retire) 여부
+    content_hash = models.CharField(max_length=40, default='', editable=False)
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        # [추가] bulk upsert 충돌 기준 (상품 + 기간 + 금리유형)
+        unique_together = ('product', 'save_trm', 'intr_rate_type_nm')
+        # [추가] 기간/금리 필터 및 상품별 최고금리 정렬용 인덱스
+        indexes = [
+            models.Index(fields=['product', 'intr_rate2'], name='depositopt_product_rate_idx'),
+            models.Index(fields=['save_trm', 'intr_rate2'], name='depositopt_trm_rate_idx'),
+        ]
+
     def __str__(self):
         return f"{self.product.fin_prdt_nm} ({self.save_trm}개월)"
 
@@ -68,6 +103,23 @@ class JeonseLoanProduct(models.Model):
     # [보완] AI 분석용 태그 또는 핵심 정보 필드 (필요시 활용)
     search_tag = models.TextField(null=True, blank=True) 
 
+    # [추가] 자유 텍스트에서 추출한 숫자 컬럼 (수집 시 loan_parsing 으로 계산, 필터/정렬용)
+    loan_lmt_amount = models.BigIntegerField(null=True, blank=True, db_index=True, help_text="최대 대출한도(원)")
+    loan_lmt_ratio = models.FloatField(null=True, blank=True, help_text="보증금 대비 한도 비율(%)")
+    erly_rpay_fee_rate = models.FloatField(null=True, blank=True, db_index=True, help_text="중도상환수수료 최고 요율(%)")
+    erly_rpay_fee_months = models.IntegerField(null=True, blank=True, help_text="중도상환수수료 부과 기간(개월)")
+    dly_rate_spread = models.FloatField(null=True, blank=True, help_text="연체 가산금리(%p)")
+    dly_rate_max = models.FloatField(null=True, blank=True, help_text="최고 연체이자율(%)")
+    parse_flags = models.JSONField(default=dict, blank=True, help_text="필드별 추출 신뢰도 (exact/partial/missing)")
+
+    # [추가] 옵션 요약 (수집 시 재계산되는 비정규화 컬럼)
+    min_lend_rate_min = models.FloatField(null=True, blank=True, db_index=True, help_text="옵션 중 최저 금리")
+    option_count = models.IntegerField(default=0, help_text="활성 옵션 수")
+
+    # [추가] 증분 수집용 내용 지문 및 비활성(soft-retire) 여부
+    content_hash = models.CharField(max_length=40, default='', editable=False)
+    is_active = models.BooleanField(default=True, db_index=True)
+
     def __str__(self):
         return self.fin_prdt_nm
 
@@ -80,6 +132,19 @@ class JeonseLoanOption(models.Model):
     lend_rate_max = models.FloatField()
     lend_rate_avg = models.FloatField(null=True)
 
+    # [추가] 증분 수집용 내용 지문 및 비활성(soft-retire) 여부
+    content_hash = models.CharField(max_length=40, default='', editable=False)
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        # [추가] bulk upsert 충돌 기준 (상품 + 상환유형 + 금리유형)
+        unique_together = ('product', 'rpay_type_nm', 'lend_rate_type_nm')
+        # [추가] 금리 필터 및 상품별 최저금리 정렬용 인덱스
+        indexes = [
+            models.Index(fields=['product', 'lend_rate_min'], name='loanopt_product_rate_idx'),
+            models.Index(fields=['lend_rate_min'], name='loanopt_rate_idx'),
+        ]
+
     def __str__(self):
         return f"{self.product.fin_prdt_nm} 옵션"
 
@@ -91,6 +156,12 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # [추가] 게시글 목록 키셋 페이지네이션 (created_at, id 내림차순)
+            models.Index(fields=['-created_at', '-id'], name='article_created_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -114,4 +185,113 @@ class UserJoinedProduct(models.Model):
         unique_together = ('user', 'product') # 중복 가입 방지
 
     def __str__(self):
-        return f"{self.user.username} - {self.product.fin_prdt_nm}"
\ No newline at end of file
+        return f"{self.user.username} - {self.product.fin_prdt_nm}"
+
+# 7. FinLife 수집 작업 기록 (백그라운드 작업 상태 조회용)
+class SyncJob(models.Model):
+    KIND_CHOICES = [
+        ('deposit', '정기예금'),
+        ('saving', '적금'),
+        ('loan', '전세자금대출'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('success', '완료'),
+        ('failed', '실패'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', db_index=True)
+    result = models.JSONField(null=True, blank=True, help_text="처리 건수 (inserted/updated/unchanged/deleted)")
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def duration(self):
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
+
+    def __str__(self):
+        return f"[{self.get_kind_display()}] #{self.pk} {self.get_status_display()}"
+
+# 8. 조회수/가입수 집계 및 인기 순위 (요청마다 쓰지 않고 메모리에 모았다가 주기적으로 반영)
+class Popularity(models.Model):
+    KIND_CHOICES = [
+        ('article', '게시글'),
+        ('deposit', '예적금 상품'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    view_count = models.BigIntegerField(default=0)
+    join_count = models.BigIntegerField(default=0)
+    score = models.FloatField(default=0, help_text="조회수 + 가입수 x 가중치 (반영 시 증분 갱신)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+        indexes = [
+            models.Index(fields=['kind', '-score', 'object_id'], name='popularity_score_idx'),
+            models.Index(fields=['kind', '-join_count', 'object_id'], name='popularity_join_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} ({self.score})"
+
+# 9. 금리 변경 이력 (값이 바뀔 때만 한 행을 추가하고, 적용 구간을 valid_from ~ valid_to 로 저장)
+class RateHistory(models.Model):
+    KIND_CHOICES = [
+        ('deposit', '예적금'),
+        ('loan', '전세자금대출'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    fin_prdt_cd = models.TextField()
+    option_key = models.CharField(max_length=100, help_text="옵션 구분 (예금: 기간|금리유형, 대출: 상환유형|금리유형)")
+    rate = models.FloatField(null=True, help_text="기본금리 / 대출 최저금리")
+    rate2 = models.FloatField(null=True, help_text="최고 우대금리 / 대출 최고금리")
+    rate_avg = models.FloatField(null=True, blank=True, help_text="대출 평균금리")
+    valid_from = models.DateTimeField()
+    valid_to = models.DateTimeField(null=True, blank=True, help_text="다음 변경(또는 판매 중단) 시각, 현재 적용 중이면 비어 있음")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fin_prdt_cd', 'option_key', 'valid_from'], name='ratehistory_product_idx'),
+            models.Index(fields=['kind', 'valid_to'], name='ratehistory_open_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fin_prdt_cd} {self.option_key} {self.rate}/{self.rate2} ({self.valid_from:%Y-%m-%d}~)"
+
+# 10. 사용자 알림함 (가입 상품 금리 변경 등)
+class Notification(models.Model):
+    KIND_CHOICES = [
+        ('rate_change', '금리 변경'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    fin_prdt_cd = models.TextField(blank=True)
+    title = models.CharField(max_length=100)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'is_read'], name='notification_unread_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.title}"
+
+# 11. 상품 카탈로그 버전 (행 1개, 수집 트랜잭션 안에서 올림)
+# 웹 서버/수집 프로세스가 같은 값을 보므로 프로세스별 캐시도 버전이 바뀌면 함께 무효화됩니다.
+class CatalogueVersion(models.Model):
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"catalogue v{self.version}"
@@ -0,0 +1,78 @@
+# 가입 상품 금리 변경 알림 (수집 시 실행)
+# - 수집에서 금리가 바뀐 (fin_prdt_cd, save_trm) 쌍을 모아 가입 내역(UserJoinedProduct)과 한 번의 쿼리로 조인합니다.
+# - 가입자가 수천 명이어도 조회 1번 + bulk_create 로 알림함에 씁니다. (사용자별 쿼리 없음)
+# - 수집 트랜잭션 안에서 실행되므로 수집이 롤백되면 알림도 남지 않습니다.
+from collections import defaultdict
+from .models import Notification, UserJoinedProduct
+
+BATCH_SIZE = 500
+
+
+def _type_code(intr_rate_type_nm):
+    # 옵션 금리유형명 → UserJoinedProduct.intr_rate_type (S:단리, M:복리)
+    return 'M' if '복리' in intr_rate_type_nm else 'S'
+
+
+def rate_change_pairs(changes):
+    """record_rate_changes 결과(예적금) → {(fin_prdt_cd, save_trm): {S/M: (이전 금리, 새 금리)}}"""
+    pairs = defaultdict(dict)
+    for code, key, previous, rates in changes:
+        save_trm, type_nm = key.split('|', 1)
+        pairs[(code, int(save_trm))][_type_code(type_nm)] = (previous, rates)
+    return pairs
+
+
+def _percent(value):
+    return '-' if value is None else f'{value:g}%'
+
+
+def build_message(fin_prdt_nm, save_trm, previous, rates):
+    parts = []
+    if previous[0] != rates[0]:
+        parts.append(f'기본 금리 {_percent(previous[0])} → {_percent(rates[0])}')
+    if previous[1] != rates[1]:
+        parts.append(f'최고 우대금리 {_percent(previous[1])} → {_percent(rates[1])}')
+    return f"가입하신 '{fin_prdt_nm}' {save_trm}개월 상품의 {', '.join(parts)}(으)로 변경되었습니다."
+
+
+def notify_rate_changes(changes):
+    """금리가 바뀐 옵션의 가입자 알림함에 알림을 추가하고, 추가한 알림 수를 반환합니다."""
+    pairs = rate_change_pairs(changes)
+    if not pairs:
+        return 0
+
+    # 상품 코드 IN + 기간 IN 으로 한 번에 읽고, 정확한 (상품, 기간) 쌍은 메모리에서 확인
+    holders = UserJoinedProduct.objects.filter(
+        product__fin_prdt_cd__in={code for code, _ in pairs},
+        save_trm__in={save_trm for _, save_trm in pairs},
+    ).values_list('id', 'user_id', 'product__fin_prdt_cd', 'product__fin_prdt_nm', 'save_trm', 'intr_rate_type')
+
+    created = 0
+    batch = []
+    for joined_id, user_id, code, fin_prdt_nm, save_trm, intr_rate_type in holders.iterator(chunk_size=2000):
+        by_type = pairs.get((code, save_trm))
+        if not by_type:
+            continue
+        # 가입한 금리유형의 옵션이 바뀌었으면 그 값, 아니면 같은 기간의 다른 유형 변경을 안내
+        previous, rates = by_type.get(intr_rate_type) or next(iter(by_type.values()))
+        batch.append(Notification(
+            user_id=user_id,
+            kind='rate_change',
+            fin_prdt_cd=code,
+            title=f'{fin_prdt_nm} 금리 변경',
+            message=build_message(fin_prdt_nm, save_trm, previous, rates),
+            data={
+                'joined_id': joined_id,
+                'save_trm': save_trm,
+                'old_rate': previous[0], 'new_rate': rates[0],
+                'old_rate2': previous[1], 'new_rate2': rates[1],
+            },
+        ))
+        if len(batch) >= BATCH_SIZE:
+            Notification.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch)
+        created += len(batch)
+    return created
@@ -0,0 +1,106 @@
+# 키셋(커서) 페이지네이션
+# - OFFSET 대신 마지막 행의 정렬 키 값(예: 금리, id)을 커서로 넘겨 "그 다음" 행부터 조회합니다.
+# - 정렬 키 마지막에는 항상 고유한 필드(id)를 두어 동률에서도 순서가 고정되도록 합니다.
+import base64
+import datetime
+import json
+import math
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder 는 datetime 을 밀리초까지만 남기므로, 커서에는 마이크로초까지 그대로 넣어야 행이 건너뛰어지지 않음
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValidationError({'cursor': '잘못된 커서입니다.'})
+
+
+MAX_INTEGER = 2 ** 63 - 1
+
+
+def _output_field(queryset, name):
+    # annotate 한 정렬 키(best_rate 등)는 표현식의 output_field, 나머지는 모델 필드
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+
+class KeysetPagination(BasePagination):
+    page_size = 20
+    max_page_size = 100
+
+    def __init__(self, ordering):
+        # ordering 예: ('-best_rate', 'id')  ('-' 는 내림차순)
+        self.ordering = tuple(ordering)
+        self.next_cursor = None
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.page_size))
+        except ValueError:
+            raise ValidationError({'limit': '숫자여야 합니다.'})
+        return max(1, min(limit, self.max_page_size))
+
+    def _after(self, values):
+        """정렬 순서상 values 보다 뒤에 오는 행을 고르는 조건 (사전식 비교)."""
+        fields = [(f.lstrip('-'), f.startswith('-')) for f in self.ordering]
+        condition = Q()
+        for i, (name, desc) in enumerate(fields):
+            equal = {fields[j][0]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{f"{name}__{'lt' if desc else 'gt'}": values[i]})
+        return condition
+
+    def _cursor_values(self, queryset, values):
+        """커서 값을 정렬 키 필드 타입으로 변환합니다. 형식이 맞지 않으면 400."""
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({'cursor': '잘못된 커서입니다.'})
+        converted = []
+        for name, value in zip(self.ordering, values):
+            try:
+                if value is None or isinstance(value, (list, dict)):
+                    raise ValueError(value)
+                value = _output_field(queryset, name.lstrip('-')).to_python(value)
+                if isinstance(value, float) and not math.isfinite(value):
+                    raise ValueError(value)
+                if isinstance(value, int) and abs(value) > MAX_INTEGER:
+                    raise ValueError(value)
+            except (TypeError, ValueError, DjangoValidationError):
+                raise ValidationError({'cursor': '잘못된 커서입니다.'})
+            converted.append(value)
+        return converted
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        token = request.query_params.get('cursor')
+        if token:
+            values = self._cursor_values(queryset, decode_cursor(token))
+            queryset = queryset.filter(self._after(values))
+
+        rows = list(queryset.order_by(*self.ordering)[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            self.next_cursor = encode_cursor([getattr(last, f.lstrip('-')) for f in self.ordering])
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({'next_cursor': self.next_cursor, 'results': data})
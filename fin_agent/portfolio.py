@@ -0,0 +1,111 @@
+# 마이페이지 포트폴리오 요약 (총 원금, 가중 평균 금리, 다가오는 만기, 은행/유형별 비중)
+# - 가입 상품 행을 파이썬으로 가져오지 않고 DB 집계(Sum/Avg/Case)로 계산합니다.
+# - 결과는 사용자별로 캐시하고, 가입/수정/해지 시 invalidate_portfolio() 로 지웁니다.
+import datetime
+from django.core.cache import cache
+from django.db.models import Avg, Case, Count, DateField, F, FloatField, Func, Sum, When
+from django.db.models.functions import Coalesce, NullIf
+from .models import UserJoinedProduct
+
+UPCOMING_DAYS = 90          # 이 기간(일) 안에 만기가 돌아오는 상품을 따로 보여줌
+PORTFOLIO_CACHE_TTL = 60 * 60 * 24
+
+
+class AddMonths(Func):
+    """날짜 + 개월 수 (만기일 = joined_at + save_trm 개월, 해당 일이 없으면 그 달 말일)."""
+    output_field = DateField()
+
+    def _compile(self, compiler):
+        date_sql, date_params = compiler.compile(self.source_expressions[0])
+        months_sql, months_params = compiler.compile(self.source_expressions[1])
+        return date_sql, months_sql, (*date_params, *months_params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # date(.., '+N months') 는 1/31 + 1개월 → 3/3 처럼 넘치므로, 대상 월의 말일로 맞춤 (projection.maturity_dates 와 동일)
+        date_sql, months_sql, params = self._compile(compiler)
+        shifted = f"date({date_sql}, '+' || {months_sql} || ' months')"
+        month_end = f"date({date_sql}, 'start of month', '+' || ({months_sql} + 1) || ' months', '-1 day')"
+        return f"min({shifted}, {month_end})", (*params, *params)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        date_sql, months_sql, params = self._compile(compiler)
+        return f"({date_sql} + make_interval(months => {months_sql}))::date", params
+
+
+def _weighted_rate():
+    # 금액 가중 평균 금리 = sum(금액 x 금리) / sum(금액)
+    return Sum(F('amount') * F('intr_rate'), output_field=FloatField()) / NullIf(Sum('amount'), 0)
+
+
+def _breakdown(joined, field):
+    rows = (
+        joined.values(field)
+        .annotate(count=Count('id'), principal=Coalesce(Sum('amount'), 0), rate=_weighted_rate())
+        .order_by('-principal', field)
+    )
+    return [
+        {'name': row[field], 'count': row['count'], 'principal': row['principal'], 'weighted_rate': _round(row['rate'])}
+        for row in rows
+    ]
+
+
+def _round(value):
+    return round(value, 4) if value is not None else None
+
+
+def build_portfolio(user_id, today=None):
+    today = today or datetime.date.today()
+    joined = UserJoinedProduct.objects.filter(user_id=user_id)
+
+    totals = joined.aggregate(
+        count=Count('id'),
+        total_principal=Coalesce(Sum('amount'), 0),
+        monthly_payment=Coalesce(Sum(Case(When(product__product_type='saving', then='monthly_payment'), default=0)), 0),
+        weighted_rate=_weighted_rate(),
+        average_rate=Avg('intr_rate'),
+    )
+    upcoming = (
+        joined.annotate(maturity_date=AddMonths('joined_at', 'save_trm'))
+        .filter(maturity_date__gte=today, maturity_date__lte=today + datetime.timedelta(days=UPCOMING_DAYS))
+        .order_by('maturity_date', 'id')
+        .values('id', 'product__fin_prdt_cd', 'product__fin_prdt_nm', 'product__kor_co_nm', 'amount', 'maturity_date')
+    )
+    return {
+        'count': totals['count'],
+        'total_principal': totals['total_principal'],
+        'monthly_payment': totals['monthly_payment'],
+        'weighted_rate': _round(totals['weighted_rate']),
+        'average_rate': _round(totals['average_rate']),
+        'upcoming_maturities': [
+            {
+                'id': row['id'],
+                'fin_prdt_cd': row['product__fin_prdt_cd'],
+                'fin_prdt_nm': row['product__fin_prdt_nm'],
+                'kor_co_nm': row['product__kor_co_nm'],
+                'amount': row['amount'],
+                'maturity_date': row['maturity_date'],
+                'days_left': (row['maturity_date'] - today).days,
+            }
+            for row in upcoming
+        ],
+        'by_bank': _breakdown(joined, 'product__kor_co_nm'),
+        'by_type': _breakdown(joined, 'product__product_type'),
+    }
+
+
+def _cache_key(user_id):
+    return f'fin_agent:portfolio:{user_id}'
+
+
+def get_portfolio(user_id):
+    """캐시된 요약을 반환합니다. 날짜가 바뀌면(남은 일수/만기 목록) 다시 계산합니다."""
+    today = datetime.date.today()
+    entry = cache.get(_cache_key(user_id))
+    if entry is None or entry[0] != today:
+        entry = (today, build_portfolio(user_id, today))
+        cache.set(_cache_key(user_id), entry, PORTFOLIO_CACHE_TTL)
+    return entry[1]
+
+
+def invalidate_portfolio(user_id):
+    cache.delete(_cache_key(user_id))
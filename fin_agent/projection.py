@@ -0,0 +1,104 @@
+# 가입 상품 만기/이자 예상 계산 엔진
+# - 사용자의 가입 상품 전체를 (상품 x 개월) 배열로 만들어 NumPy 로 한 번에 계산합니다.
+# - 예금: 가입금액(amount)을 한 번에 예치 / 적금: 매월 초 월 납입액(monthly_payment)을 적립
+# - 단리(S): 원금 x 월이율 x 경과월 / 복리(M): 월 복리
+import numpy as np
+
+INTEREST_TAX_RATE = 0.154   # 이자소득세 14% + 지방소득세 1.4%
+MAX_TERM = 600              # 50년, (상품 x 개월) 배열 크기 상한
+
+PROJECTION_FIELDS = (
+    'id', 'user_id', 'product__fin_prdt_cd', 'product__fin_prdt_nm', 'product__kor_co_nm',
+    'product__product_type', 'amount', 'monthly_payment', 'save_trm', 'intr_rate', 'intr_rate_type', 'joined_at',
+)
+
+
+def maturity_dates(joined_at, save_trm):
+    """가입일 + 가입기간(개월). 말일 가입 등으로 해당 일이 없으면 그 달 말일로 맞춥니다."""
+    start = np.array(joined_at, dtype='datetime64[D]')
+    start_month = start.astype('datetime64[M]')
+    day = (start - start_month.astype('datetime64[D]')).astype(int)
+    end_month = start_month + save_trm.astype(int)
+    days_in_month = ((end_month + 1).astype('datetime64[D]') - end_month.astype('datetime64[D]')).astype(int)
+    return end_month.astype('datetime64[D]') + np.minimum(day, days_in_month - 1)
+
+
+def project(rows, with_schedule=True):
+    """rows 는 PROJECTION_FIELDS 로 조회한 dict 목록. 상품별 예상 결과를 같은 순서로 반환합니다."""
+    if not rows:
+        return []
+    # 기간 상한 전에 저장된 값이 있어도 배열이 폭증하거나 넘치지 않도록 0~MAX_TERM 으로 자름
+    terms = np.array([min(max(int(r['save_trm'] or 0), 0), MAX_TERM) for r in rows])
+    rate = np.array([float(r['intr_rate'] or 0) for r in rows]) / 100 / 12
+    compound = np.array([r['intr_rate_type'] == 'M' for r in rows])
+    saving = np.array([r['product__product_type'] == 'saving' for r in rows])
+    amount = np.array([float(r['amount'] or 0) for r in rows])
+    monthly = np.array([float(r['monthly_payment'] or 0) for r in rows])
+    # 적금인데 월 납입액이 비어 있으면 총 납입액을 기간으로 나눠 사용
+    monthly = np.where(saving & (monthly <= 0) & (terms > 0), amount / np.maximum(terms, 1), monthly)
+
+    months = np.arange(1, max(terms.max(), 1) + 1)[None, :]          # (1, T)
+    i = rate[:, None]                                               # (P, 1)
+    growth = (1 + i) ** months                                      # (P, T)
+
+    # 예금: 원금 고정, 경과 개월만큼 이자 발생
+    deposit_principal = np.broadcast_to(amount[:, None], growth.shape)
+    deposit_balance = np.where(compound[:, None], amount[:, None] * growth, amount[:, None] * (1 + i * months))
+
+    # 적금: k 번째 납입분은 (m - k + 1)개월 이자 발생
+    saving_principal = monthly[:, None] * months
+    safe_i = np.where(i > 0, i, 1)
+    compound_sum = np.where(i > 0, (1 + i) * (growth - 1) / safe_i, months)
+    saving_balance = np.where(
+        compound[:, None],
+        monthly[:, None] * compound_sum,
+        saving_principal + monthly[:, None] * i * months * (months + 1) / 2,
+    )
+
+    principal = np.where(saving[:, None], saving_principal, deposit_principal)
+    balance = np.where(saving[:, None], saving_balance, deposit_balance)
+
+    last = np.maximum(terms - 1, 0)
+    idx = np.arange(len(rows))
+    final_principal = np.where(terms > 0, principal[idx, last], np.where(saving, 0, amount))
+    final_balance = np.where(terms > 0, balance[idx, last], final_principal)
+    gross = final_balance - final_principal
+    tax = np.floor(gross * INTEREST_TAX_RATE)
+    maturity = maturity_dates([r['joined_at'] for r in rows], terms)
+
+    results = []
+    for k, row in enumerate(rows):
+        item = {
+            'id': row['id'],
+            'fin_prdt_cd': row['product__fin_prdt_cd'],
+            'fin_prdt_nm': row['product__fin_prdt_nm'],
+            'kor_co_nm': row['product__kor_co_nm'],
+            'product_type': row['product__product_type'],
+            'intr_rate': float(row['intr_rate'] or 0),
+            'intr_rate_type': row['intr_rate_type'],
+            'save_trm': int(terms[k]),
+            'maturity_date': str(maturity[k]),
+            'principal': int(round(final_principal[k])),
+            'gross_interest': int(round(gross[k])),
+            'tax': int(tax[k]),
+            'net_interest': int(round(gross[k] - tax[k])),
+            'maturity_amount': int(round(final_balance[k] - tax[k])),
+        }
+        if with_schedule:
+            n = terms[k]
+            item['schedule'] = [
+                {'month': m, 'principal': p, 'balance': b}
+                for m, p, b in zip(
+                    range(1, n + 1),
+                    np.rint(principal[k, :n]).astype(int).tolist(),
+                    np.rint(balance[k, :n]).astype(int).tolist(),
+                )
+            ]
+        results.append(item)
+    return results
+
+
+def summarize(results):
+    """여러 상품 예상 결과의 합계."""
+    keys = ('principal', 'gross_interest', 'tax', 'net_interest', 'maturity_amount')
+    return {key: sum(r[key] for r in results) for key in keys}
@@ -0,0 +1,142 @@
+# 예금/적금 규칙 기반 사전 순위 엔진
+# - 활성 옵션을 (상품 x 저축기간) 금리 행렬로 메모리에 올려두고 NumPy 로 한 번에 점수를 계산합니다.
+# - AI 추천에는 상위 N개 후보만 넘기고, offline 모드에서는 이 순위만으로 바로 응답합니다.
+import numpy as np
+from .cache import get_catalogue_version
+from .models import DepositProduct, DepositOptions
+
+TYPE_BONUS = 0.2          # 사용자 상황에 맞는 상품 유형(예금/적금) 가산점 (%p)
+TERM_PENALTY = 0.1        # 선호 기간에서 2배 멀어질 때마다 곱해지는 감점 비율
+
+
+class RateMatrix:
+    def __init__(self, products, terms, rates):
+        self.products = products      # [(fin_prdt_cd, fin_prdt_nm, kor_co_nm, product_type), ...]
+        self.terms = terms            # (T,) 저축 기간(개월)
+        self.rates = rates            # (P, T) 최고 우대금리, 옵션 없는 칸은 NaN
+        self.types = np.array([p[3] for p in products])
+
+
+def build_rate_matrix():
+    products = list(
+        DepositProduct.objects.filter(is_active=True, option_count__gt=0)
+        .order_by('id').values_list('id', 'fin_prdt_cd', 'fin_prdt_nm', 'kor_co_nm', 'product_type')
+    )
+    options = np.array(
+        list(DepositOptions.objects.filter(is_active=True, product__is_active=True)
+             .values_list('product_id', 'save_trm', 'intr_rate2')),
+        dtype=float,
+    ).reshape(-1, 3)
+
+    product_ids = np.array([p[0] for p in products], dtype=float)
+    terms = np.unique(options[:, 1]) if len(options) else np.array([12.0])
+    rates = np.full((len(products), len(terms)), np.nan)
+    if len(options) and len(products):
+        rows = np.searchsorted(product_ids, options[:, 0])
+        valid = (rows < len(product_ids)) & (product_ids[np.minimum(rows, len(product_ids) - 1)] == options[:, 0])
+        cols = np.searchsorted(terms, options[:, 1])
+        # 같은 기간에 단리/복리 옵션이 모두 있으면 높은 금리를 사용
+        np.fmax.at(rates, (rows[valid], cols[valid]), np.nan_to_num(options[valid, 2]))
+    return RateMatrix([p[1:] for p in products], terms, rates)
+
+
+_matrix_cache = {}
+
+
+def get_rate_matrix():
+    """카탈로그 버전이 바뀔 때만 행렬을 다시 만듭니다."""
+    version = get_catalogue_version()
+    matrix = _matrix_cache.get(version)
+    if matrix is None:
+        matrix = build_rate_matrix()
+        _matrix_cache.clear()
+        _matrix_cache[version] = matrix
+    return matrix
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def preferred_term(age):
+    # 사회초년생은 목돈 마련용 장기, 은퇴 연령대는 유동성 위주 단기, 그 외 1년
+    if age is not None and age < 35:
+        return 24
+    if age is not None and age >= 60:
+        return 6
+    return 12
+
+
+def preferred_type(salary, money, purpose):
+    if '적금' in purpose:
+        return 'saving'
+    if '예금' in purpose or '목돈' in purpose:
+        return 'deposit'
+    if salary is None or money is None:
+        return None
+    # 보유 자산이 월 소득 6개월치 이상이면 예치형(예금), 아니면 적립형(적금)
+    return 'deposit' if money >= salary / 12 * 6 else 'saving'
+
+
+def rank_products(user_info, limit=20, matrix=None):
+    """사용자 프로필(age/salary/money/purpose)로 상품 점수를 매겨 상위 limit 개를 반환합니다."""
+    matrix = matrix or get_rate_matrix()
+    if not matrix.products:
+        return []
+    age = _number(user_info.get('age'))
+    salary = _number(user_info.get('salary'))
+    money = _number(user_info.get('money'))
+    purpose = str(user_info.get('purpose') or '')
+
+    weights = 1.0 - TERM_PENALTY * np.abs(np.log2(matrix.terms / preferred_term(age)))
+    # 옵션이 없는 칸(NaN)은 -inf 로 두어 최댓값 계산에서 제외
+    weighted = np.where(np.isnan(matrix.rates), -np.inf, matrix.rates * weights)
+    best_col = weighted.argmax(axis=1)
+    scores = weighted.max(axis=1)
+    has_rate = np.isfinite(scores)
+
+    wanted = preferred_type(salary, money, purpose)
+    if wanted:
+        scores = scores + np.where(matrix.types == wanted, TYPE_BONUS, 0.0)
+
+    order = np.argsort(-scores, kind='stable')[:limit]
+    ranked = []
+    for idx in order:
+        if not has_rate[idx]:
+            break
+        fin_prdt_cd, fin_prdt_nm, kor_co_nm, product_type = matrix.products[idx]
+        ranked.append({
+            'fin_prdt_cd': fin_prdt_cd,
+            'fin_prdt_nm': fin_prdt_nm,
+            'kor_co_nm': kor_co_nm,
+            'product_type': product_type,
+            'max_rate': float(matrix.rates[idx, best_col[idx]]),
+            'save_trm': int(matrix.terms[best_col[idx]]),
+            'score': round(float(scores[idx]), 4),
+        })
+    return ranked
+
+
+def offline_recommendation(user_info, ranked):
+    """LLM 호출 없이 순위 결과만으로 추천 응답(analysis/products)을 만듭니다."""
+    type_names = dict(DepositProduct.PRODUCT_TYPE_CHOICES)
+    return {
+        'analysis': {
+            'purpose': str(user_info.get('purpose') or '') or '금리 중심 규칙 기반 추천',
+            'keywords': '규칙 기반, 금리 우선',
+        },
+        'products': [
+            {
+                'fin_prdt_cd': p['fin_prdt_cd'],
+                'fin_prdt_nm': p['fin_prdt_nm'],
+                'kor_co_nm': p['kor_co_nm'],
+                'max_rate': p['max_rate'],
+                'save_trm': p['save_trm'],
+                'comment': f"{type_names.get(p['product_type'], '')} {p['save_trm']}개월 최고 {p['max_rate']}%",
+            }
+            for p in ranked
+        ],
+    }
@@ -0,0 +1,424 @@
+# AI 상품 추천 공용 로직 (프롬프트 생성 / GMS 호출 / 응답 파싱)
+# - 프롬프트는 압축된 표 형식으로 만들고 토큰 예산(RECOMMEND_PROMPT_TOKEN_BUDGET)을 넘지 않게 자릅니다.
+# - 동기 DRF 뷰(recommend_product)와 비동기 SSE 뷰(recommend_product_stream)가 함께 사용합니다.
+# - 비동기 호출은 이벤트 루프별로 재사용되는 httpx.AsyncClient(연결 풀)로 처리합니다.
+import asyncio
+import json
+import logging
+import re
+import threading
+import weakref
+from functools import lru_cache
+from typing import List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch
+import httpx
+import requests
+from pydantic import BaseModel, field_validator
+from .models import DepositProduct, DepositOptions
+from .ranking import rank_products, offline_recommendation
+
+logger = logging.getLogger(__name__)
+
+
+# 1. 프롬프트 생성
+# - 상품은 "코드|유형|은행|상품명|금리옵션|우대조건요약" 한 줄로 압축합니다.
+# - 사전 순위 순서대로 행을 넣다가 토큰 예산을 넘으면 나머지 후보는 제외합니다.
+PROMPT_HEADER = """
+    당신은 꼼꼼한 금융 전문가입니다. 아래 사용자의 정보와 요청사항을 분석하여 제공된 [상품 목록] 중에서 가장 적합한 상품 **3개**를 추천해주세요.
+
+    [사용자 프로필]
+    - 나이: {age}세
+    - 연봉: {salary}원
+    - 현재 자산: {money}원
+    - 사용자 요청(목적): "{purpose}"
+
+    [상품 목록] (금리 높은 순, 형식: 코드|유형|은행|상품명|기간(개월):최고우대금리(%)|우대조건 요약)
+"""
+
+PROMPT_FOOTER = """
+    [분석 가이드]
+    1. 사용자의 요청(목적)을 자연어 처리하여 의도를 파악하세요.
+    2. 연봉과 자산 규모를 고려하여 가입 가능한 상품인지 판단하세요.
+    3. 금리가 높은 상품을 우선하되, 우대 조건 달성 가능성도 고려하세요.
+    4. 위험 감수 성향 분석은 하지 마세요. 오직 목적 적합성과 금리 효율성만 따집니다.
+
+    [응답 형식]
+    반드시 아래와 같은 **JSON 형식**으로만 응답하세요.
+    {
+      "analysis": {
+        "purpose": "사용자 요청을 분석하여 파악한 구체적인 재무 목적",
+        "keywords": "분석된 핵심 키워드"
+      },
+      "products": [
+        {
+          "fin_prdt_cd": "상품코드",
+          "fin_prdt_nm": "상품명",
+          "kor_co_nm": "은행명",
+          "max_rate": "대표 최고 우대 금리(숫자만)",
+          "save_trm": "추천 가입 기간(개월수 숫자만)",
+          "comment": "추천 이유"
+        }
+      ]
+    }
+"""
+
+TYPE_CODES = {'deposit': '예금', 'saving': '적금'}
+
+
+def estimate_tokens(text):
+    """토크나이저 없이 쓰는 보수적 추정치 (한글 등 비ASCII 1자 = 1토큰, ASCII 4자 = 1토큰)."""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+@lru_cache(maxsize=4096)
+def summarize_condition(text, limit=60):
+    """우대조건 원문에서 번호/기호/공백을 정리하고 limit 자로 줄입니다. (같은 원문은 한 번만 계산)"""
+    if not text:
+        return '없음'
+    summary = re.sub(r'[\s*※•▶\-]+', ' ', re.sub(r'\(?\d+\)|[①-⑳]', ' ', text)).strip()
+    return summary if len(summary) <= limit else summary[:limit - 1] + '…'
+
+
+def product_line(product):
+    options = sorted(
+        {o.save_trm: o.intr_rate2 for o in sorted(product.options.all(), key=lambda o: o.intr_rate2 or 0)}.items()
+    )
+    options_text = ','.join(f"{trm}:{rate:g}" for trm, rate in options if rate is not None)
+    return '|'.join([
+        product.fin_prdt_cd,
+        TYPE_CODES.get(product.product_type, product.product_type),
+        product.kor_co_nm,
+        product.fin_prdt_nm,
+        options_text,
+        summarize_condition(product.spcl_cnd, settings.RECOMMEND_CONDITION_CHARS),
+    ])
+
+
+class PromptMetrics:
+    """추천 1건당 프롬프트 크기(문자/추정 토큰)와 예산 때문에 제외된 후보 수를 누적합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.truncated = 0
+
+    def record(self, stats):
+        with self._lock:
+            self.count += 1
+            self.total_tokens += stats['tokens']
+            self.max_tokens = max(self.max_tokens, stats['tokens'])
+            self.truncated += stats['candidates'] - stats['included']
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'avg_tokens': round(self.total_tokens / self.count, 1) if self.count else 0,
+                'max_tokens': self.max_tokens,
+                'truncated_candidates': self.truncated,
+                'budget': settings.RECOMMEND_PROMPT_TOKEN_BUDGET,
+            }
+
+
+prompt_metrics = PromptMetrics()
+
+
+def build_prompt(user_info, candidates):
+    rank = {c['fin_prdt_cd']: i for i, c in enumerate(candidates)}
+    products = sorted(
+        DepositProduct.objects.filter(fin_prdt_cd__in=rank).prefetch_related(
+            Prefetch('options', queryset=DepositOptions.objects.filter(is_active=True))
+        ),
+        key=lambda p: rank[p.fin_prdt_cd],
+    )
+
+    header = PROMPT_HEADER.format(
+        age=user_info.get('age'), salary=user_info.get('salary'),
+        money=user_info.get('money'), purpose=user_info.get('purpose'),
+    )
+    budget = settings.RECOMMEND_PROMPT_TOKEN_BUDGET - estimate_tokens(header) - estimate_tokens(PROMPT_FOOTER)
+    lines = []
+    for product in products:
+        line = product_line(product)
+        cost = estimate_tokens(line) + 1
+        if lines and cost > budget:
+            break
+        lines.append(line)
+        budget -= cost
+
+    prompt = header + '\n'.join(lines) + '\n' + PROMPT_FOOTER
+    stats = {
+        'candidates': len(products),
+        'included': len(lines),
+        'chars': len(prompt),
+        'tokens': estimate_tokens(prompt),
+    }
+    prompt_metrics.record(stats)
+    logger.info("추천 프롬프트: 후보 %(included)s/%(candidates)s개, %(chars)s자, 약 %(tokens)s토큰", stats)
+    return prompt
+
+
+def prepare_prompt(user_info):
+    """사전 순위 상위 후보로 프롬프트를 만듭니다."""
+    candidates = rank_products(user_info, limit=settings.RECOMMEND_CANDIDATE_LIMIT)
+    return build_prompt(user_info, candidates)
+
+
+# 2. 응답 파싱 / 검증
+class JSONObjectScanner:
+    """텍스트 조각을 순서대로 받아 최상위 {...} 객체가 닫힐 때마다 그 원문을 돌려줍니다.
+    문자열 안의 중괄호와 이스케이프를 구분하므로 설명문이나 코드블록이 섞여 있어도 동작합니다."""
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        found = []
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    self._buffer = [ch]
+                continue
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    found.append(''.join(self._buffer))
+        return found
+
+
+def pick_result(objects):
+    """완성된 JSON 객체 후보 중 products 키가 있는 첫 객체(없으면 첫 dict)를 반환합니다."""
+    parsed = []
+    for raw in objects:
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            if 'products' in value:
+                return value
+            parsed.append(value)
+    if parsed:
+        return parsed[0]
+    raise ValueError("JSON 형식을 찾을 수 없습니다.")
+
+
+def extract_result(ai_text):
+    return pick_result(JSONObjectScanner().feed(ai_text))
+
+
+def _number_text(value):
+    # "3.5%", "12개월" 같은 값에서 숫자만 남김
+    if isinstance(value, str):
+        match = re.search(r'-?\d+(?:\.\d+)?', value)
+        return match.group(0) if match else None
+    return value
+
+
+class RecommendationAnalysis(BaseModel):
+    purpose: str = ''
+    keywords: str = ''
+
+    @field_validator('keywords', mode='before')
+    @classmethod
+    def join_keywords(cls, value):
+        return ', '.join(map(str, value)) if isinstance(value, list) else value
+
+
+class RecommendedProduct(BaseModel):
+    fin_prdt_cd: str
+    fin_prdt_nm: str = ''
+    kor_co_nm: str = ''
+    max_rate: Optional[float] = None
+    save_trm: Optional[int] = None
+    comment: str = ''
+
+    @field_validator('max_rate', 'save_trm', mode='before')
+    @classmethod
+    def strip_units(cls, value):
+        return _number_text(value)
+
+
+class RecommendationResult(BaseModel):
+    analysis: RecommendationAnalysis = RecommendationAnalysis()
+    products: List[RecommendedProduct]
+
+
+def validate_result(data):
+    """스키마 검증 후 DB 에 실제로 있는 상품만 남기고 이름/은행/금리를 DB 값으로 채웁니다."""
+    result = RecommendationResult.model_validate(data)
+    codes = [item.fin_prdt_cd for item in result.products]
+    products = DepositProduct.objects.filter(fin_prdt_cd__in=codes, is_active=True).prefetch_related(
+        Prefetch('options', queryset=DepositOptions.objects.filter(is_active=True).order_by('intr_rate2'))
+    ).in_bulk(codes, field_name='fin_prdt_cd')
+
+    enriched = []
+    for item in result.products:
+        product = products.pop(item.fin_prdt_cd, None)
+        if product is None:
+            continue
+        # 기간별 최고 금리 옵션 (정렬 순서상 뒤의 값이 더 높은 금리)
+        options = {option.save_trm: option for option in product.options.all()}
+        option = options.get(item.save_trm) or options.get(product.best_save_trm)
+        enriched.append({
+            'fin_prdt_cd': product.fin_prdt_cd,
+            'fin_prdt_nm': product.fin_prdt_nm,
+            'kor_co_nm': product.kor_co_nm,
+            'max_rate': option.intr_rate2 if option else product.max_intr_rate2,
+            'intr_rate': option.intr_rate if option else None,
+            'save_trm': option.save_trm if option else item.save_trm,
+            'comment': item.comment,
+        })
+    if not enriched:
+        raise ValueError("추천 결과에 유효한 상품코드가 없습니다.")
+    return {'analysis': result.analysis.model_dump(), 'products': enriched}
+
+
+REPAIR_PROMPT = """아래 텍스트를 지정된 JSON 형식으로만 고쳐서 출력하세요. 설명은 쓰지 마세요.
+형식: {{"analysis": {{"purpose": "...", "keywords": "..."}}, "products": [{{"fin_prdt_cd": "...", "fin_prdt_nm": "...", "kor_co_nm": "...", "max_rate": 0.0, "save_trm": 12, "comment": "..."}}]}}
+오류: {error}
+텍스트:
+{text}"""
+
+
+def repair_prompt(ai_text, error):
+    # 상품 목록 없이 원문만 넘기는 짧은 프롬프트 (재시도 비용 최소화)
+    return REPAIR_PROMPT.format(error=str(error)[:200], text=ai_text[:4000])
+
+
+def fallback_result(user_info):
+    """LLM 응답을 끝내 사용할 수 없을 때 DB 금리 기준 상위 3개를 돌려줍니다."""
+    result = offline_recommendation(user_info, rank_products(user_info, limit=3))
+    result['fallback'] = True
+    return result
+
+
+def validation_steps(ai_text, objects=None):
+    """응답 검증 -> 수정 요청 루프 (동기/비동기 공용).
+
+    수정 요청이 필요하면 프롬프트를 yield 하고, send() 로 받은 새 응답을 다시 검증합니다.
+    검증에 성공하면 결과를 반환(StopIteration.value)하고, 최대 RECOMMEND_REPAIR_RETRIES 번 뒤에도 실패하면 예외.
+    objects 는 스트리밍 중 이미 찾은 JSON 객체 원문 목록입니다.
+    """
+    for attempt in range(settings.RECOMMEND_REPAIR_RETRIES + 1):
+        try:
+            return validate_result(pick_result(objects) if objects is not None else extract_result(ai_text))
+        except ValueError as e:
+            logger.warning("AI 추천 응답 검증 실패 (%s회): %s", attempt + 1, e)
+            if attempt == settings.RECOMMEND_REPAIR_RETRIES:
+                raise
+            ai_text = yield repair_prompt(ai_text, e)
+            objects = None
+
+
+def _advance(steps, reply=None):
+    # (다음 수정 요청 프롬프트, None) 또는 검증이 끝났으면 (None, 결과)
+    try:
+        return steps.send(reply), None
+    except StopIteration as done:
+        return None, done.value
+
+
+def run_validation(steps, generate_fn):
+    prompt, result = _advance(steps)
+    while prompt is not None:
+        prompt, result = _advance(steps, generate_fn(prompt))
+    return result
+
+
+async def arun_validation(steps):
+    # validate_result 가 DB 를 조회하므로 검증 단계는 sync_to_async 로 실행
+    prompt, result = await sync_to_async(_advance)(steps)
+    while prompt is not None:
+        prompt, result = await sync_to_async(_advance)(steps, await agenerate(prompt))
+    return result
+
+
+def recommend(user_info, candidates):
+    """LLM 추천 -> 검증 실패 시 수정 요청. 그래도 실패하면 예외."""
+    return run_validation(validation_steps(generate(build_prompt(user_info, candidates))), generate)
+
+
+def _request_body(prompt):
+    return {"contents": [{"parts": [{"text": prompt}]}]}
+
+
+def _chunk_text(payload):
+    parts = payload['candidates'][0]['content']['parts']
+    return ''.join(part.get('text', '') for part in parts)
+
+
+# 3. 동기 호출 (DRF 뷰용)
+def generate(prompt):
+    final_url = f"{settings.SSAFY_GMS_URL}?key={settings.SSAFY_GMS_API_KEY}"
+    response = requests.post(
+        final_url, json=_request_body(prompt), verify=False,
+        timeout=(settings.GMS_CONNECT_TIMEOUT, settings.GMS_READ_TIMEOUT),
+    )
+    return _chunk_text(response.json())
+
+
+# 4. 비동기 스트리밍 호출 (ASGI 뷰용)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """이벤트 루프마다 하나의 AsyncClient 를 만들어 연결을 재사용합니다."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.GMS_READ_TIMEOUT, connect=settings.GMS_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+            verify=False,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def agenerate(prompt):
+    """스트리밍이 필요 없는 짧은 호출(응답 수정 요청 등)용 비동기 호출."""
+    client = get_async_client()
+    response = await client.post(
+        settings.SSAFY_GMS_URL, params={'key': settings.SSAFY_GMS_API_KEY}, json=_request_body(prompt),
+    )
+    response.raise_for_status()
+    return _chunk_text(response.json())
+
+
+async def stream_generate(prompt):
+    """GMS 의 SSE 스트림(streamGenerateContent?alt=sse)에서 텍스트 조각을 순서대로 내보냅니다."""
+    client = get_async_client()
+    params = {'key': settings.SSAFY_GMS_API_KEY, 'alt': 'sse'}
+    async with client.stream('POST', settings.SSAFY_GMS_STREAM_URL, params=params, json=_request_body(prompt)) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if not data or data == '[DONE]':
+                continue
+            text = _chunk_text(json.loads(data))
+            if text:
+                yield text
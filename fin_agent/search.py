@@ -0,0 +1,215 @@
+# 게시글 / 예적금 / 전세자금대출 통합 전문 검색
+# - SQLite 는 FTS5 가상 테이블, PostgreSQL 은 tsvector + GIN 인덱스를 사용합니다. (DB 종류로 자동 선택)
+# - 한국어는 띄어쓰기 단위로는 부분 일치가 안 되므로 글자 2-gram 으로 쪼갠 문자열을 색인/질의합니다.
+#   예) '청년우대적금' → '청년 년우 우대 대적 적금'
+# - 게시글은 signals, 상품은 수집(ingestion) 커밋 후에 색인을 갱신합니다.
+import re
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+from .models import DepositProduct
+from .pagination import encode_cursor, decode_cursor
+
+SEARCH_TABLE = 'fin_agent_search'
+WORD_RE = re.compile(r'\w+')
+
+# 문서 rowid = 객체 pk * 4 + 출처 번호 (출처별 pk 가 겹치지 않도록)
+SOURCES = {'article': 1, 'deposit_product': 2, 'loan_product': 3}
+KINDS = ('article', 'deposit', 'saving', 'loan')
+
+
+def ngrams(text):
+    tokens = []
+    for word in WORD_RE.findall((text or '').lower()):
+        if len(word) <= 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def doc_id(source, pk):
+    return pk * 4 + SOURCES[source]
+
+
+# 색인 문서: (rowid, kind, ref, title, subtitle, 제목 n-gram, 본문 n-gram)
+def article_document(article):
+    return (
+        doc_id('article', article.pk), 'article', str(article.pk), article.title, article.user.username,
+        ' '.join(ngrams(article.title)), ' '.join(ngrams(article.content)),
+    )
+
+
+def deposit_document(product):
+    body = ' '.join((product.kor_co_nm, product.spcl_cnd, product.join_member, product.join_way, product.etc_note or ''))
+    return (
+        doc_id('deposit_product', product.pk), product.product_type, product.fin_prdt_cd, product.fin_prdt_nm,
+        product.kor_co_nm, ' '.join(ngrams(product.fin_prdt_nm)), ' '.join(ngrams(body)),
+    )
+
+
+def loan_document(product):
+    body = ' '.join((
+        product.kor_co_nm, product.join_way, product.loan_inci_expn, product.erly_rpay_fee,
+        product.dly_rate, product.loan_lmt, product.search_tag or '',
+    ))
+    return (
+        doc_id('loan_product', product.pk), 'loan', product.fin_prdt_cd, product.fin_prdt_nm,
+        product.kor_co_nm, ' '.join(ngrams(product.fin_prdt_nm)), ' '.join(ngrams(body)),
+    )
+
+
+class SQLiteFTSBackend:
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "kind UNINDEXED, ref UNINDEXED, title UNINDEXED, subtitle UNINDEXED, "
+            "title_terms, body_terms, tokenize='unicode61')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def delete(self, cursor, ids):
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(i,) for i in ids])
+
+    def insert(self, cursor, documents):
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, kind, ref, title, subtitle, title_terms, body_terms) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            documents,
+        )
+
+    def match(self, tokens):
+        # 토큰 전부 포함(AND), 한 글자 검색어는 접두어 일치
+        return ' '.join(f'"{t}"*' if len(t) == 1 else f'"{t}"' for t in tokens)
+
+    def search(self, cursor, tokens, kinds, after, limit):
+        # bm25 는 낮을수록 관련도가 높음 (제목 가중치 3배)
+        sql = (
+            f'SELECT * FROM (SELECT rowid AS doc_id, kind, ref, title, subtitle, '
+            f'bm25({SEARCH_TABLE}, 0, 0, 0, 0, 3.0, 1.0) AS score '
+            f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s) WHERE 1 = 1'
+        )
+        params = [self.match(tokens)]
+        if kinds:
+            sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+            params += kinds
+        if after:
+            sql += ' AND (score > %s OR (score = %s AND doc_id > %s))'
+            params += [after[0], after[0], after[1]]
+        cursor.execute(sql + ' ORDER BY score, doc_id LIMIT %s', params + [limit])
+        return cursor.fetchall()
+
+
+class PostgresSearchBackend:
+    def create(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+            'id bigint PRIMARY KEY, kind varchar(10) NOT NULL, ref text NOT NULL, '
+            'title text NOT NULL, subtitle text NOT NULL, document tsvector NOT NULL)'
+        )
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx ON {SEARCH_TABLE} USING GIN (document)')
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def delete(self, cursor, ids):
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE id = ANY(%s)', [list(ids)])
+
+    def insert(self, cursor, documents):
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (id, kind, ref, title, subtitle, document) VALUES (%s, %s, %s, %s, %s, '
+            "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))",
+            documents,
+        )
+
+    def match(self, tokens):
+        return ' & '.join(f'{t}:*' if len(t) == 1 else t for t in tokens)
+
+    def search(self, cursor, tokens, kinds, after, limit):
+        # ts_rank 는 높을수록 관련도가 높으므로 부호를 바꿔 SQLite 와 같은 오름차순 커서를 사용
+        sql = (
+            f"SELECT * FROM (SELECT id, kind, ref, title, subtitle, -ts_rank(document, to_tsquery('simple', %s)) AS score "
+            f"FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', %s)) AS hits WHERE 1 = 1"
+        )
+        params = [self.match(tokens)] * 2
+        if kinds:
+            sql += ' AND kind = ANY(%s)'
+            params.append(list(kinds))
+        if after:
+            sql += ' AND (score > %s OR (score = %s AND id > %s))'
+            params += [after[0], after[0], after[1]]
+        cursor.execute(sql + ' ORDER BY score, id LIMIT %s', params + [limit])
+        return cursor.fetchall()
+
+
+def get_backend(conn=None):
+    vendor = (conn or connection).vendor
+    if vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    raise NotImplementedError(f'{vendor} 는 검색 색인을 지원하지 않습니다.')
+
+
+def replace_documents(remove_ids, documents):
+    """remove_ids 문서를 지우고 documents 를 다시 넣습니다. (수정 = 삭제 후 삽입)"""
+    backend = get_backend()
+    with connection.cursor() as cursor:
+        ids = set(remove_ids) | {doc[0] for doc in documents}
+        if ids:
+            backend.delete(cursor, ids)
+        if documents:
+            backend.insert(cursor, documents)
+
+
+def index_articles(articles):
+    replace_documents([], [article_document(a) for a in articles])
+
+
+def remove_articles(pks):
+    replace_documents([doc_id('article', pk) for pk in pks], [])
+
+
+def index_products(model, pks):
+    """상품 pk 목록을 현재 DB 상태로 다시 색인합니다. 비활성/삭제된 상품은 색인에서 뺍니다."""
+    source, build = (
+        ('deposit_product', deposit_document) if model is DepositProduct else ('loan_product', loan_document)
+    )
+    active = model.objects.filter(pk__in=pks, is_active=True)
+    replace_documents([doc_id(source, pk) for pk in pks], [build(p) for p in active])
+
+
+def rebuild(article_model, deposit_model, loan_model):
+    """색인 전체를 다시 만듭니다. (마이그레이션에서 과거 모델로도 호출하므로 모델을 인자로 받음)"""
+    backend = get_backend()
+    with connection.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+        backend.insert(cursor, [article_document(a) for a in article_model.objects.select_related('user')])
+        backend.insert(cursor, [deposit_document(p) for p in deposit_model.objects.filter(is_active=True)])
+        backend.insert(cursor, [loan_document(p) for p in loan_model.objects.filter(is_active=True)])
+
+
+def search(query, kinds=(), cursor_token=None, limit=20):
+    """관련도순 검색 결과와 다음 페이지 커서를 반환합니다."""
+    tokens = list(dict.fromkeys(ngrams(query)))
+    if not tokens:
+        return [], None
+    after = decode_cursor(cursor_token) if cursor_token else None
+    if after is not None and not (
+        isinstance(after, list) and len(after) == 2 and all(isinstance(v, (int, float)) for v in after)
+    ):
+        raise ValidationError({'cursor': '잘못된 커서입니다.'})
+    with connection.cursor() as cursor:
+        rows = get_backend().search(cursor, tokens, list(kinds), after, limit + 1)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][5], rows[-1][0]])
+    results = [
+        {'kind': kind, 'ref': ref, 'title': title, 'subtitle': subtitle, 'score': round(-score, 6)}
+        for _, kind, ref, title, subtitle, score in rows
+    ]
+    return results, next_cursor
@@ -1,14 +1,19 @@
 from rest_framework import serializers
-from .models import DepositProduct, DepositOptions, UserJoinedProduct, JeonseLoanProduct, JeonseLoanOption, Article
+from .models import DepositProduct, DepositOptions, UserJoinedProduct, JeonseLoanProduct, JeonseLoanOption, Article, SyncJob, Notification
 from django.contrib.auth import get_user_model
+from .eligibility import flag_names, benefit_names
+from .projection import MAX_TERM
 
 User = get_user_model()
 
+# [추가] 수집 내부용 컬럼 (내용 지문, 비활성 여부)은 응답에서 제외
+INTERNAL_FIELDS = ('content_hash', 'is_active')
+
 # 1. 예금/적금 옵션 시리얼라이저
 class DepositOptionsSerializer(serializers.ModelSerializer):
     class Meta:
         model = DepositOptions
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
         read_only_fields = ('product',)
 
 # 2. 예금/적금 상품 시리얼라이저
@@ -17,7 +22,7 @@ class DepositProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DepositProduct
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
 
 # 3. 유저-상품 중개 모델 시리얼라이저 (핵심 수정)
 class UserJoinedProductSerializer(serializers.ModelSerializer):
@@ -31,6 +36,33 @@ class UserJoinedProductSerializer(serializers.ModelSerializer):
             'id', 'product', 'amount', 'monthly_payment', 
             'joined_at', 'save_trm', 'intr_rate', 'intr_rate_type'
         )
+        # 만기 예상 계산(projection)의 기간 상한과 같게 제한
+        extra_kwargs = {'save_trm': {'min_value': 1, 'max_value': MAX_TERM}}
+
+# [추가] 옵션 목록 없이 상품 기본 정보만 내려주는 가벼운 버전 (마이페이지 목록용)
+class DepositProductBriefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DepositProduct
+        fields = ('id', 'fin_prdt_cd', 'fin_prdt_nm', 'kor_co_nm', 'product_type', 'max_intr_rate2', 'best_save_trm')
+
+class UserJoinedProductBriefSerializer(UserJoinedProductSerializer):
+    product = DepositProductBriefSerializer(read_only=True)
+
+# [추가] 가입 가능 상품 목록용 (자격 조건을 이름 목록으로 풀어서 제공)
+class EligibleProductSerializer(DepositProductBriefSerializer):
+    eligibility = serializers.SerializerMethodField()
+    benefits = serializers.SerializerMethodField()
+
+    class Meta(DepositProductBriefSerializer.Meta):
+        fields = DepositProductBriefSerializer.Meta.fields + (
+            'join_member', 'min_age', 'max_age', 'max_income', 'eligibility', 'benefits',
+        )
+
+    def get_eligibility(self, obj):
+        return flag_names(obj.eligibility_flags)
+
+    def get_benefits(self, obj):
+        return benefit_names(obj.benefit_flags)
 
 # 4. 유저 시리얼라이저 (마이페이지용)
 class UserSerializer(serializers.ModelSerializer):
@@ -41,11 +73,21 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'username', 'email', 'joined_details', 'age', 'money', 'salary')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # [추가] context 의 fields(응답 필드 제한) / expand(옵션 목록 포함 여부)
+        fields = self.context.get('fields')
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if 'joined_details' in self.fields and 'options' not in self.context.get('expand', ('options',)):
+            self.fields['joined_details'] = UserJoinedProductBriefSerializer(many=True, read_only=True)
+
 # 5. 전세자금대출 관련 시리얼라이저
 class JeonseLoanOptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = JeonseLoanOption
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
         read_only_fields = ('product',)
 
 class JeonseLoanProductSerializer(serializers.ModelSerializer):
@@ -53,9 +95,11 @@ class JeonseLoanProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JeonseLoanProduct
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
 
 # 6. 커뮤니티 게시글 시리얼라이저
+ARTICLE_PREVIEW_CHARS = 100
+
 class ArticleSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
 
@@ -66,7 +110,27 @@ class ArticleSerializer(serializers.ModelSerializer):
 
 class ArticleListSerializer(serializers.ModelSerializer):
     user = serializers.CharField(source='user.username', read_only=True)
+    # [수정] 목록에서는 본문 전체 대신 앞부분 미리보기만 (queryset 에서 preview 를 annotate)
+    preview = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
-        fields = ('id', 'user', 'title', 'content', 'created_at')
\ No newline at end of file
+        fields = ('id', 'user', 'title', 'preview', 'created_at')
+
+    def get_preview(self, obj):
+        preview = obj.preview
+        return preview[:ARTICLE_PREVIEW_CHARS] + '…' if len(preview) > ARTICLE_PREVIEW_CHARS else preview
+
+# 7. 수집 작업 상태 시리얼라이저
+class SyncJobSerializer(serializers.ModelSerializer):
+    duration = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SyncJob
+        fields = ('id', 'kind', 'status', 'result', 'error', 'created_at', 'started_at', 'finished_at', 'duration')
+
+# 8. 알림함 시리얼라이저
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ('id', 'kind', 'fin_prdt_cd', 'title', 'message', 'data', 'is_read', 'created_at')
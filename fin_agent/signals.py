@@ -0,0 +1,19 @@
+# 게시글 검색 색인 / 인기 순위 동기화
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Article, Popularity
+from .search import index_articles, remove_articles
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, **kwargs):
+    transaction.on_commit(lambda: index_articles([instance]))
+
+
+@receiver(post_delete, sender=Article)
+def remove_deleted_article(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: remove_articles([pk]))
+    # 인기 순위에서도 제외
+    Popularity.objects.filter(kind='article', object_id=pk).delete()
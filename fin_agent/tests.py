@@ -1,3 +1,913 @@
-from django.test import TestCase
+import datetime
+import json
+import threading
+import warnings
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .cache import bump_catalogue_version
+from .counters import CounterBuffer, JOIN_WEIGHT, counters
+from .eligibility import parse_eligibility, BUSINESS, SENIOR_ONLY, YOUTH_ONLY
+from .finlife import fetch_product_lists, FinlifeAPIError, DEPOSIT_ENDPOINT
+from .ingestion import ingest_deposit_products, ingest_loan_products
+from .loan_parsing import parse_amounts, parse_loan_text
+from .loan_simulator import LoanOptionTable, simulate
+from .pagination import encode_cursor
+from .models import (
+    User, Article, DepositProduct, DepositOptions, UserJoinedProduct, JeonseLoanProduct, Popularity, Notification,
+    RateHistory,
+)
+from .notifications import notify_rate_changes, rate_change_pairs
+from .portfolio import build_portfolio
+from .projection import project, PROJECTION_FIELDS, MAX_TERM
+from .search import SEARCH_TABLE, index_products
+
+
+# FinLife API 를 흉내내는 로컬 스텁 서버 (권역/페이지별 고정 JSON 응답)
+class FinlifeStubHandler(BaseHTTPRequestHandler):
+    pages = {}
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        key = (query['topFinGrpNo'][0], int(query['pageNo'][0]))
+        result = self.pages.get(key, {'err_cd': '000', 'max_page_no': 1, 'baseList': [], 'optionList': []})
+        body = json.dumps({'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stub_page(codes, max_page_no):
+    return {
+        'err_cd': '000',
+        'max_page_no': str(max_page_no),
+        'baseList': [{'fin_prdt_cd': code} for code in codes],
+        'optionList': [{'fin_prdt_cd': code, 'save_trm': '12'} for code in codes],
+    }
+
+
+class FinlifeFetcherTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        FinlifeStubHandler.pages = {
+            ('020000', 1): stub_page(['A1', 'A2'], 3),
+            ('020000', 2): stub_page(['A3'], 3),
+            ('020000', 3): stub_page(['A4'], 3),
+            ('030300', 1): stub_page(['B1'], 1),
+        }
+        cls.server = start_stub_server(FinlifeStubHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_fetches_every_page_of_every_group(self):
+        with override_settings(FINLIFE_BASE_URL=self.base_url):
+            base_list, option_list = fetch_product_lists(DEPOSIT_ENDPOINT)
+
+        self.assertEqual([p['fin_prdt_cd'] for p in base_list], ['A1', 'A2', 'A3', 'A4', 'B1'])
+        self.assertEqual(len(option_list), 5)
+
+    def test_error_code_raises(self):
+        FinlifeStubHandler.pages[('050000', 1)] = {'err_cd': '010', 'err_msg': '인증키 오류'}
+        try:
+            with override_settings(FINLIFE_BASE_URL=self.base_url):
+                with self.assertRaises(FinlifeAPIError):
+                    fetch_product_lists(DEPOSIT_ENDPOINT)
+        finally:
+            del FinlifeStubHandler.pages[('050000', 1)]
+
+
+# GMS(streamGenerateContent?alt=sse)를 흉내내는 로컬 스텁 서버
+class FakeGMSHandler(BaseHTTPRequestHandler):
+    chunks = [
+        '추천 결과입니다.\n```json\n{"analysis": {"purpose": "목돈 마련", ',
+        '"keywords": ["예금"]}, "products": [{"fin_prdt_cd": "P1", "max_rate": "9.9%", "save_trm": "12개월"}]}\n```',
+    ]
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for text in self.chunks:
+            payload = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+            self.wfile.write(f"data: {json.dumps(payload)}\r\n\r\n".encode())
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class RecommendStreamTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = start_stub_server(FakeGMSHandler)
+        cls.gms_url = f'http://127.0.0.1:{cls.server.server_port}/models/test:streamGenerateContent'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        self.token = Token.objects.create(user=user)
+        product = DepositProduct.objects.create(
+            fin_prdt_cd='P1', kor_co_nm='테스트은행', fin_prdt_nm='테스트예금', etc_note='',
+            join_member='', join_way='', spcl_cnd='', max_intr_rate2=3.5, best_save_trm=12, option_count=1,
+        )
+        DepositOptions.objects.create(
+            product=product, fin_prdt_cd='P1', intr_rate_type_nm='단리', intr_rate=3.0, intr_rate2=3.5, save_trm=12,
+        )
+        bump_catalogue_version()
+
+    async def _events(self, **extra):
+        with override_settings(SSAFY_GMS_STREAM_URL=self.gms_url):
+            response = await self.async_client.post(
+                '/api/v1/products/recommend/stream/', {'age': 30, 'purpose': '목돈 마련'},
+                content_type='application/json', **extra,
+            )
+            if not response.streaming:
+                return response.status_code, []
+            body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        events = [block.split('\n', 1) for block in body.strip().split('\n\n')]
+        return response.status_code, [(head[len('event: '):], json.loads(data[len('data: '):])) for head, data in events]
+
+    async def test_streams_deltas_then_result(self):
+        status_code, events = await self._events(headers={'Authorization': f'Token {self.token.key}'})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual([name for name, _ in events], ['delta', 'delta', 'result'])
+        result = events[-1][1]
+        self.assertEqual(result['analysis'], {'purpose': '목돈 마련', 'keywords': '예금'})
+        # 모델이 준 금리가 아니라 DB 의 실제 금리로 보정
+        self.assertEqual(result['products'][0]['fin_prdt_nm'], '테스트예금')
+        self.assertEqual(result['products'][0]['max_rate'], 3.5)
+
+    @override_settings(RECOMMEND_REPAIR_RETRIES=0)
+    async def test_unknown_product_falls_back_to_db_shortlist(self):
+        await DepositProduct.objects.filter(fin_prdt_cd='P1').aupdate(fin_prdt_cd='P2')
+        await sync_to_async(bump_catalogue_version)()
+        _, events = await self._events(headers={'Authorization': f'Token {self.token.key}'})
+
+        result = events[-1][1]
+        self.assertTrue(result['fallback'])
+        self.assertEqual([p['fin_prdt_cd'] for p in result['products']], ['P2'])
+
+    async def test_requires_token(self):
+        status_code, _ = await self._events()
+        self.assertEqual(status_code, 401)
+
+
+# 마이페이지 조회 쿼리 수 회귀 테스트 (가입 상품 수와 무관하게 고정)
+class ProfileQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        self.client = APIClient()
+
+    def get_profile(self, queries, **params):
+        # 실제 요청처럼 매번 새 user 인스턴스로 인증 (이전 요청의 prefetch 캐시 재사용 방지)
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+        with self.assertNumQueries(queries):
+            return self.client.get('/api/v1/profile/', params)
+
+    def join(self, count):
+        start = DepositProduct.objects.count()
+        for n in range(start, start + count):
+            product = DepositProduct.objects.create(
+                fin_prdt_cd=f'P{n}', kor_co_nm='테스트은행', fin_prdt_nm=f'테스트예금{n}', etc_note='',
+                join_member='', join_way='', spcl_cnd='',
+            )
+            for save_trm in (6, 12, 24):
+                DepositOptions.objects.create(
+                    product=product, fin_prdt_cd=f'P{n}', intr_rate_type_nm='단리',
+                    intr_rate=3.0, intr_rate2=3.5, save_trm=save_trm,
+                )
+            UserJoinedProduct.objects.create(user=self.user, product=product, amount=1_000_000)
+
+    def test_query_count_does_not_grow_with_joined_products(self):
+        self.join(1)
+        self.get_profile(2)
+        self.join(5)
+        response = self.get_profile(2)
+        self.assertEqual(len(response.data['joined_details']), 6)
+        self.assertEqual(len(response.data['joined_details'][0]['product']['options']), 3)
+
+    def test_retired_options_are_hidden(self):
+        self.join(1)
+        DepositOptions.objects.filter(save_trm=24).update(is_active=False)
+        response = self.get_profile(2)
+        self.assertEqual(
+            [option['save_trm'] for option in response.data['joined_details'][0]['product']['options']], [6, 12],
+        )
+
+    def test_sparse_fields_and_expand(self):
+        self.join(3)
+        response = self.get_profile(1, expand='')
+        self.assertNotIn('options', response.data['joined_details'][0]['product'])
+
+        response = self.get_profile(0, fields='id,username,age')
+        self.assertEqual(set(response.data), {'id', 'username', 'age'})
+
+
+# 가입대상(join_member) 문구 파싱 (FinLife 실제 문구 기준)
+class EligibilityParsingTests(SimpleTestCase):
+    def parse(self, join_member, join_deny=1):
+        return parse_eligibility({'join_member': join_member, 'join_deny': join_deny, 'join_way': '', 'spcl_cnd': ''})
+
+    def test_individuals_with_business_are_open_to_everyone(self):
+        for join_member in ('실명의 개인 또는 개인사업자', '개인(개인사업자 포함)', '개인 및 법인', '제한없음'):
+            with self.subTest(join_member=join_member):
+                self.assertEqual(self.parse(join_member)['eligibility_flags'] & BUSINESS, 0)
+
+    def test_business_only(self):
+        for join_member in ('개인사업자', '법인 및 개인사업자'):
+            with self.subTest(join_member=join_member):
+                self.assertTrue(self.parse(join_member)['eligibility_flags'] & BUSINESS)
+
+    def test_guardian_consent_is_not_an_age_limit(self):
+        result = self.parse('실명의 개인 (단, 만 14세 미만은 법정대리인 동의 필요)')
+        self.assertEqual((result['min_age'], result['max_age']), (None, None))
+        result = self.parse('만 14세 이상 개인(만 14세 미만은 법정대리인 동의 필요)')
+        self.assertEqual((result['min_age'], result['max_age']), (14, None))
+
+    def test_age_ranges(self):
+        result = self.parse('만19세~만34세 청년')
+        self.assertEqual((result['min_age'], result['max_age']), (19, 34))
+        self.assertTrue(result['eligibility_flags'] & YOUTH_ONLY)
+        result = self.parse('만 65세 이상 개인')
+        self.assertEqual((result['min_age'], result['max_age']), (65, None))
+        self.assertTrue(result['eligibility_flags'] & SENIOR_ONLY)
+
+    def test_under_is_exclusive(self):
+        result = self.parse('만 19세 이상 만 35세 미만 개인')
+        self.assertEqual((result['min_age'], result['max_age']), (19, 34))
+        result = self.parse('만 19세 이상 만 34세 이하 개인')
+        self.assertEqual((result['min_age'], result['max_age']), (19, 34))
+        result = self.parse('만19세~35세 미만')
+        self.assertEqual((result['min_age'], result['max_age']), (19, 34))
+
+    def test_exclusion_is_a_minimum_age(self):
+        result = self.parse('실명의 개인 (14세 미만 가입 불가)')
+        self.assertEqual((result['min_age'], result['max_age']), (14, None))
+        result = self.parse('만 17세 이상 (만 14세 미만 제외)')
+        self.assertEqual(result['min_age'], 17)
+
+    def test_income_limit(self):
+        self.assertEqual(self.parse('연소득 5천만원 이하 근로자')['max_income'], 50_000_000)
+        # 서민전용(join_deny=2)인데 소득 기준이 없으면 기본 상한
+        self.assertIsNotNone(self.parse('서민', join_deny=2)['max_income'])
+
+
+# 포트폴리오(DB 계산)와 만기 예상(NumPy 계산)의 만기일이 월말 가입에서도 같아야 함
+class MaturityDateTests(TestCase):
+    def test_portfolio_matches_projection_at_month_end(self):
+        user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        cases = [
+            (datetime.date(2025, 1, 31), 1, datetime.date(2025, 2, 28)),
+            (datetime.date(2024, 1, 31), 1, datetime.date(2024, 2, 29)),
+            (datetime.date(2025, 3, 31), 1, datetime.date(2025, 4, 30)),
+            (datetime.date(2025, 1, 15), 1, datetime.date(2025, 2, 15)),
+        ]
+        for n, (joined_at, save_trm, expected) in enumerate(cases):
+            product = DepositProduct.objects.create(
+                fin_prdt_cd=f'P{n}', kor_co_nm='테스트은행', fin_prdt_nm=f'테스트예금{n}', etc_note='',
+                join_member='', join_way='', spcl_cnd='',
+            )
+            UserJoinedProduct.objects.create(
+                user=user, product=product, amount=1_000_000, save_trm=save_trm, joined_at=joined_at,
+            )
+            with self.subTest(joined_at=joined_at):
+                portfolio = build_portfolio(user.pk, today=joined_at)
+                upcoming = {row['fin_prdt_cd']: row['maturity_date'] for row in portfolio['upcoming_maturities']}
+                rows = list(UserJoinedProduct.objects.filter(product=product).values(*PROJECTION_FIELDS))
+                self.assertEqual(upcoming[f'P{n}'], expected)
+                self.assertEqual(project(rows, with_schedule=False)[0]['maturity_date'], str(expected))
+
+
+# 수집 bulk upsert: 처리 건수, 변경 없는 행 건너뛰기, 사라진 행 비활성화, 요약 컬럼
+def deposit_base(code, name='테스트예금'):
+    return {
+        'fin_prdt_cd': code, 'kor_co_nm': '테스트은행', 'fin_prdt_nm': name, 'etc_note': '', 'join_deny': '1',
+        'join_member': '실명의 개인', 'join_way': '인터넷,스마트폰', 'spcl_cnd': '없음',
+    }
+
+
+def deposit_option(code, save_trm, intr_rate, intr_rate2):
+    return {
+        'fin_prdt_cd': code, 'intr_rate_type_nm': '단리', 'save_trm': str(save_trm),
+        'intr_rate': intr_rate, 'intr_rate2': intr_rate2,
+    }
+
+
+class IngestionTests(TestCase):
+    def ingest(self, codes, options, name='테스트예금', product_type='deposit'):
+        return ingest_deposit_products([deposit_base(code, name) for code in codes], options, product_type)
+
+    def summary(self, code):
+        return DepositProduct.objects.filter(fin_prdt_cd=code).values(
+            'is_active', 'max_intr_rate2', 'best_save_trm', 'option_count',
+        ).get()
+
+    def test_reimport_counts_skip_and_soft_retire(self):
+        options = [
+            deposit_option('D1', 6, 3.0, 3.5),
+            deposit_option('D1', 12, 3.2, 4.0),
+            deposit_option('D2', 12, 2.5, 3.0),
+        ]
+        stats = self.ingest(['D1', 'D2'], options)
+        self.assertEqual(stats['products'], {'inserted': 2, 'updated': 0, 'unchanged': 0, 'deleted': 0})
+        self.assertEqual(stats['options'], {'inserted': 3, 'updated': 0, 'unchanged': 0, 'deleted': 0})
+        self.assertEqual(
+            self.summary('D1'), {'is_active': True, 'max_intr_rate2': 4.0, 'best_save_trm': 12, 'option_count': 2},
+        )
+
+        # 같은 데이터를 다시 받으면 쓰기 없이 건너뜀
+        stats = self.ingest(['D1', 'D2'], options)
+        self.assertEqual(stats['products'], {'inserted': 0, 'updated': 0, 'unchanged': 2, 'deleted': 0})
+        self.assertEqual(stats['options'], {'inserted': 0, 'updated': 0, 'unchanged': 3, 'deleted': 0})
+
+        # D2 와 D1 의 12개월 옵션이 원본에서 사라지고 D1 상품명이 바뀜
+        stats = self.ingest(['D1'], options[:1], name='이름 변경')
+        self.assertEqual(stats['products'], {'inserted': 0, 'updated': 1, 'unchanged': 0, 'deleted': 1})
+        self.assertEqual(stats['options'], {'inserted': 0, 'updated': 0, 'unchanged': 1, 'deleted': 2})
+        self.assertEqual(DepositProduct.objects.count(), 2)
+        self.assertFalse(self.summary('D2')['is_active'])
+        self.assertEqual(
+            list(DepositOptions.objects.filter(is_active=True).values_list('fin_prdt_cd', 'save_trm')), [('D1', 6)],
+        )
+        self.assertEqual(
+            self.summary('D1'), {'is_active': True, 'max_intr_rate2': 3.5, 'best_save_trm': 6, 'option_count': 1},
+        )
+        self.assertEqual(DepositProduct.objects.get(fin_prdt_cd='D1').fin_prdt_nm, '이름 변경')
+
+        # 다시 내려오면 같은 행을 재활성화
+        stats = self.ingest(['D1', 'D2'], options, name='이름 변경')
+        self.assertEqual(stats['products'], {'inserted': 0, 'updated': 1, 'unchanged': 1, 'deleted': 0})
+        self.assertEqual(stats['options'], {'inserted': 0, 'updated': 2, 'unchanged': 1, 'deleted': 0})
+        self.assertTrue(self.summary('D2')['is_active'])
+        self.assertEqual(self.summary('D1')['option_count'], 2)
+
+    def test_empty_response_and_other_product_type_do_not_retire(self):
+        self.ingest(['D1'], [deposit_option('D1', 12, 3.0, 3.5)])
+
+        stats = self.ingest([], [])
+        self.assertEqual(stats['products']['deleted'], 0)
+        # 적금 수집은 예금 상품을 비활성화하지 않음
+        stats = self.ingest(['S1'], [deposit_option('S1', 12, 3.0, 3.5)], product_type='saving')
+        self.assertEqual(stats['products'], {'inserted': 1, 'updated': 0, 'unchanged': 0, 'deleted': 0})
+        self.assertTrue(self.summary('D1')['is_active'])
+
+    def test_loan_summary(self):
+        base = [{'fin_prdt_cd': 'L1', 'kor_co_nm': '테스트은행', 'fin_prdt_nm': '전세대출', 'join_way': '영업점'}]
+        options = [
+            {'fin_prdt_cd': 'L1', 'rpay_type_nm': '만기일시상환', 'lend_rate_type_nm': '변동금리',
+             'lend_rate_min': '3.5', 'lend_rate_max': '5.0', 'lend_rate_avg': '4.1'},
+            {'fin_prdt_cd': 'L1', 'rpay_type_nm': '분할상환', 'lend_rate_type_nm': '고정금리',
+             'lend_rate_min': '3.1', 'lend_rate_max': '4.5', 'lend_rate_avg': None},
+        ]
+        stats = ingest_loan_products(base, options)
+        self.assertEqual(stats['options']['inserted'], 2)
+        product = JeonseLoanProduct.objects.get(fin_prdt_cd='L1')
+        self.assertEqual((product.min_lend_rate_min, product.option_count), (3.1, 2))
+
+        stats = ingest_loan_products(base, options[:1])
+        self.assertEqual(stats['options'], {'inserted': 0, 'updated': 0, 'unchanged': 1, 'deleted': 1})
+        product.refresh_from_db()
+        self.assertEqual((product.min_lend_rate_min, product.option_count), (3.5, 1))
+
+
+# 가입 기간(save_trm) 상한: 입력 검증 + 만기 예상 계산에서 잘라내기
+class SaveTermLimitTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        self.product = DepositProduct.objects.create(
+            fin_prdt_cd='P1', kor_co_nm='테스트은행', fin_prdt_nm='테스트예금', etc_note='',
+            join_member='', join_way='', spcl_cnd='',
+        )
+        self.joined = UserJoinedProduct.objects.create(user=self.user, product=self.product, amount=1_000_000, intr_rate=3.0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_rejects_out_of_range_terms(self):
+        for save_trm in (0, MAX_TERM + 1, 2_000_000_000):
+            with self.subTest(save_trm=save_trm):
+                response = self.client.put(f'/api/v1/products/joined/{self.joined.pk}/', {'save_trm': save_trm}, format='json')
+                self.assertEqual(response.status_code, 400)
+                response = self.client.post(
+                    '/api/v1/products/joined/bulk/', {'update': [{'id': self.joined.pk, 'save_trm': save_trm}]}, format='json',
+                )
+                self.assertEqual(response.data['update'][0]['status'], 'error')
+        response = self.client.put(f'/api/v1/products/joined/{self.joined.pk}/', {'save_trm': MAX_TERM}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_projection_clips_stored_terms(self):
+        # 상한 도입 전에 저장된 큰 값이 있어도 500 없이 MAX_TERM 으로 계산
+        UserJoinedProduct.objects.filter(pk=self.joined.pk).update(save_trm=2_000_000)
+        response = self.client.get('/api/v1/profile/projection/', {'schedule': '0'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['products'][0]['save_trm'], MAX_TERM)
+        rows = list(UserJoinedProduct.objects.values(*PROJECTION_FIELDS))
+        self.assertGreater(project(rows, with_schedule=False)[0]['gross_interest'], 0)
+
+
+# 상품 목록 필터/정렬 + 키셋 페이지네이션
+class FilterPaginationTests(TestCase):
+    def setUp(self):
+        # D0~D5: 12개월 최고 우대금리 3.0, 3.5, 3.5, 4.0, 2.0, 3.5 (동률은 id 순), D3 은 6개월 옵션만 5.0
+        rates = [3.0, 3.5, 3.5, 4.0, 2.0, 3.5]
+        options = [deposit_option(f'D{n}', 12, 2.0, rate) for n, rate in enumerate(rates)]
+        options.append(deposit_option('D3', 6, 2.0, 5.0))
+        ingest_deposit_products([deposit_base(f'D{n}') for n in range(len(rates))], options, 'deposit')
+        self.client = APIClient()
+
+    def pages(self, params):
+        codes, cursor = [], None
+        while True:
+            response = self.client.get('/api/v1/products/deposit/', dict(params, **({'cursor': cursor} if cursor else {})))
+            self.assertEqual(response.status_code, 200)
+            codes += [product['fin_prdt_cd'] for product in response.data['results']]
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                return codes
+
+    def test_sort_by_best_rate_across_pages(self):
+        self.assertEqual(self.pages({'sort': 'intr_rate2', 'limit': 2}), ['D3', 'D1', 'D2', 'D5', 'D0', 'D4'])
+        # 옵션 조건이 있으면 조건에 맞는 옵션의 금리로 정렬 (D3 의 12개월은 4.0)
+        self.assertEqual(
+            self.pages({'save_trm': 12, 'sort': 'intr_rate2', 'limit': 4}), ['D3', 'D1', 'D2', 'D5', 'D0', 'D4'],
+        )
+        self.assertEqual(self.pages({'save_trm': 6, 'sort': 'intr_rate2'}), ['D3'])
+        self.assertEqual(self.pages({'min_rate': 3.5, 'limit': 1}), ['D1', 'D2', 'D3', 'D5'])
+
+    def test_internal_columns_are_hidden(self):
+        response = self.client.get('/api/v1/products/deposit/', {'limit': 1})
+        with mock.patch('fin_agent.views.counters'):
+            detail = self.client.get('/api/v1/products/deposit/D0/')
+        for product in (response.data['results'][0], detail.data):
+            for item in (product, product['options'][0]):
+                self.assertNotIn('content_hash', item)
+                self.assertNotIn('is_active', item)
+
+    def test_invalid_parameters(self):
+        for params in ({'sort': 'name'}, {'save_trm': 'x'}, {'min_rate': 'nan'}, {'limit': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/v1/products/deposit/', params).status_code, 400)
+
+    def test_bad_cursor_is_400(self):
+        cursors = ['not-base64!', 'WyJ4Il0', 'W3siYSI6MX1d', encode_cursor([1, 2, 3]), encode_cursor([None, 1])]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/v1/products/deposit/', {'sort': 'intr_rate2', 'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+        for cursor in (encode_cursor(['x']), encode_cursor([10 ** 30])):
+            response = self.client.get('/api/v1/products/deposit/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/articles/', {'cursor': encode_cursor(['yesterday', 1])})
+        self.assertEqual(response.status_code, 400)
+
+
+# 조회수/가입수 버퍼: 주기 내 중복 조회 제외, 반영 실패 시 복구, 같은 증분끼리 묶은 UPDATE
+@mock.patch.object(CounterBuffer, '_ensure_timer')
+class CounterBufferTests(TestCase):
+    def counts(self, kind, object_id):
+        row = Popularity.objects.get(kind=kind, object_id=object_id)
+        return row.view_count, row.join_count, row.score
+
+    def test_repeat_views_count_once_per_flush(self, _):
+        buffer = CounterBuffer(60)
+        for _ in range(3):
+            buffer.record_view('article', 1, user_id=7)
+            buffer.record_view('article', 1)
+        buffer.flush()
+        self.assertEqual(self.counts('article', 1), (4, 0, 4.0))
+        # 반영 후 새 주기에서는 같은 사용자의 조회를 다시 셈
+        buffer.record_view('article', 1, user_id=7)
+        buffer.flush()
+        self.assertEqual(self.counts('article', 1)[0], 5)
+
+    def test_failed_flush_keeps_deltas(self, _):
+        buffer = CounterBuffer(60)
+        buffer.record_view('deposit', 1)
+        buffer.record_join('deposit', 1, 2)
+        with mock.patch('fin_agent.counters.apply_deltas', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                buffer.flush()
+        self.assertFalse(Popularity.objects.exists())
+        buffer.record_join('deposit', 1)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(self.counts('deposit', 1), (1, 3, 1 + 3 * JOIN_WEIGHT))
+        self.assertEqual(buffer.pending(), 0)
+
+    def test_same_deltas_share_one_update(self, _):
+        buffer = CounterBuffer(60)
+        for object_id in range(20):
+            buffer.record_view('article', object_id)
+        buffer.record_view('deposit', 1)
+        buffer.record_join('deposit', 2)
+        with CaptureQueriesContext(connection) as queries:
+            buffer.flush()
+        updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        # (조회 1, 가입 0) 인 article/deposit, (조회 0, 가입 1) 인 deposit
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(Popularity.objects.filter(kind='article', view_count=1).count(), 20)
+        self.assertEqual(self.counts('deposit', 2), (0, 1, JOIN_WEIGHT))
+
+    def test_cancel_records_negative_join(self, _):
+        user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        ingest_deposit_products([deposit_base('D1')], [deposit_option('D1', 12, 2.0, 3.0)], 'deposit')
+        client = APIClient()
+        client.force_authenticate(user)
+        counters._take()
+        self.assertEqual(client.post('/api/v1/products/deposit/D1/join/').status_code, 201)
+        joined = UserJoinedProduct.objects.get(user=user)
+        self.assertEqual(client.delete(f'/api/v1/products/joined/{joined.pk}/').status_code, 204)
+        counters.flush()
+        self.assertEqual(self.counts('deposit', joined.product_id)[1], 0)
+
+
+# 전세자금대출 상환 비용: 방식별 총 이자를 닫힌 식과 비교, 금리 없는 옵션 제외
+class LoanSimulatorTests(TestCase):
+    def test_totals_match_closed_form(self):
+        table = LoanOptionTable([
+            (1, 'L1', '전세대출', '테스트은행', '분할상환', '고정금리', 3.6, 3.6, None),
+            (2, 'L2', '전세대출', '테스트은행', '만기일시상환', '고정금리', 3.6, 3.6, None),
+        ])
+        principal, n, r = 100_000_000, 24, 0.036 / 12
+        payment = principal * r * (1 + r) ** n / ((1 + r) ** n - 1)
+        expected = {
+            'installment': payment * n - principal,
+            'principal': principal * r * (n + 1) / 2,
+            'bullet': principal * r * n,
+        }
+        results = simulate(principal, [n], table=table, with_schedule=True)
+        self.assertEqual(len(results), 3)
+        for item in results:
+            with self.subTest(method=item['method']):
+                self.assertAlmostEqual(item['total_interest'], expected[item['method']], delta=1)
+                self.assertAlmostEqual(sum(row['principal'] for row in item['schedule']), principal, delta=n)
+        self.assertEqual([item['method'] for item in results], ['principal', 'installment', 'bullet'])
+
+    def test_options_without_rates_are_skipped(self):
+        base = [
+            {'fin_prdt_cd': 'L1', 'kor_co_nm': '테스트은행', 'fin_prdt_nm': '전세대출', 'join_way': '영업점'},
+            {'fin_prdt_cd': 'L2', 'kor_co_nm': '테스트은행', 'fin_prdt_nm': '금리미공시', 'join_way': '영업점'},
+        ]
+        options = [
+            {'fin_prdt_cd': 'L1', 'rpay_type_nm': '만기일시상환', 'lend_rate_type_nm': '변동금리',
+             'lend_rate_min': '3.5', 'lend_rate_max': '5.0', 'lend_rate_avg': None},
+            {'fin_prdt_cd': 'L2', 'rpay_type_nm': '분할상환', 'lend_rate_type_nm': '변동금리',
+             'lend_rate_min': None, 'lend_rate_max': None, 'lend_rate_avg': None},
+        ]
+        ingest_loan_products(base, options)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response = APIClient().get('/api/v1/products/loan/rent/simulate/', {'principal': 100_000_000, 'term': 24})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['fin_prdt_cd'] for item in response.data['results']], ['L1'])
+        self.assertEqual(response.data['results'][0]['rate'], 4.25)
+
+
+# 일괄 가입/수정: 배치 내 중복, 기존 가입과 충돌(savepoint 재시도), 수정 권한, 결과 순서
+@mock.patch('fin_agent.views.counters')
+class BulkJoinTests(TestCase):
+    def setUp(self):
+        codes = ['D1', 'D2', 'D3']
+        ingest_deposit_products(
+            [deposit_base(code) for code in codes], [deposit_option(code, 12, 3.0, 3.5) for code in codes], 'deposit',
+        )
+        self.user = User.objects.create_user('tester', 'tester@example.com', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk(self, join=(), update=()):
+        response = self.client.post('/api/v1/products/joined/bulk/', {'join': list(join), 'update': list(update)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_conflicts_are_reported_in_request_order(self, counters):
+        existing = UserJoinedProduct.objects.create(user=self.user, product=DepositProduct.objects.get(fin_prdt_cd='D2'))
+        data = self.bulk(join=[
+            {'fin_prdt_cd': 'D3', 'amount': 1_000_000},
+            {'fin_prdt_cd': 'D2'},
+            {'fin_prdt_cd': 'X9'},
+            {'fin_prdt_cd': 'D1', 'save_trm': 6},
+            {'fin_prdt_cd': 'D3'},
+        ])
+        self.assertEqual(
+            [(row['fin_prdt_cd'], row['status']) for row in data['join']],
+            [('D3', 'created'), ('D2', 'error'), ('X9', 'error'), ('D1', 'created'), ('D3', 'error')],
+        )
+        for row in data['join']:
+            self.assertNotIn('product_id', row)
+        joined = UserJoinedProduct.objects.filter(user=self.user)
+        self.assertEqual(joined.count(), 3)
+        self.assertEqual(joined.get(pk=data['join'][0]['id']).amount, 1_000_000)
+        self.assertEqual(joined.get(pk=data['join'][3]['id']).save_trm, 6)
+        self.assertEqual(joined.get(pk=existing.pk).product.fin_prdt_cd, 'D2')
+        recorded = sorted(call.args[1] for call in counters.record_join.call_args_list)
+        self.assertEqual(recorded, sorted(DepositProduct.objects.filter(fin_prdt_cd__in=['D1', 'D3']).values_list('pk', flat=True)))
+
+    def test_updates_only_own_rows(self, counters):
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        product = DepositProduct.objects.get(fin_prdt_cd='D1')
+        mine = UserJoinedProduct.objects.create(user=self.user, product=product, amount=1)
+        theirs = UserJoinedProduct.objects.create(user=other, product=product, amount=1)
+        data = self.bulk(update=[{'id': theirs.pk, 'amount': 5}, {'id': mine.pk, 'amount': 7}])
+        self.assertEqual([row['status'] for row in data['update']], ['error', 'updated'])
+        theirs.refresh_from_db()
+        mine.refresh_from_db()
+        self.assertEqual((theirs.amount, mine.amount), (1, 7))
+
+
+# 금리 변경 알림: (상품, 기간) 이 정확히 맞는 가입자에게만 1건씩, 가입자 수와 무관한 쿼리 수
+class RateChangeNotificationTests(TestCase):
+    def setUp(self):
+        self.ingest(3.0)
+        self.products = {p.fin_prdt_cd: p for p in DepositProduct.objects.all()}
+
+    def ingest(self, rate_d1_12):
+        options = [
+            deposit_option('D1', 12, rate_d1_12, 3.5),
+            deposit_option('D1', 6, 2.5, 3.0),
+            deposit_option('D2', 12, 3.0, 3.5),
+        ]
+        ingest_deposit_products([deposit_base('D1'), deposit_base('D2')], options, 'deposit')
+
+    def holders(self, count, code='D1', save_trm=12, prefix='u', **fields):
+        users = []
+        for n in range(count):
+            user = User.objects.create(username=f'{prefix}{n}', email=f'{prefix}{n}@example.com')
+            UserJoinedProduct.objects.create(user=user, product=self.products[code], save_trm=save_trm, **fields)
+            users.append(user)
+        return users
+
+    def test_rate_change_pairs_split_option_key(self):
+        pairs = rate_change_pairs([
+            ('D1', '12|단리', (3.0, 3.5), (3.2, 3.5)),
+            ('D1', '12|월복리', (3.1, 3.6), (3.3, 3.6)),
+            ('D2', '6|단리', (2.0, None), (2.1, None)),
+        ])
+        self.assertEqual(dict(pairs), {
+            ('D1', 12): {'S': ((3.0, 3.5), (3.2, 3.5)), 'M': ((3.1, 3.6), (3.3, 3.6))},
+            ('D2', 6): {'S': ((2.0, None), (2.1, None))},
+        })
+
+    def test_reimport_notifies_exact_pair_holders_once(self):
+        [holder] = self.holders(1)
+        [other_term] = self.holders(1, save_trm=6, prefix='t')
+        [other_product] = self.holders(1, code='D2', prefix='p')
+        self.ingest(3.2)
+        self.ingest(3.2)
+
+        notification = Notification.objects.get()
+        self.assertEqual((notification.user, notification.kind, notification.fin_prdt_cd), (holder, 'rate_change', 'D1'))
+        self.assertEqual(
+            (notification.data['save_trm'], notification.data['old_rate'], notification.data['new_rate']), (12, 3.0, 3.2),
+        )
+        client = APIClient()
+        for user, unread in ((holder, 1), (other_term, 0), (other_product, 0)):
+            client.force_authenticate(user)
+            self.assertEqual(client.get('/api/v1/notifications/unread-count/').data['unread'], unread)
+
+    def test_falls_back_to_other_rate_type(self):
+        [holder] = self.holders(1, intr_rate_type='M')
+        created = notify_rate_changes([('D1', '12|단리', (3.0, 3.5), (3.2, 3.5))])
+        self.assertEqual(created, 1)
+        self.assertEqual(Notification.objects.get(user=holder).data['new_rate'], 3.2)
+
+    def test_query_count_does_not_grow_with_holders(self):
+        changes = [('D1', '12|단리', (3.0, 3.5), (3.2, 3.5))]
+        self.holders(2)
+        with mock.patch('fin_agent.notifications.BATCH_SIZE', 1000):
+            with CaptureQueriesContext(connection) as few:
+                notify_rate_changes(changes)
+            self.holders(30, prefix='v')
+            with CaptureQueriesContext(connection) as many:
+                created = notify_rate_changes(changes)
+        self.assertEqual(created, 32)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_bulk_create_in_batches(self):
+        self.holders(5)
+        with mock.patch('fin_agent.notifications.BATCH_SIZE', 2):
+            with CaptureQueriesContext(connection) as queries:
+                created = notify_rate_changes([('D1', '12|단리', (3.0, 3.5), (3.2, 3.5))])
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual((created, len(inserts)), (5, 3))
+        self.assertEqual(Notification.objects.count(), 5)
+
+
+# 금리 이력 run-length: 변경 시 이전 구간 닫고 새 구간, 판매 중단 시 닫기, 재판매 시 다시 열기
+class RateHistoryTests(TestCase):
+    times = [datetime.datetime(2025, month, day) for month, day in ((1, 1), (1, 2), (2, 1), (3, 1), (4, 1))]
+
+    def ingest(self, when, options):
+        with mock.patch('fin_agent.history.timezone.now', return_value=when):
+            ingest_deposit_products(
+                [deposit_base('D1')], [deposit_option('D1', term, rate, rate + 0.5) for term, rate in options], 'deposit',
+            )
+
+    def runs(self):
+        return list(RateHistory.objects.order_by('option_key', 'valid_from').values_list(
+            'option_key', 'rate', 'valid_from', 'valid_to',
+        ))
+
+    def setUp(self):
+        t1, t2, t3, t4, t5 = self.times
+        self.ingest(t1, [(12, 3.0), (6, 2.5)])
+        self.ingest(t2, [(12, 3.0), (6, 2.5)])        # 금리 그대로면 행이 늘지 않음
+        self.ingest(t3, [(12, 3.2), (6, 2.5)])        # 12개월 변경
+        self.ingest(t4, [(12, 3.2)])                  # 6개월 판매 중단
+        self.ingest(t5, [(12, 3.2), (6, 2.5)])        # 6개월 재판매
+
+    def test_runs(self):
+        t1, t2, t3, t4, t5 = self.times
+        self.assertEqual(self.runs(), [
+            ('12|단리', 3.0, t1, t3),
+            ('12|단리', 3.2, t3, None),
+            ('6|단리', 2.5, t1, t4),
+            ('6|단리', 2.5, t5, None),
+        ])
+
+    def test_history_since(self):
+        t1, t2, t3, t4, t5 = self.times
+        client = APIClient()
+        response = client.get('/api/v1/products/D1/history/', {'since': '2025-02-15'})
+        self.assertEqual(response.status_code, 200)
+        runs = {
+            option['option_key']: [(run['rate'], run['valid_from'], run['valid_to']) for run in option['runs']]
+            for option in response.data['options']
+        }
+        self.assertEqual(runs, {
+            '12|단리': [(3.2, t3, None)],
+            '6|단리': [(2.5, t1, t4), (2.5, t5, None)],
+        })
+        self.assertEqual(len(client.get('/api/v1/products/D1/history/').data['options'][0]['runs']), 2)
+        self.assertEqual(client.get('/api/v1/products/D1/history/', {'since': '02-15'}).status_code, 400)
+        self.assertEqual(client.get('/api/v1/products/X9/history/').status_code, 404)
+
+
+# 전세자금대출 텍스트 파싱: 금액, 중도상환수수료 요율/기간, 신뢰도 플래그
+class LoanParsingTests(SimpleTestCase):
+    def parse(self, **fields):
+        return parse_loan_text(dict({'loan_lmt': '', 'erly_rpay_fee': '', 'dly_rate': ''}, **fields))
+
+    def test_amounts(self):
+        cases = [
+            ('2억 2천만원', [220_000_000]),
+            ('5,000만원', [50_000_000]),
+            ('1.5억', [150_000_000]),
+            ('최대 2억원 (수도권 외 1억 6천만원)', [200_000_000, 160_000_000]),
+            ('보증금의 80% 이내', []),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(parse_amounts(text), expected)
+
+    def test_early_repayment_fee(self):
+        cases = [
+            # (문구, 요율, 기간(개월), 요율 플래그, 기간 플래그)
+            ('대출일로부터 3년 이내 상환시 1.2%', 1.2, 36, 'exact', 'exact'),
+            ('1년 이내 1.2%, 3년 이내 0.7%', 1.2, 36, 'partial', 'partial'),
+            ('6개월 이내 0.5%', 0.5, 6, 'exact', 'exact'),
+            ('없음', 0.0, None, 'exact', 'missing'),
+            ('중도상환수수료 면제', 0.0, None, 'exact', 'missing'),
+            ('', None, None, 'missing', 'missing'),
+        ]
+        for text, rate, months, rate_flag, months_flag in cases:
+            with self.subTest(text=text):
+                result = self.parse(erly_rpay_fee=text)
+                self.assertEqual((result['erly_rpay_fee_rate'], result['erly_rpay_fee_months']), (rate, months))
+                flags = result['parse_flags']
+                self.assertEqual((flags['erly_rpay_fee_rate'], flags['erly_rpay_fee_months']), (rate_flag, months_flag))
+
+    def test_limit_flags(self):
+        cases = [
+            ('최대 2억원', 200_000_000, 'exact'),
+            ('수도권 2억원, 그 외 1억 6천만원', 200_000_000, 'partial'),
+            ('보증금의 80% 이내', None, 'missing'),
+        ]
+        for text, amount, flag in cases:
+            with self.subTest(text=text):
+                result = self.parse(loan_lmt=text)
+                self.assertEqual((result['loan_lmt_amount'], result['parse_flags']['loan_lmt_amount']), (amount, flag))
+
+
+class LoanFilterTests(TestCase):
+    def test_min_limit_and_max_early_fee(self):
+        rows = [('L1', '최대 2억 2천만원', '3년 이내 1.2%'), ('L2', '최대 1억원', '없음'), ('L3', '보증금의 80%', '1.5%')]
+        base = [
+            {'fin_prdt_cd': code, 'kor_co_nm': '테스트은행', 'fin_prdt_nm': '전세대출', 'join_way': '영업점',
+             'loan_lmt': loan_lmt, 'erly_rpay_fee': fee}
+            for code, loan_lmt, fee in rows
+        ]
+        options = [
+            {'fin_prdt_cd': code, 'rpay_type_nm': '만기일시상환', 'lend_rate_type_nm': '변동금리',
+             'lend_rate_min': '3.5', 'lend_rate_max': '5.0', 'lend_rate_avg': None}
+            for code, _, _ in rows
+        ]
+        ingest_loan_products(base, options)
+        client = APIClient()
+        cases = [
+            ({'min_limit': '2억'}, ['L1']),
+            ({'min_limit': '5,000만원'}, ['L1', 'L2']),
+            ({'max_early_fee': '1.2'}, ['L1', 'L2']),
+            ({'max_early_fee': '0'}, ['L2']),
+            ({'min_limit': '1억', 'max_early_fee': '1'}, ['L2']),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                response = client.get('/api/v1/products/loan/rent/', params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(sorted(product['fin_prdt_cd'] for product in response.data['results']), expected)
+        self.assertEqual(client.get('/api/v1/products/loan/rent/', {'min_limit': '많이'}).status_code, 400)
+
+
+# 통합 검색: 마이그레이션이 만든 FTS 테이블, 2-gram 부분 일치, type 필터, 커서 페이지, 바뀐 상품만 재색인
+class SearchTests(TestCase):
+    def ingest(self, names, product_type):
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_deposit_products([deposit_base(code, name) for code, name in names], [], product_type)
+
+    def setUp(self):
+        self.ingest([('D1', '하나 정기예금'), ('D2', '청년 주택드림 예금')], 'deposit')
+        self.ingest([('S1', '청년우대적금'), ('S2', '청년도약적금'), ('S3', '자유적금')], 'saving')
+        user = User.objects.create(username='tester', email='tester@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(user=user, title='청년 적금 후기', content='우대금리 조건 정리')
+        self.client = APIClient()
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def refs(self, **params):
+        return sorted(row['ref'] for row in self.search(**params)['results'])
+
+    def test_table_created_by_migration(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT sql FROM sqlite_master WHERE name = %s', [SEARCH_TABLE])
+            self.assertIn('fts5', cursor.fetchone()[0])
+
+    def test_bigram_matching(self):
+        # 띄어쓰기 없는 상품명도 단어 일부로 찾음
+        self.assertEqual(self.refs(q='우대', type='saving'), ['S1'])
+        self.assertEqual(self.refs(q='우대적금', type='saving'), ['S1'])
+        self.assertEqual(self.refs(q='도약', type='saving'), ['S2'])
+        self.assertEqual(self.refs(q='적금', type='saving'), ['S1', 'S2', 'S3'])
+        self.assertEqual(self.refs(q='없는상품'), [])
+
+    def test_type_filter(self):
+        article = str(Article.objects.get().pk)
+        self.assertEqual(self.refs(q='청년'), sorted(['D2', 'S1', 'S2', article]))
+        self.assertEqual(self.refs(q='청년', type='deposit'), ['D2'])
+        self.assertEqual(self.refs(q='청년', type='article,saving'), sorted(['S1', 'S2', article]))
+        self.assertEqual(self.client.get('/api/v1/search/', {'q': '청년', 'type': 'card'}).status_code, 400)
+
+    def test_cursor_paging(self):
+        refs, cursor = [], None
+        while True:
+            data = self.search(q='적금', limit=1, **({'cursor': cursor} if cursor else {}))
+            refs += [row['ref'] for row in data['results']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(len(refs), len(set(refs)))
+        self.assertEqual(refs, [row['ref'] for row in self.search(q='적금')['results']])
+
+    def test_reindexes_only_changed_products(self):
+        names = [('S1', '청년우대적금'), ('S2', '청년희망적금')]     # S2 이름 변경, S3 판매 중단
+        with mock.patch('fin_agent.ingestion.index_products', wraps=index_products) as reindex:
+            self.ingest(names, 'saving')
+        changed = DepositProduct.objects.filter(fin_prdt_cd__in=['S2', 'S3']).values_list('pk', flat=True)
+        self.assertEqual(sorted(reindex.call_args.args[1]), sorted(changed))
+        self.assertEqual(self.refs(q='희망'), ['S2'])
+        self.assertEqual(self.refs(q='자유'), [])
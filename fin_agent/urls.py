@@ -13,21 +13,46 @@ urlpatterns = [
     # 3. AI 상품 추천 (POST) - 나중에 구현 예정
     # path('products/recommend/', views.recommend_product),
 
+    # [추가] 예적금 상품 상세 (조회수 집계)
+    path('products/deposit/<str:fin_prdt_cd>/', views.deposit_product_detail),
     path('products/deposit/<str:fin_prdt_cd>/join/', views.join_deposit_product),
+    # [추가] 내 나이/연봉으로 가입 가능한 상품
+    path('products/eligible/', views.eligible_products),
+    # [추가] 상품 금리 변경 이력
+    path('products/<str:fin_prdt_cd>/history/', views.product_rate_history),
     # [추가] 프로필 페이지
     path('profile/', views.profile),
+    # [추가] 가입 상품 만기/이자 예상
+    path('profile/projection/', views.profile_projection),
+    # [추가] 포트폴리오 요약
+    path('profile/portfolio/', views.profile_portfolio),
 
     # [추가] AI 상품 추천
     path('products/recommend/', views.recommend_product),
+    path('products/recommend/cache-stats/', views.recommend_cache_stats),
+    path('products/recommend/prompt-stats/', views.recommend_prompt_stats),
+    # [추가] AI 상품 추천 스트리밍 (SSE, ASGI 서버에서 사용)
+    path('products/recommend/stream/', views.recommend_product_stream),
 
     # [추가] 전세자금대출 데이터 저장 (최초 1회 실행용)
     path('products/save-loan/', views.save_jeonse_loan_products),
+
+    # [추가] 수집 작업 상태 조회 (save-* 응답의 job_id 로 폴링)
+    path('products/sync-jobs/<int:job_pk>/', views.sync_job_detail),
     
     # [추가] 전세자금대출 조회 (명세서 3번)
     path('products/loan/rent/', views.jeonse_loan_products),
+    # [추가] 전세자금대출 상환 비용 비교
+    path('products/loan/rent/simulate/', views.simulate_loan_cost),
+
+    # [추가] 게시글/상품 통합 검색
+    path('search/', views.search_all),
 
     # [추가] 게시글 CRUD
     path('articles/', views.article_list_create),
+    # [추가] 인기 게시글 / 가입 많은 상품
+    path('articles/popular/', views.popular_articles),
+    path('products/popular/', views.popular_products),
     path('articles/<int:article_pk>/', views.article_detail),
 
     # 마이페이지 유저 정보 수정
@@ -36,5 +61,12 @@ urlpatterns = [
     # 가입한 상품 수정(PUT) 및 해지(DELETE)
     # <int:joined_pk>는 UserJoinedProduct 모델의 id값입니다.
     path('products/joined/<int:joined_pk>/', views.manage_joined_product),
+    # [추가] 일괄 가입/수정
+    path('products/joined/bulk/', views.bulk_joined_products),
+
+    # [추가] 알림함 (가입 상품 금리 변경)
+    path('notifications/', views.notification_list),
+    path('notifications/unread-count/', views.notification_unread_count),
+    path('notifications/read/', views.notification_mark_read),
     
 ]
\ No newline at end of file
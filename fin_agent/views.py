@@ -1,20 +1,50 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch, Q, prefetch_related_objects
+from django.db.models.functions import Substr
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
-from .models import DepositProduct, DepositOptions, UserJoinedProduct, JeonseLoanProduct, JeonseLoanOption, Article
+from rest_framework.authtoken.models import Token
+from .models import (
+    DepositProduct, DepositOptions, UserJoinedProduct, JeonseLoanProduct, JeonseLoanOption, Article, SyncJob, Popularity,
+    Notification,
+)
 from .serializers import (
     DepositProductSerializer, DepositOptionsSerializer, UserJoinedProductSerializer, 
     JeonseLoanProductSerializer, JeonseLoanOptionSerializer, UserSerializer, 
-    ArticleSerializer, ArticleListSerializer
+    ArticleSerializer, ArticleListSerializer, SyncJobSerializer, EligibleProductSerializer, NotificationSerializer,
+    ARTICLE_PREVIEW_CHARS
+)
+from .jobs import enqueue
+from .cache import cached_json_response, recommendation_cache, recommendation_key
+from .filters import filter_deposit_products, filter_loan_products, DEPOSIT_FILTER_PARAMS, LOAN_FILTER_PARAMS
+from .pagination import KeysetPagination
+from .ranking import rank_products, offline_recommendation
+from .joins import bulk_apply, pick_default_option, rate_defaults, BULK_LIMIT
+from .portfolio import get_portfolio, invalidate_portfolio
+from .counters import counters
+from .eligibility import ONLINE_ONLY, UNVERIFIABLE
+from .history import load_history
+from .loan_simulator import simulate, METHODS as LOAN_METHODS, RATE_CHOICES as LOAN_RATE_CHOICES, MAX_TERM as LOAN_MAX_TERM
+from .search import search, KINDS as SEARCH_KINDS
+from .projection import project, summarize as summarize_projection, PROJECTION_FIELDS
+from .recommend import (
+    prepare_prompt, recommend, fallback_result, validation_steps, arun_validation,
+    JSONObjectScanner, stream_generate, prompt_metrics,
 )
 import json
-import requests
+import logging
 import socket
-import re
 
+logger = logging.getLogger(__name__)
 
 # IPv6 문제 해결을 위한 패치
 orig_getaddrinfo = socket.getaddrinfo
@@ -22,157 +52,85 @@ def ipv4_only_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
     return orig_getaddrinfo(host, port, socket.AF_INET, type, proto, flags)
 socket.getaddrinfo = ipv4_only_getaddrinfo
 
-# 환경변수 설정
-API_KEY = settings.FINLIFE_API_KEY
-
 # 1. 정기예금 데이터 수집
+# [수정] 요청 스레드에서 수집하지 않고 백그라운드 작업으로 등록 후 job id 반환
 @api_view(['GET'])
 def save_deposit_products(request):
-    BASE_URL = 'http://finlife.fss.or.kr/finlifeapi/depositProductsSearch.json'
-    params = {'auth': API_KEY, 'topFinGrpNo': '020000', 'pageNo': 1}
-    
-    try:
-        response = requests.get(BASE_URL, params=params).json()
-        base_list = response.get('result').get('baseList')
-        option_list = response.get('result').get('optionList')
-
-        for product in base_list:
-            DepositProduct.objects.update_or_create(
-                fin_prdt_cd=product.get('fin_prdt_cd'),
-                defaults={
-                    'kor_co_nm': product.get('kor_co_nm'),
-                    'fin_prdt_nm': product.get('fin_prdt_nm'),
-                    'etc_note': product.get('etc_note'),
-                    'join_deny': int(product.get('join_deny')),
-                    'join_member': product.get('join_member'),
-                    'join_way': product.get('join_way'),
-                    'spcl_cnd': product.get('spcl_cnd'),
-                    'product_type': 'deposit' 
-                }
-            )
-
-        for option in option_list:
-            product_instance = DepositProduct.objects.filter(fin_prdt_cd=option.get('fin_prdt_cd')).first()
-            if product_instance:
-                DepositOptions.objects.update_or_create(
-                    product=product_instance,
-                    save_trm=option.get('save_trm'),
-                    intr_rate_type_nm=option.get('intr_rate_type_nm'),
-                    defaults={
-                        'fin_prdt_cd': option.get('fin_prdt_cd'),
-                        'intr_rate': option.get('intr_rate') or 0,
-                        'intr_rate2': option.get('intr_rate2') or 0,
-                    }
-                )
-
-        return Response({"message": "정기예금 데이터 저장 완료!"}, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    job = enqueue('deposit')
+    return Response({"message": "정기예금 데이터 수집 작업이 등록되었습니다.", "job_id": job.pk, "status": job.status},
+                    status=status.HTTP_202_ACCEPTED)
 
 # 2. 적금 데이터 수집
 @api_view(['GET'])
 def save_saving_products(request):
-    SAVING_URL = 'http://finlife.fss.or.kr/finlifeapi/savingProductsSearch.json'
-    params = {'auth': API_KEY, 'topFinGrpNo': '020000', 'pageNo': 1}
-    
-    try:
-        response = requests.get(SAVING_URL, params=params).json()
-        base_list = response.get('result').get('baseList')
-        option_list = response.get('result').get('optionList')
-
-        for product in base_list:
-            DepositProduct.objects.update_or_create(
-                fin_prdt_cd=product.get('fin_prdt_cd'),
-                defaults={
-                    'kor_co_nm': product.get('kor_co_nm'),
-                    'fin_prdt_nm': product.get('fin_prdt_nm'),
-                    'etc_note': product.get('etc_note'),
-                    'join_deny': int(product.get('join_deny')),
-                    'join_member': product.get('join_member'),
-                    'join_way': product.get('join_way'),
-                    'spcl_cnd': product.get('spcl_cnd'),
-                    'product_type': 'saving'
-                }
-            )
-
-        for option in option_list:
-            product_instance = DepositProduct.objects.filter(fin_prdt_cd=option.get('fin_prdt_cd')).first()
-            if product_instance:
-                DepositOptions.objects.update_or_create(
-                    product=product_instance,
-                    save_trm=option.get('save_trm'),
-                    intr_rate_type_nm=option.get('intr_rate_type_nm'),
-                    defaults={
-                        'fin_prdt_cd': option.get('fin_prdt_cd'),
-                        'intr_rate': option.get('intr_rate') or 0,
-                        'intr_rate2': option.get('intr_rate2') or 0,
-                    }
-                )
-
-        return Response({"message": "적금 데이터 저장 완료!"}, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    job = enqueue('saving')
+    return Response({"message": "적금 데이터 수집 작업이 등록되었습니다.", "job_id": job.pk, "status": job.status},
+                    status=status.HTTP_202_ACCEPTED)
 
 # 3. 전세자금대출 데이터 수집
 @api_view(['GET'])
 def save_jeonse_loan_products(request):
-    LOAN_URL = 'http://finlife.fss.or.kr/finlifeapi/rentHouseLoanProductsSearch.json'
-    params = {'auth': API_KEY, 'topFinGrpNo': '020000', 'pageNo': 1}
-    
-    try:
-        response = requests.get(LOAN_URL, params=params, verify=False).json()
-        result = response.get('result', {})
-        base_list = result.get('baseList', [])
-        option_list = result.get('optionList', [])
-
-        for product in base_list:
-            JeonseLoanProduct.objects.update_or_create(
-                fin_prdt_cd=product.get('fin_prdt_cd'),
-                defaults={
-                    'kor_co_nm': product.get('kor_co_nm'),
-                    'fin_prdt_nm': product.get('fin_prdt_nm'),
-                    'join_way': product.get('join_way'),
-                    'loan_inci_expn': product.get('loan_inci_expn') or '정보 없음',
-                    'erly_rpay_fee': product.get('erly_rpay_fee') or '정보 없음',
-                    'dly_rate': product.get('dly_rate') or '정보 없음',
-                    'loan_lmt': product.get('loan_lmt') or '한도 확인 필요',
-                }
-            )
+    job = enqueue('loan')
+    return Response({"message": "대출 상품 수집 작업이 등록되었습니다.", "job_id": job.pk, "status": job.status},
+                    status=status.HTTP_202_ACCEPTED)
 
-        for option in option_list:
-            product_instance = JeonseLoanProduct.objects.filter(fin_prdt_cd=option.get('fin_prdt_cd')).first()
-            if product_instance:
-                JeonseLoanOption.objects.update_or_create(
-                    product=product_instance,
-                    rpay_type_nm=option.get('rpay_type_nm'),
-                    lend_rate_type_nm=option.get('lend_rate_type_nm'),
-                    defaults={
-                        'fin_prdt_cd': option.get('fin_prdt_cd'),
-                        'lend_rate_min': option.get('lend_rate_min') or 0,
-                        'lend_rate_max': option.get('lend_rate_max') or 0,
-                        'lend_rate_avg': option.get('lend_rate_avg'),
-                    }
-                )
-        return Response({"message": f"대출 상품 {len(base_list)}개 수집 완료!"})
-    except Exception as e:
-        return Response({"error": f"데이터 수집 중 오류: {str(e)}"}, status=500)
+# 3-1. 수집 작업 상태 조회 (상태/소요시간/처리 건수)
+@api_view(['GET'])
+def sync_job_detail(request, job_pk):
+    job = get_object_or_404(SyncJob, pk=job_pk)
+    return Response(SyncJobSerializer(job).data)
     
 # 4. 예금/적금 통합 조회
+# [수정] 직렬화 결과를 카탈로그 버전별로 캐시하고 ETag / If-None-Match 지원
 @api_view(['GET'])
 def deposit_products(request):
     product_type = request.GET.get('type')
-    products = DepositProduct.objects.prefetch_related('options')
-    
-    if product_type:
-        products = products.filter(product_type=product_type)
-        
-    serializer = DepositProductSerializer(products, many=True)
-    return Response(serializer.data)
+
+    def build():
+        # [수정] 원본에서 사라진(비활성) 상품/옵션은 제외
+        products = DepositProduct.objects.filter(is_active=True).prefetch_related(
+            Prefetch('options', queryset=DepositOptions.objects.filter(is_active=True))
+        )
+        if product_type:
+            products = products.filter(product_type=product_type)
+        return DepositProductSerializer(products, many=True).data
+
+    # [추가] 필터/정렬/커서 파라미터가 있으면 DB 에서 걸러서 페이지 단위로 응답
+    if any(param in request.GET for param in DEPOSIT_FILTER_PARAMS):
+        products, ordering = filter_deposit_products(request.GET)
+        paginator = KeysetPagination(ordering)
+        page = paginator.paginate_queryset(products, request)
+        return paginator.get_paginated_response(DepositProductSerializer(page, many=True).data)
+
+    # 허용된 type 값만 캐시 키로 사용 (임의 문자열로 캐시가 늘어나는 것 방지)
+    if product_type and product_type not in dict(DepositProduct.PRODUCT_TYPE_CHOICES):
+        return Response(build())
+    return cached_json_response(request, f"deposit_products:{product_type or 'all'}", build)
+
+# 4-1. 예금/적금 상품 상세 (조회수 집계)
+@api_view(['GET'])
+def deposit_product_detail(request, fin_prdt_cd):
+    product = get_object_or_404(
+        DepositProduct.objects.prefetch_related(Prefetch('options', queryset=DepositOptions.objects.filter(is_active=True))),
+        fin_prdt_cd=fin_prdt_cd, is_active=True,
+    )
+    # 조회수는 메모리 버퍼에 모았다가 주기적으로 반영 (/products/popular/ 의 view_count)
+    counters.record_view('deposit', product.pk, request.user.pk)
+    return Response(DepositProductSerializer(product).data)
 
 # 5. 전세자금대출 목록 조회
 @api_view(['GET'])
 def jeonse_loan_products(request):
-    products = JeonseLoanProduct.objects.prefetch_related('options').all()
+    # [추가] 은행/상환유형/금리유형/최대금리 필터, 최저금리 정렬, 커서 페이지네이션
+    if any(param in request.GET for param in LOAN_FILTER_PARAMS):
+        products, ordering = filter_loan_products(request.GET)
+        paginator = KeysetPagination(ordering)
+        page = paginator.paginate_queryset(products, request)
+        return paginator.get_paginated_response(JeonseLoanProductSerializer(page, many=True).data)
+
+    products = JeonseLoanProduct.objects.filter(is_active=True).prefetch_related(
+        Prefetch('options', queryset=JeonseLoanOption.objects.filter(is_active=True))
+    )
     serializer = JeonseLoanProductSerializer(products, many=True)
     return Response(serializer.data)
 
@@ -181,87 +139,130 @@ def jeonse_loan_products(request):
 @permission_classes([IsAuthenticated])
 def recommend_product(request):
     user_info = request.data
-    products = DepositProduct.objects.prefetch_related('options').all()
-    
-    product_list_text = ""
-    for p in products:
-        options_text = ", ".join([f"{opt.save_trm}개월({opt.intr_rate2}%)" for opt in p.options.all()])
-        product_list_text += f"상품코드: {p.fin_prdt_cd} / 타입: {p.get_product_type_display()} / 상품명: {p.fin_prdt_nm} ({p.kor_co_nm})\n"
-        product_list_text += f" - 금리옵션: {options_text}\n"
-        product_list_text += f" - 우대조건: {p.spcl_cnd}\n\n"
-
-    prompt = f"""
-    당신은 꼼꼼한 금융 전문가입니다. 아래 사용자의 정보와 요청사항을 분석하여 제공된 [상품 목록] 중에서 가장 적합한 상품 **3개**를 추천해주세요.
-
-    [사용자 프로필]
-    - 나이: {user_info.get('age')}세
-    - 연봉: {user_info.get('salary')}원
-    - 현재 자산: {user_info.get('money')}원
-    - 사용자 요청(목적): "{user_info.get('purpose')}"
-
-    [상품 목록]
-    {product_list_text}
-
-    [분석 가이드]
-    1. 사용자의 요청(목적)을 자연어 처리하여 의도를 파악하세요. 
-    2. 연봉과 자산 규모를 고려하여 가입 가능한 상품인지 판단하세요.
-    3. 금리가 높은 상품을 우선하되, 우대 조건 달성 가능성도 고려하세요.
-    4. 위험 감수 성향 분석은 하지 마세요. 오직 목적 적합성과 금리 효율성만 따집니다.
-
-    [응답 형식]
-    반드시 아래와 같은 **JSON 형식**으로만 응답하세요.
-    {{
-      "analysis": {{
-        "purpose": "사용자 요청을 분석하여 파악한 구체적인 재무 목적",
-        "keywords": "분석된 핵심 키워드"
-      }},
-      "products": [
-        {{
-          "fin_prdt_cd": "상품코드",
-          "fin_prdt_nm": "상품명",
-          "kor_co_nm": "은행명",
-          "max_rate": "대표 최고 우대 금리(숫자만)",
-          "save_trm": "추천 가입 기간(개월수 숫자만)",
-          "comment": "추천 이유"
-        }}
-      ]
-    }}
-    """
-    
-    final_url = f"{settings.SSAFY_GMS_URL}?key={settings.SSAFY_GMS_API_KEY}"
-    data = {"contents": [{"parts": [{"text": prompt}]}]}
+
+    # [추가] 규칙 기반 사전 순위 -> 상위 후보만 프롬프트에 포함
+    candidates = rank_products(user_info, limit=settings.RECOMMEND_CANDIDATE_LIMIT)
+    if request.query_params.get('mode') == 'offline':
+        # LLM 호출 없이 순위 결과만 반환
+        return Response(offline_recommendation(user_info, candidates[:3]))
+
+    # [추가] 같은 프로필 구간/목적/카탈로그 버전이면 캐시된 추천 결과 반환
+    cache_key = recommendation_key(user_info)
+    cached = recommendation_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached)
 
     try:
-        response = requests.post(final_url, json=data, verify=False)
-        response_data = response.json()
-        
-        # GMS 응답 텍스트 추출
-        ai_text = response_data['candidates'][0]['content']['parts'][0]['text']
-        
-        # [핵심 수정] 정규표현식으로 JSON 부분만 정확히 추출 (```json 태그 유무 상관없이 동작)
-        match = re.search(r'\{.*\}', ai_text, re.DOTALL)
-        if match:
-            json_str = match.group(0)
-            result_json = json.loads(json_str)
-            return Response(result_json)
-        else:
-            raise ValueError("JSON 형식을 찾을 수 없습니다.")
+        # [수정] 스키마/상품코드 검증 + 제한된 횟수의 응답 수정 재시도
+        result_json = recommend(user_info, candidates)
+        recommendation_cache.set(cache_key, result_json)
+        return Response(result_json)
             
-    except Exception as e:
-        print(f"AI 추천 에러: {e}")
-        # 에러 발생 시 로그를 남기고 빈 배열 반환
-        return Response({
-            "analysis": {"purpose": "분석 실패", "keywords": "없음"}, 
-            "products": []
-        }, status=500)
+    except Exception:
+        logger.exception("AI 추천 실패")
+        # [수정] 에러 시 빈 배열 대신 DB 금리 기준 상위 상품으로 대체 응답
+        return Response(fallback_result(user_info))
+
+# 6-1. AI 상품 추천 (비동기 SSE 스트리밍, ASGI 전용)
+# 모델이 생성하는 텍스트를 delta 이벤트로 바로 전달하고, 마지막에 파싱된 result 이벤트를 보냅니다.
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _token_user(request):
+    keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+    if keyword != 'Token' or not key.strip():
+        return None
+    token = await Token.objects.select_related('user').filter(key=key.strip()).afirst()
+    return token.user if token and token.user.is_active else None
+
+@csrf_exempt
+@require_POST
+async def recommend_product_stream(request):
+    if await _token_user(request) is None:
+        return JsonResponse({"detail": "자격 인증데이터(authentication credentials)가 제공되지 않았습니다."}, status=401)
+    try:
+        user_info = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"detail": "잘못된 JSON 입니다."}, status=400)
+
+    cache_key = await sync_to_async(recommendation_key)(user_info)
+    cached = recommendation_cache.get(cache_key)
+
+    async def events():
+        if cached is not None:
+            yield _sse('result', cached)
+            return
+        try:
+            prompt = await sync_to_async(prepare_prompt)(user_info)
+            chunks, objects, scanner = [], [], JSONObjectScanner()
+            async for text in stream_generate(prompt):
+                chunks.append(text)
+                objects += scanner.feed(text)
+                yield _sse('delta', {"text": text})
+
+            # 스트리밍 중 찾은 JSON 으로 검증, 실패하면 recommend() 와 같은 수정 요청 루프
+            result_json = await arun_validation(validation_steps(''.join(chunks), objects))
+            recommendation_cache.set(cache_key, result_json)
+            yield _sse('result', result_json)
+        except Exception:
+            logger.exception("AI 추천(스트리밍) 실패")
+            yield _sse('result', await sync_to_async(fallback_result)(user_info))
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+# 6-2. AI 추천 캐시 현황 (관리자용)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def recommend_cache_stats(request):
+    return Response(recommendation_cache.stats())
+
+# 6-3. AI 추천 프롬프트 크기 통계 (관리자용, 추천 1건당 비용 추적)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def recommend_prompt_stats(request):
+    return Response(prompt_metrics.snapshot())
 
 # 7. 마이페이지 프로필 조회
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def profile(request):
-    serializer = UserSerializer(request.user)
+    # ?fields=id,username,joined_details : 응답 필드 제한
+    # ?expand=options (기본값) : 가입 상품의 옵션 목록 포함, ?expand= 로 비우면 상품 기본 정보만
+    fields = [name for name in request.query_params.get('fields', '').split(',') if name]
+    expand = [name for name in request.query_params.get('expand', 'options').split(',') if name]
+
+    user = request.user
+    if not fields or 'joined_details' in fields:
+        # 가입 상품 수와 관계없이 상품(JOIN) 1회 + 옵션 1회로 조회
+        joined = UserJoinedProduct.objects.select_related('product').order_by('id')
+        if 'options' in expand:
+            # 원본에서 사라진(비활성) 옵션은 다른 조회 경로와 같이 제외
+            joined = joined.prefetch_related(
+                Prefetch('product__options', queryset=DepositOptions.objects.filter(is_active=True))
+            )
+        prefetch_related_objects([user], Prefetch('joined_details', queryset=joined))
+
+    serializer = UserSerializer(user, context={'fields': fields, 'expand': expand})
     return Response(serializer.data)
 
+# 7-1. 가입 상품 만기/이자 예상 (만기일, 세전/세후 이자, 월별 잔액)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_projection(request):
+    rows = list(request.user.joined_details.order_by('id').values(*PROJECTION_FIELDS))
+    with_schedule = request.query_params.get('schedule', '1') not in ('0', 'false')
+    results = project(rows, with_schedule=with_schedule)
+    return Response({'total': summarize_projection(results), 'products': results})
+
+# 7-2. 포트폴리오 요약 (총 원금, 가중 평균 금리, 다가오는 만기, 은행/유형별 비중)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_portfolio(request):
+    return Response(get_portfolio(request.user.pk))
+
 # 8. 마이페이지 프로필 수정
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
@@ -282,64 +283,241 @@ def manage_joined_product(request, joined_pk):
         serializer = UserJoinedProductSerializer(joined_product, data=request.data, partial=True)
         if serializer.is_valid(raise_exception=True):
             serializer.save()
+            invalidate_portfolio(request.user.pk)
             return Response(serializer.data)
             
     elif request.method == 'DELETE':
         joined_product.delete()
+        invalidate_portfolio(request.user.pk)
+        counters.record_join('deposit', joined_product.product_id, -1)
         return Response({"message": "해지되었습니다."}, status=204)
 
 # 10. 예적금 상품 가입
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def join_deposit_product(request, fin_prdt_cd):
-    product = get_object_or_404(DepositProduct, fin_prdt_cd=fin_prdt_cd)
-    
-    # 중복 가입 체크
-    if UserJoinedProduct.objects.filter(user=request.user, product=product).exists():
-        return Response({"message": "이미 가입한 상품입니다."}, status=400)
+    product = get_object_or_404(DepositProduct, fin_prdt_cd=fin_prdt_cd, is_active=True)
     
     # [추가] 가입 시 사용자 편의를 위해 기본 금리 정보 자동 설정
-    # 1. 12개월 옵션을 우선 탐색
-    default_option = product.options.filter(save_trm=12).first()
-    # 2. 없으면 첫 번째 아무 옵션이나 선택
-    if not default_option:
-        default_option = product.options.first()
-        
-    initial_rate = default_option.intr_rate if default_option else 0.0
-    initial_rate_type = 'S' # 기본 단리
-    if default_option and '복리' in default_option.intr_rate_type_nm:
-        initial_rate_type = 'M' # 복리
-
-    # 가입 처리 (초기값 설정)
-    UserJoinedProduct.objects.create(
-        user=request.user, 
-        product=product, 
-        save_trm=12,
-        intr_rate=initial_rate,
-        intr_rate_type=initial_rate_type
-    )
+    # 12개월 옵션을 우선, 없으면 첫 번째 옵션의 금리/유형 사용
+    default_option = pick_default_option(list(product.options.filter(is_active=True).order_by('id')))
+
+    # 가입 처리 (초기값 설정) - 중복 가입은 (user, product) unique 제약으로 확인
+    try:
+        with transaction.atomic():
+            UserJoinedProduct.objects.create(
+                user=request.user, 
+                product=product, 
+                save_trm=12,
+                **rate_defaults(default_option)
+            )
+    except IntegrityError:
+        return Response({"message": "이미 가입한 상품입니다."}, status=400)
+    invalidate_portfolio(request.user.pk)
+    counters.record_join('deposit', product.pk)
     
     return Response({"message": f"'{product.fin_prdt_nm}' 가입 완료!"}, status=201)
 
+# 10-1. 예적금 상품 일괄 가입/수정 (기존 포트폴리오 가져오기용)
+# {"join": [{"fin_prdt_cd": ..., "amount": ..., ...}], "update": [{"id": ..., "amount": ..., ...}]}
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_joined_products(request):
+    joins = request.data.get('join') or []
+    updates = request.data.get('update') or []
+    for name, items in (('join', joins), ('update', updates)):
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return Response({name: '객체 목록이어야 합니다.'}, status=400)
+    if len(joins) + len(updates) > BULK_LIMIT:
+        return Response({'message': f'한 번에 최대 {BULK_LIMIT}건까지 처리할 수 있습니다.'}, status=400)
+    if not all(isinstance(item.get('id'), int) for item in updates):
+        return Response({'update': 'id 는 정수여야 합니다.'}, status=400)
+    if not all(isinstance(item.get('fin_prdt_cd'), str) for item in joins):
+        return Response({'join': 'fin_prdt_cd 는 문자열이어야 합니다.'}, status=400)
+
+    join_results, update_results, joined_product_ids = bulk_apply(request.user, joins, updates)
+    invalidate_portfolio(request.user.pk)
+    for product_id in joined_product_ids:
+        counters.record_join('deposit', product_id)
+    return Response({'join': join_results, 'update': update_results})
+
+# 10-2. 게시글/상품 통합 검색 (?q=검색어&type=article,deposit,saving,loan&cursor=&limit=)
+@api_view(['GET'])
+def search_all(request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'q': '검색어를 입력해주세요.'}, status=400)
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    if any(kind not in SEARCH_KINDS for kind in kinds):
+        return Response({'type': f"{', '.join(SEARCH_KINDS)} 중에서 선택해야 합니다."}, status=400)
+    limit = KeysetPagination(()).get_limit(request)
+    results, next_cursor = search(query, kinds, request.query_params.get('cursor'), limit)
+    return Response({'next_cursor': next_cursor, 'results': results})
+
+# 10-3. 가입 많은 예적금 상품 순위 (?limit=)
+@api_view(['GET'])
+def popular_products(request):
+    limit = KeysetPagination(()).get_limit(request)
+    ranking = Popularity.objects.filter(kind='deposit', join_count__gt=0).order_by('-join_count', 'object_id')
+    ranking = list(ranking.values_list('object_id', 'join_count', 'view_count')[:limit])
+    products = DepositProduct.objects.filter(is_active=True).in_bulk([object_id for object_id, _, _ in ranking])
+    return Response([
+        {
+            'fin_prdt_cd': products[object_id].fin_prdt_cd,
+            'fin_prdt_nm': products[object_id].fin_prdt_nm,
+            'kor_co_nm': products[object_id].kor_co_nm,
+            'product_type': products[object_id].product_type,
+            'join_count': join_count,
+            'view_count': view_count,
+        }
+        for object_id, join_count, view_count in ranking if object_id in products
+    ])
+
+# 10-4. 전세자금대출 상환 비용 비교 (?principal=100000000&term=24,36&rate=avg&method=&schedule=0&limit=20)
+@api_view(['GET'])
+def simulate_loan_cost(request):
+    params = request.query_params
+    try:
+        principal = int(params.get('principal', ''))
+        terms = sorted({int(term) for term in params.get('term', '24').split(',') if term.strip()})
+    except ValueError:
+        return Response({'message': 'principal, term 은 숫자여야 합니다.'}, status=400)
+    if principal <= 0 or not terms or len(terms) > 5 or not all(0 < term <= LOAN_MAX_TERM for term in terms):
+        return Response({'message': f'principal 은 양수, term 은 1~{LOAN_MAX_TERM}개월(최대 5개)이어야 합니다.'}, status=400)
+    rate = params.get('rate', 'avg')
+    method = params.get('method') or None
+    if rate not in LOAN_RATE_CHOICES or (method and method not in LOAN_METHODS):
+        return Response({'message': f"rate 는 {', '.join(LOAN_RATE_CHOICES)}, method 는 {', '.join(LOAN_METHODS)} 중 하나여야 합니다."}, status=400)
+
+    results = simulate(
+        principal, terms, rate=rate, method=method, limit=KeysetPagination(()).get_limit(request),
+        with_schedule=params.get('schedule', '0') not in ('0', 'false'),
+    )
+    return Response({'principal': principal, 'terms': terms, 'rate': rate, 'results': results})
+
+# 10-5. 내 나이/연봉으로 가입 가능한 예적금 상품 (?type=deposit|saving&online=1&cursor=&limit=)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def eligible_products(request):
+    user = request.user
+    products = DepositProduct.objects.filter(is_active=True, option_count__gt=0).only(
+        'id', 'fin_prdt_cd', 'fin_prdt_nm', 'kor_co_nm', 'product_type', 'max_intr_rate2', 'best_save_trm',
+        'join_member', 'min_age', 'max_age', 'max_income', 'eligibility_flags', 'benefit_flags',
+    )
+    if user.age is not None:
+        products = products.filter(Q(min_age__isnull=True) | Q(min_age__lte=user.age))
+        products = products.filter(Q(max_age__isnull=True) | Q(max_age__gte=user.age))
+    if user.salary is not None:
+        products = products.filter(Q(max_income__isnull=True) | Q(max_income__gte=user.salary))
+    # 군인/사업자 전용 등 나이·연봉으로 확인할 수 없는 상품은 제외
+    products = products.annotate(unverifiable=F('eligibility_flags').bitand(UNVERIFIABLE)).filter(unverifiable=0)
+    if request.query_params.get('type'):
+        products = products.filter(product_type=request.query_params['type'])
+    if request.query_params.get('online') in ('1', 'true'):
+        products = products.annotate(online=F('eligibility_flags').bitand(ONLINE_ONLY)).filter(online=ONLINE_ONLY)
+
+    paginator = KeysetPagination(('-max_intr_rate2', 'id'))
+    page = paginator.paginate_queryset(products, request)
+    return paginator.get_paginated_response(EligibleProductSerializer(page, many=True).data)
+
+# 10-6. 상품 금리 변경 이력 (?since=YYYY-MM-DD)
+@api_view(['GET'])
+def product_rate_history(request, fin_prdt_cd):
+    since = request.query_params.get('since')
+    if since:
+        since = parse_date(since)
+        if since is None:
+            return Response({'since': 'YYYY-MM-DD 형식이어야 합니다.'}, status=400)
+    runs = load_history(since=since, fin_prdt_cd=fin_prdt_cd)
+    if not runs:
+        return Response({'detail': '금리 이력이 없습니다.'}, status=404)
+
+    options = {}
+    for kind, _, key, rate, rate2, rate_avg, valid_from, valid_to in runs:
+        option = options.setdefault(key, {'option_key': key, 'kind': kind, 'runs': []})
+        option['runs'].append({'rate': rate, 'rate2': rate2, 'rate_avg': rate_avg, 'valid_from': valid_from, 'valid_to': valid_to})
+    return Response({'fin_prdt_cd': fin_prdt_cd, 'options': list(options.values())})
+
+# 10-7. 알림함 (가입 상품 금리 변경 등, 최신순 ?unread=1&cursor=&limit=)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_list(request):
+    notifications = Notification.objects.filter(user=request.user)
+    if request.query_params.get('unread', '0') not in ('0', 'false'):
+        notifications = notifications.filter(is_read=False)
+    paginator = KeysetPagination(('-created_at', '-id'))
+    page = paginator.paginate_queryset(notifications, request)
+    return paginator.get_paginated_response(NotificationSerializer(page, many=True).data)
+
+# 10-8. 읽지 않은 알림 수 ((user, is_read) 인덱스만으로 계산)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_unread_count(request):
+    return Response({'unread': Notification.objects.filter(user=request.user, is_read=False).count()})
+
+# 10-9. 알림 읽음 처리 ({"ids": [...]} 없으면 전체)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notification_mark_read(request):
+    notifications = Notification.objects.filter(user=request.user, is_read=False)
+    ids = request.data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            return Response({'message': 'ids 는 숫자 목록이어야 합니다.'}, status=400)
+        notifications = notifications.filter(pk__in=ids)
+    updated = notifications.update(is_read=True)
+    return Response({'updated': updated})
+
 # 11. 게시글 목록/생성
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def article_list_create(request):
     if request.method == 'GET':
-        articles = Article.objects.all().order_by('-created_at')
-        return Response(ArticleListSerializer(articles, many=True).data)
+        # [수정] 최신순 커서 페이지네이션, 작성자는 JOIN 으로, 본문은 앞부분만 DB 에서 잘라서 조회
+        articles = (
+            Article.objects.select_related('user')
+            .only('id', 'title', 'created_at', 'user__username')
+            .annotate(preview=Substr('content', 1, ARTICLE_PREVIEW_CHARS + 1))
+        )
+        paginator = KeysetPagination(('-created_at', '-id'))
+        page = paginator.paginate_queryset(articles, request)
+        return paginator.get_paginated_response(ArticleListSerializer(page, many=True).data)
     elif request.method == 'POST':
         serializer = ArticleSerializer(data=request.data)
         if serializer.is_valid(raise_exception=True):
             serializer.save(user=request.user)
             return Response(serializer.data, status=201)
 
+# 11-1. 인기 게시글 (조회수 순, ?limit=)
+@api_view(['GET'])
+def popular_articles(request):
+    limit = KeysetPagination(()).get_limit(request)
+    ranking = Popularity.objects.filter(kind='article').order_by('-score', 'object_id')
+    ranking = list(ranking.values_list('object_id', 'view_count', 'score')[:limit])
+    articles = (
+        Article.objects.select_related('user').only('id', 'title', 'created_at', 'user__username')
+        .in_bulk([object_id for object_id, _, _ in ranking])
+    )
+    return Response([
+        {
+            'id': object_id,
+            'title': articles[object_id].title,
+            'user': articles[object_id].user.username,
+            'created_at': articles[object_id].created_at,
+            'view_count': view_count,
+            'score': score,
+        }
+        for object_id, view_count, score in ranking if object_id in articles
+    ])
+
 # 12. 게시글 상세/수정/삭제
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def article_detail(request, article_pk):
     article = get_object_or_404(Article, pk=article_pk)
     if request.method == 'GET':
+        # [추가] 조회수는 메모리 버퍼에 모았다가 주기적으로 반영
+        counters.record_view('article', article.pk, request.user.pk)
         return Response(ArticleSerializer(article).data)
     if request.user != article.user:
         return Response({"detail": "권한 없음"}, status=403)